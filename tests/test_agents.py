@@ -0,0 +1,50 @@
+import pytest
+
+from unofficial_livecounts_api.agents import entity_id, kinds, resolve, to_dict
+from unofficial_livecounts_api.client import LivecountsClient
+from unofficial_livecounts_api.tiktok import TiktokAgent, TiktokUser, TiktokVideo
+from unofficial_livecounts_api.twitter import TwitterAgent, TwitterUserCount
+from unofficial_livecounts_api.youtube import YoutubeAgent, YoutubeChannel
+
+
+def test_resolve_maps_kinds_to_agent_methods():
+    assert resolve("tiktok", "video-metrics") == TiktokAgent.fetch_video_metrics
+    assert resolve("youtube", "channel") == YoutubeAgent.find_channel
+    assert resolve("twitter", "user_metrics") == TwitterAgent.fetch_user_metrics
+
+
+@pytest.mark.parametrize("platform, kind", [("kick", "user"), ("twitch", "video"), ("twitter", "user-stats")])
+def test_resolve_rejects_unsupported_calls(platform, kind):
+    with pytest.raises(ValueError):
+        resolve(platform, kind)
+
+
+def test_kinds():
+    assert kinds("twitch") == ["user", "user-metrics"]
+
+
+def test_entity_id_and_to_dict():
+    video = TiktokVideo(
+        video_id="1", title="t", thumbnail="c", user=TiktokUser(user_id="2", username="u", display_name="d", thumbnail="a")
+    )
+    assert entity_id(video) == "1"
+    assert entity_id(YoutubeChannel(channel_id="3", display_name="d", thumbnail="a")) == "3"
+    assert to_dict([video]) == [
+        {
+            "video_id": "1",
+            "title": "t",
+            "thumbnail": "c",
+            "user": {"user_id": "2", "username": "u", "display_name": "d", "thumbnail": "a", "verified": None},
+        }
+    ]
+    assert to_dict(TwitterUserCount(user_id="jack", follower_count=1, user_stats=[2, 3, 4]))["goal_count"] == 4
+
+
+def test_resolve_binds_agent_to_given_client(mocker):
+    client = LivecountsClient()
+    send_request = mocker.patch.object(client, "send_request", return_value={"followerCount": 3})
+
+    metrics = resolve("twitch", "user-metrics", client=client)("jack")
+
+    send_request.assert_called_once_with(f"{client.endpoints.TWITCH_USER_STATS_API}/jack")
+    assert metrics.follower_count == 3
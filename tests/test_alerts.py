@@ -0,0 +1,55 @@
+import pytest
+
+from unofficial_livecounts_api.alerts import AlertEngine
+from unofficial_livecounts_api.tiktok import TiktokUserCount
+from unofficial_livecounts_api.youtube import YoutubeVideoCount
+
+
+def tiktok_count(user_id, followers):
+    return TiktokUserCount(user_id, followers, 0, 0, 0)
+
+
+def test_thresholds_fire_once_when_crossed():
+    engine = AlertEngine()
+    million = engine.add_threshold("x", "follower_count", 1_000_000, payload="chat-1")
+    engine.add_threshold("x", "follower_count", 2_000_000)
+    drop = engine.add_threshold("x", "follower_count", 900_000, direction="down", once=False)
+    engine.add_threshold("y", "follower_count", 10)
+
+    assert engine.observe(tiktok_count("x", 1_200_000), at=0) == []
+    engine.remove(million)
+    engine.add_threshold("x", "follower_count", 1_000_000, payload="chat-2")
+    assert engine.observe(tiktok_count("x", 999_999), at=1) == []
+
+    alerts = engine.observe(tiktok_count("x", 1_000_000), at=2)
+
+    assert [(alert.rule.payload, alert.change) for alert in alerts] == [("chat-2", 1)]
+    assert engine.observe(tiktok_count("x", 1_500_000), at=3) == []
+    assert [alert.rule for alert in engine.observe(tiktok_count("x", 800_000), at=4)] == [drop]
+    assert engine.observe(tiktok_count("x", 950_000), at=5) == []
+    assert [alert.rule for alert in engine.observe(tiktok_count("x", 899_999), at=6)] == [drop]
+    assert len(engine) == 3
+
+
+def test_growth_rules_fire_on_gain_within_window_and_rearm():
+    engine = AlertEngine()
+    hourly = engine.add_growth("v", "view_count", 10_000, window=3600)
+    engine.add_growth("v", "view_count", 50_000, window=3600)
+    minute = engine.add_growth("v", "view_count", 1_000, window=60, once=True)
+
+    def observe(views, at):
+        return [alert.rule for alert in engine.observe(YoutubeVideoCount("v", views, [0, 0, 0]), at=at)]
+
+    assert observe(0, 0) == []
+    assert observe(600, 30) == []
+    assert observe(1_700, 80) == [minute]
+    assert observe(10_500, 3000) == [hourly]
+    assert observe(30_000, 3500) == []
+    assert observe(45_000, 6000) == []
+    assert observe(45_000, 6600) == [hourly]
+    assert len(engine) == 2
+
+
+def test_growth_window_must_be_positive():
+    with pytest.raises(ValueError):
+        AlertEngine().add_growth("v", "view_count", 10, window=0)
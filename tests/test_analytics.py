@@ -0,0 +1,84 @@
+from datetime import datetime, timezone
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from unofficial_livecounts_api.analytics import (  # noqa: E402
+    acceleration,
+    deltas,
+    hourly_rates,
+    milestone_eta,
+    moving_average,
+    snapshot_matrix,
+)
+from unofficial_livecounts_api.tiktok import TiktokUserCount  # noqa: E402
+from unofficial_livecounts_api.youtube import YoutubeVideoCount  # noqa: E402
+
+
+def user_count(follower_count):
+    return TiktokUserCount(user_id="1", follower_count=follower_count, like_count=0, following_count=0, video_count=0)
+
+
+def test_snapshot_matrix_right_aligns_histories():
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    ids, timestamps, values = snapshot_matrix(
+        {
+            "a": [(start, user_count(10)), (3600 + start.timestamp(), user_count(20)), (7200 + start.timestamp(), user_count(40))],
+            "b": [(start, user_count(5))],
+        },
+        metric="follower_count",
+    )
+    assert ids == ["a", "b"]
+    np.testing.assert_array_equal(values, [[10, 20, 40], [np.nan, np.nan, 5]])
+    assert timestamps[0, 0] == start.timestamp()
+    assert np.isnan(timestamps[1, 0])
+
+
+def test_snapshot_matrix_reads_youtube_video_views():
+    _, _, values = snapshot_matrix(
+        {"v": [(0, YoutubeVideoCount(video_id="v", view_count=7, video_stats=[1, 2, 3]))]}, metric="view_count"
+    )
+    np.testing.assert_array_equal(values, [[7]])
+
+
+def test_deltas_rates_and_acceleration():
+    values = np.array([[0, 100, 300, 600], [50, 50, 50, 50]])
+    timestamps = np.array([0, 3600, 7200, 10800])
+
+    np.testing.assert_array_equal(deltas(values), [[100, 200, 300], [0, 0, 0]])
+    np.testing.assert_array_equal(hourly_rates(values, timestamps), [[100, 200, 300], [0, 0, 0]])
+    np.testing.assert_array_equal(acceleration(values, timestamps), [[100, 100], [0, 0]])
+
+
+def test_hourly_rates_without_elapsed_time_is_nan():
+    rates = hourly_rates(np.array([[1, 2]]), np.array([[10, 10]]))
+    assert np.isnan(rates[0, 0])
+
+
+def test_moving_average():
+    np.testing.assert_array_equal(moving_average(np.array([[1, 2, 3, 4]]), window=2), [[1.5, 2.5, 3.5]])
+    np.testing.assert_array_equal(
+        moving_average(np.array([[np.nan, 1, 2, 3, 4], [0, 2, 4, 6, 8]]), window=2),
+        [[np.nan, 1.5, 2.5, 3.5], [1, 3, 5, 7]],
+    )
+    with pytest.raises(ValueError):
+        moving_average(np.array([[1]]), window=0)
+
+
+def test_milestone_eta():
+    values = np.array([[900, 990], [500, 500], [1200, 1300], [np.nan, 10]])
+    timestamps = np.array([0, 90])
+
+    eta = milestone_eta(values, timestamps, milestone=1000)
+
+    assert eta[0] == 10
+    assert eta[1] == np.inf
+    assert eta[2] == 0
+    assert np.isnan(eta[3])
+
+
+def test_milestone_eta_per_id_milestones_and_window():
+    values = np.array([[0, 10, 40], [0, 0, 20]])
+    eta = milestone_eta(values, np.array([0, 10, 20]), milestone=np.array([60, 40]), window=2)
+    np.testing.assert_array_equal(eta, [10, 20])
@@ -0,0 +1,152 @@
+import socketserver
+import threading
+import time
+
+import pytest
+
+from unofficial_livecounts_api.backends import (
+    MemoryBackend,
+    RedisBackend,
+    SharedBackend,
+    SqliteBackend,
+    backend_from_url,
+)
+
+
+class FakeRedisHandler(socketserver.StreamRequestHandler):
+    """
+    Stand-in for a Redis server speaking enough of its protocol for RedisBackend.
+    """
+
+    def handle(self):
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            args = []
+            for _ in range(int(line[1:])):
+                length = int(self.rfile.readline()[1:])
+                args.append(self.rfile.read(length + 2)[:-2])
+            self.wfile.write(self.server.execute(args[0].decode().upper(), *args[1:]))
+
+    @staticmethod
+    def bulk(value):
+        return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+class FakeRedisServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakeRedisHandler)
+        self.lock = threading.Lock()
+        self.data: dict[bytes, tuple[bytes, float]] = {}
+        self.commands = []
+
+    def lookup(self, key):
+        value, expires = self.data.get(key, (None, float("inf")))
+        return value if expires > time.time() else None
+
+    def execute(self, command, *args):
+        with self.lock:
+            self.commands.append(command)
+            if command == "GET":
+                return FakeRedisHandler.bulk(self.lookup(args[0]))
+            if command == "SET":
+                self.data[args[0]] = (args[1], time.time() + int(args[3]) / 1000)
+                return b"+OK\r\n"
+            if command == "INCR":
+                expires = self.data.get(args[0], (b"0", float("inf")))[1]
+                value = int(self.lookup(args[0]) or 0) + 1
+                self.data[args[0]] = (str(value).encode(), expires)
+                return b":%d\r\n" % value
+            if command == "PEXPIRE":
+                self.data[args[0]] = (self.data[args[0]][0], time.time() + int(args[1]) / 1000)
+                return b":1\r\n"
+            return b"-ERR unknown command '%s'\r\n" % command.encode()
+
+
+@pytest.fixture
+def redis_server():
+    server = FakeRedisServer()
+    threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def shared_backends(tmp_path, redis_server, clock):
+    path = str(tmp_path / "shared.db")
+    return [
+        (SqliteBackend(path, clock=clock), SqliteBackend(path, clock=clock)),
+        (
+            RedisBackend(port=redis_server.server_address[1], clock=clock),
+            RedisBackend(port=redis_server.server_address[1], clock=clock),
+        ),
+    ]
+
+
+def test_workers_share_one_request_window(tmp_path, redis_server):
+    now = [1000.25]
+    for first, second in shared_backends(tmp_path, redis_server, lambda: now[0]):
+        granted = [backend.acquire("api.livecounts.io", 3, 1.0) for backend in (first, second, first, second)]
+
+        assert granted == [0, 0, 0, 0.75]
+        now[0] += 1
+        assert second.acquire("api.livecounts.io", 3, 1.0) == 0
+        now[0] -= 1
+        first.close()
+        second.close()
+
+
+def test_workers_reuse_each_others_fresh_responses(tmp_path, redis_server):
+    for first, second in shared_backends(tmp_path, redis_server, time.time):
+        first.set("https://api/stats/1", b'{"followerCount": 1}', ttl=60)
+        first.set("https://api/stats/2", b"{}", ttl=0.001)
+        time.sleep(0.01)
+
+        assert second.get("https://api/stats/1") == b'{"followerCount": 1}'
+        assert second.get("https://api/stats/2") is None
+        assert second.get("https://api/stats/3") is None
+
+
+def test_memory_backend_drops_expired_responses():
+    now = [0.0]
+    backend = MemoryBackend(clock=lambda: now[0])
+    backend.PURGE_EVERY = 4
+    for n in range(2):
+        backend.set(f"https://api/stats/{n}", b"{}", ttl=1)
+    backend.set("https://api/stats/fresh", b"{}", ttl=60)
+    now[0] = 2
+
+    assert backend.get("https://api/stats/0") is None
+    assert len(backend._cache) == 2
+    backend.set("https://api/stats/new", b"{}", ttl=60)
+
+    assert sorted(backend._cache) == ["https://api/stats/fresh", "https://api/stats/new"]
+
+
+def test_redis_error_replies_are_raised(redis_server):
+    backend = RedisBackend(port=redis_server.server_address[1])
+
+    with pytest.raises(RuntimeError, match="unknown command"):
+        backend.execute("FLUSHALL")
+    assert backend.execute("GET", "missing") is None
+
+
+def test_incomplete_backends_cannot_be_created():
+    class CounterOnly(SharedBackend):
+        def acquire(self, key, limit, period):
+            return 0.0
+
+    with pytest.raises(TypeError):
+        CounterOnly()
+
+
+def test_backend_from_url(tmp_path):
+    assert isinstance(backend_from_url("memory://"), MemoryBackend)
+    assert backend_from_url(f"sqlite://{tmp_path}/shared.db").path == f"{tmp_path}/shared.db"
+    redis = backend_from_url("redis://:secret@cache.internal:6380/2")
+    assert (redis.host, redis.port, redis.db, redis.password) == ("cache.internal", 6380, 2, "secret")
+    with pytest.raises(ValueError):
+        backend_from_url("memcached://localhost")
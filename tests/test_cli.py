@@ -0,0 +1,83 @@
+import io
+import json
+
+from unofficial_livecounts_api import env
+from unofficial_livecounts_api.cli import fetch_stream, main, read_queries
+from unofficial_livecounts_api.error import RequestApiError
+from unofficial_livecounts_api.tiktok import TikTokVideoCount
+
+
+def test_read_queries_skips_blank_and_comment_lines():
+    lines = io.StringIO("1\n\n  2  \n# comment\nhttps://tiktok.com/@test/video/3\n")
+    assert list(read_queries(lines)) == ["1", "2", "https://tiktok.com/@test/video/3"]
+
+
+def test_fetch_stream_writes_results_and_errors_as_ndjson():
+    def fetch(query):
+        if query == "bad":
+            raise RequestApiError(f"api server error, query: {query}")
+        return TikTokVideoCount(video_id=query, view_count=1, like_count=2, comment_count=3, share_count=4)
+
+    output = io.StringIO()
+    summary = fetch_stream(fetch, iter(["1", "bad", "2"]), output, concurrency=2)
+
+    records = sorted((json.loads(line) for line in output.getvalue().splitlines()), key=lambda r: r["query"])
+    assert records == [
+        {
+            "query": "1",
+            "result": {"video_id": "1", "view_count": 1, "like_count": 2, "comment_count": 3, "share_count": 4},
+        },
+        {
+            "query": "2",
+            "result": {"video_id": "2", "view_count": 1, "like_count": 2, "comment_count": 3, "share_count": 4},
+        },
+        {"query": "bad", "error": "api server error, query: bad"},
+    ]
+    assert (summary.succeeded, summary.failed, summary.total) == (2, 1, 3)
+
+
+def test_fetch_stream_reads_input_lazily():
+    consumed = []
+
+    def queries():
+        for i in range(100):
+            consumed.append(i)
+            yield str(i)
+
+    def fetch(query):
+        assert len(consumed) - int(query) <= 4
+        return TikTokVideoCount(video_id=query, view_count=0, like_count=0, comment_count=0, share_count=0)
+
+    summary = fetch_stream(fetch, queries(), io.StringIO(), concurrency=2)
+    assert summary.succeeded == 100
+
+
+def test_main_fetches_tiktok_video_metrics(mocker, tmp_path, capsys):
+    mock_send_request = mocker.patch("unofficial_livecounts_api.tiktok.TiktokAgent.send_request")
+    mock_send_request.return_value = {"viewCount": 10, "likeCount": 1, "commentCount": 2, "shareCount": 3}
+    ids = tmp_path / "ids.txt"
+    ids.write_text("https://tiktok.com/@test/video/122222223233232?test1=value1\n")
+    out = tmp_path / "out.ndjson"
+
+    code = main(["fetch", "--platform", "tiktok", "--kind", "video-metrics", "-i", str(ids), "-o", str(out)])
+
+    assert code == 0
+    mock_send_request.assert_called_once_with(f"{env.TIKTOK_VIDEO_STATS_API}/122222223233232")
+    assert json.loads(out.read_text())["result"]["view_count"] == 10
+    assert "1 queries (1 ok, 0 failed)" in capsys.readouterr().err
+
+
+def test_main_rejects_unsupported_kind(capsys):
+    assert main(["fetch", "--platform", "twitch", "--kind", "video-metrics"]) == 2
+    assert "unsupported kind for twitch" in capsys.readouterr().err
+
+
+def test_main_simulates_fault_profiles(mocker, capsys):
+    mocker.patch("unofficial_livecounts_api.client.get_random_user_agent", return_value="agent")
+
+    assert main(["simulate", "--platform", "twitch", "--profile", "healthy", "-n", "20", "-c", "4"]) == 0
+
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].split() == ["profile", "requests", "ok", "goodput", "p50", "p99"]
+    assert lines[1].split()[:3] == ["healthy", "20", "20"]
+    assert len(lines[1]) == len(lines[0])
@@ -0,0 +1,358 @@
+import gzip
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer, ThreadingHTTPServer
+
+import pytest
+from urllib3.util.request import ACCEPT_ENCODING
+
+from unofficial_livecounts_api import client, env
+from unofficial_livecounts_api.backends import MemoryBackend, SqliteBackend
+from unofficial_livecounts_api.client import DnsCache, Endpoints, LivecountsClient, TransferStats
+from unofficial_livecounts_api.error import RequestApiError
+from unofficial_livecounts_api.hedging import HedgingPolicy
+from unofficial_livecounts_api.tiktok import TiktokAgent, TikTokVideoCount
+from unofficial_livecounts_api.twitch import TwitchAgent
+
+
+def test_default_header_advertises_every_encoding_urllib3_can_decode(mocker):
+    mocker.patch("unofficial_livecounts_api.client.get_random_user_agent", return_value="agent")
+    header = LivecountsClient()._LivecountsClient__get_default_header()
+    encodings = header["Accept-Encoding"].split(", ")
+    assert encodings[:2] == ["gzip", "deflate"]
+    assert set(encodings) == set(ACCEPT_ENCODING.split(","))
+
+
+def test_send_request_records_compressed_and_decompressed_bytes(mocker):
+    mocker.patch("unofficial_livecounts_api.client.get_random_user_agent", return_value="agent")
+    body = json.dumps({"success": True, "userData": [{"id": str(i), "username": "same"} for i in range(200)]}).encode()
+    compressed = gzip.compress(body)
+
+    class GzipHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(compressed)))
+            self.end_headers()
+            self.wfile.write(compressed)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), GzipHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    endpoint = f"http://127.0.0.1:{server.server_port}/user/search"
+    livecounts = LivecountsClient()
+    try:
+        data = livecounts.send_request(url=f"{endpoint}/best")
+        livecounts.send_request(url=f"{endpoint}/other")
+    finally:
+        server.shutdown()
+        livecounts.close()
+
+    assert len(data["userData"]) == 200
+    assert livecounts.transfer_stats.snapshot() == {
+        endpoint: {"requests": 2, "wire_bytes": 2 * len(compressed), "decoded_bytes": 2 * len(body)}
+    }
+
+
+def test_transfer_stats_by_platform():
+    stats = TransferStats()
+    stats.record(f"{env.TIKTOK_USER_SEARCH_API}/best", wire_bytes=10, decoded_bytes=100)
+    stats.record(f"{env.TIKTOK_VIDEO_STATS_API}/1", wire_bytes=1, decoded_bytes=2)
+    stats.record(f"{env.TWITCH_USER_STATS_API}/jack", wire_bytes=3, decoded_bytes=4)
+    stats.record("http://mirror.test/stats/1", wire_bytes=5, decoded_bytes=6)
+
+    assert stats.by_platform() == {
+        "tiktok": {"requests": 2, "wire_bytes": 11, "decoded_bytes": 102},
+        "twitch": {"requests": 1, "wire_bytes": 3, "decoded_bytes": 4},
+        "other": {"requests": 1, "wire_bytes": 5, "decoded_bytes": 6},
+    }
+
+
+class CountingServer:
+    def __init__(self):
+        self.accepted = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self.handler())
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def handler(self):
+        counting = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                counting.accepted += 1
+                super().setup()
+
+            def do_GET(self):
+                body = b'{"success": true}'
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def test_warm_up_opens_connections_that_requests_reuse(mocker):
+    mocker.patch("unofficial_livecounts_api.client.get_random_user_agent", return_value="agent")
+    server = CountingServer()
+    origin = f"http://localhost:{server.server.server_port}"
+    resolve = mocker.spy(client.socket, "getaddrinfo")
+    livecounts = LivecountsClient()
+    try:
+        warmed = livecounts.warm_up(connections_per_host=2, origins=[f"{origin}/user/stats"])
+        livecounts.send_request(f"{origin}/user/stats/1")
+        livecounts.send_request(f"{origin}/user/stats/2")
+    finally:
+        server.server.shutdown()
+        livecounts.close()
+
+    assert warmed == {origin: 2}
+    assert server.accepted == 2
+    assert [call.args[0] for call in resolve.call_args_list].count("localhost") == 1
+
+
+def test_warm_up_reports_unreachable_hosts():
+    with pytest.warns(UserWarning, match="failed to warm up connections"):
+        warmed = LivecountsClient().warm_up(origins=["http://127.0.0.1:9/user/stats"])
+    assert warmed == {"http://127.0.0.1:9": 0}
+
+
+def test_dns_cache_keeps_address_when_refresh_fails(mocker):
+    cache = DnsCache(ttl=60)
+    mocker.patch.object(client.socket, "getaddrinfo", return_value=[(None, None, None, "", ("10.0.0.1", 443))])
+    assert cache.resolve("api.livecounts.io", 443) == "10.0.0.1"
+    client.socket.getaddrinfo.side_effect = OSError("no network")
+    assert cache.resolve("api.livecounts.io", 443, refresh=True) == "10.0.0.1"
+    assert cache.resolve("127.0.0.1", 443) == "127.0.0.1"
+
+
+def test_clients_do_not_share_pools_or_statistics(mocker):
+    mocker.patch("unofficial_livecounts_api.client.get_random_user_agent", return_value="agent")
+    first = LivecountsClient(pool_maxsize=2)
+    second = LivecountsClient(proxy_server="http://127.0.0.1:8080", headers={"X-Tenant": "b"})
+
+    assert first.http_client is not second.http_client
+    assert first.dns_cache is not second.dns_cache
+    assert first.transfer_stats is not second.transfer_stats
+    assert second.http_client.proxy.host == "127.0.0.1"
+    assert second._LivecountsClient__get_default_header()["X-Tenant"] == "b"
+
+
+def test_from_env_reads_proxy_and_pool_settings(mocker):
+    mocker.patch.object(env, "PROXY_ENABLED", "on")
+    mocker.patch.object(env, "PROXY_SERVER", "http://proxy.test:3128")
+
+    livecounts = LivecountsClient.from_env(pool_maxsize=4)
+
+    assert livecounts.proxy_server == "http://proxy.test:3128"
+    assert livecounts.pool_maxsize == 4
+    assert livecounts.dns_cache.ttl == env.DNS_CACHE_TTL
+
+
+def test_endpoints_follow_env_unless_overridden(mocker):
+    endpoints = Endpoints(TWITCH_USER_STATS_API="http://mirror.test/twitch/stats/")
+    mocker.patch.object(env, "TIKTOK_USER_STATS_API", "http://patched.test/user/stats")
+
+    assert endpoints.TWITCH_USER_STATS_API == "http://mirror.test/twitch/stats"
+    assert endpoints.TIKTOK_USER_STATS_API == "http://patched.test/user/stats"
+    assert Endpoints.rebased("http://127.0.0.1:9000/").YOUTUBE_VIDEO_STATS_API == (
+        "http://127.0.0.1:9000/youtube-live-view-counter/stats"
+    )
+    with pytest.raises(ValueError):
+        Endpoints(UNKNOWN_API="http://x")
+    with pytest.raises(AttributeError):
+        endpoints.UNKNOWN_API
+
+
+def test_agent_instances_use_their_own_client(mocker):
+    tenant = LivecountsClient(endpoints=Endpoints.rebased("http://tenant.test"))
+    send_request = mocker.patch.object(tenant, "send_request", return_value={"viewCount": 7})
+    default_send_request = mocker.patch.object(client.get_default_client(), "send_request")
+
+    metrics = TiktokAgent(tenant).fetch_video_metrics("https://tiktok.com/@test/video/123?x=1")
+
+    send_request.assert_called_once_with("http://tenant.test/video/stats/123")
+    default_send_request.assert_not_called()
+    assert metrics == TikTokVideoCount(video_id="123", view_count=7, like_count=0, comment_count=0, share_count=0)
+
+
+def test_static_calls_use_the_default_instance(mocker):
+    send_request = mocker.patch.object(client.get_default_client(), "send_request", return_value={"followerCount": 1})
+
+    TwitchAgent.fetch_user_metrics("jack")
+
+    send_request.assert_called_once_with(f"{env.TWITCH_USER_STATS_API}/jack")
+    assert TwitchAgent.fetch_user_metrics.__self__ is TwitchAgent.default()
+    assert TwitchAgent.default().client is client.get_default_client()
+
+
+class DelayedHttpClient:
+    def __init__(self, delays):
+        self.delays = list(delays)
+        self.calls = 0
+
+    def request(self, method, url, headers):
+        self.calls += 1
+        time.sleep(self.delays.pop(0) if self.delays else 0)
+        return fake_response(json.dumps({"success": True, "calls": self.calls}).encode())
+
+    def clear(self):
+        pass
+
+
+def fake_response(body):
+    class Response:
+        status = 200
+        data = body
+
+        def tell(self):
+            return len(body)
+
+    return Response()
+
+
+def test_slow_stats_requests_are_hedged_through_the_hedge_proxy(mocker):
+    mocker.patch("unofficial_livecounts_api.client.get_random_user_agent", return_value="agent")
+    hedging = HedgingPolicy(percentile=50, min_samples=3, burst=1)
+    livecounts = LivecountsClient(hedging=hedging, hedge_proxy_server="http://127.0.0.1:8080")
+    livecounts.http_client = DelayedHttpClient([0.01, 0.01, 0.01, 1.0])
+    livecounts.hedge_http_client = DelayedHttpClient([0])
+    url = f"{env.TIKTOK_USER_STATS_API}/123"
+    try:
+        for _ in range(3):
+            livecounts.send_request(url)
+        started = time.monotonic()
+        livecounts.send_request(url)
+        elapsed = time.monotonic() - started
+    finally:
+        livecounts.close()
+
+    assert elapsed < 0.5
+    assert livecounts.hedge_http_client.calls == 1
+    assert hedging.stats() == {"requests": 4, "hedged": 1, "hedge_wins": 1}
+
+
+def test_time_queued_for_a_worker_or_the_rate_limit_does_not_trigger_hedges(mocker):
+    mocker.patch("unofficial_livecounts_api.client.get_random_user_agent", return_value="agent")
+    hedging = HedgingPolicy(percentile=50, min_samples=3, burst=10)
+    livecounts = LivecountsClient(
+        pool_maxsize=2, hedging=hedging, hedge_proxy_server="http://127.0.0.1:8080", rate_limit=3, rate_limit_period=0.3
+    )
+    livecounts.http_client = DelayedHttpClient([0.1, 0.1, 0.1] + [0.05] * 6)
+    livecounts.hedge_http_client = DelayedHttpClient([])
+    url = f"{env.TIKTOK_USER_STATS_API}/123"
+    try:
+        for _ in range(3):
+            livecounts.send_request(url)
+        threads = [threading.Thread(target=livecounts.send_request, args=(url,)) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        livecounts.close()
+
+    assert livecounts.http_client.calls == 9
+    assert hedging.stats() == {"requests": 9, "hedged": 0, "hedge_wins": 0}
+
+
+def test_requests_time_out(mocker):
+    mocker.patch("unofficial_livecounts_api.client.get_random_user_agent", return_value="agent")
+    silent = socket.socket()
+    silent.bind(("127.0.0.1", 0))
+    silent.listen()
+    livecounts = LivecountsClient(request_timeout=0.2)
+    try:
+        started = time.monotonic()
+        with pytest.raises(RequestApiError):
+            livecounts.send_request(f"http://127.0.0.1:{silent.getsockname()[1]}/user/stats/1")
+        elapsed = time.monotonic() - started
+    finally:
+        livecounts.close()
+        silent.close()
+
+    assert elapsed < 2
+
+
+def test_hedging_skips_non_stats_endpoints_and_an_empty_budget(mocker):
+    mocker.patch("unofficial_livecounts_api.client.get_random_user_agent", return_value="agent")
+    hedging = HedgingPolicy(percentile=50, min_samples=1, max_extra_ratio=0, burst=0)
+    livecounts = LivecountsClient(hedging=hedging)
+    livecounts.http_client = DelayedHttpClient([0.01, 0.1, 0.1])
+    try:
+        livecounts.send_request(f"{env.TIKTOK_USER_STATS_API}/123")
+        livecounts.send_request(f"{env.TIKTOK_USER_STATS_API}/123")
+        livecounts.send_request(f"{env.TIKTOK_USER_SEARCH_API}/best")
+    finally:
+        livecounts.close()
+
+    assert livecounts.http_client.calls == 3
+    assert hedging.stats() == {"requests": 2, "hedged": 0, "hedge_wins": 0}
+
+
+def test_clients_share_cached_responses_through_the_backend(mocker, tmp_path):
+    mocker.patch("unofficial_livecounts_api.client.get_random_user_agent", return_value="agent")
+    backend_path = str(tmp_path / "shared.db")
+    workers = [LivecountsClient(backend=SqliteBackend(backend_path), cache_ttl=60) for _ in range(2)]
+    for worker in workers:
+        worker.http_client = DelayedHttpClient([])
+    url = f"{env.TWITCH_USER_STATS_API}/jack"
+    try:
+        results = [worker.send_request(url) for worker in workers]
+    finally:
+        for worker in workers:
+            worker.close()
+
+    assert results[0] == results[1] == {"success": True, "calls": 1}
+    assert [worker.http_client.calls for worker in workers] == [1, 0]
+
+
+def test_cache_failures_fall_through_to_upstream(mocker):
+    mocker.patch("unofficial_livecounts_api.client.get_random_user_agent", return_value="agent")
+    backend = MemoryBackend()
+    mocker.patch.object(backend, "get", side_effect=ConnectionError("backend down"))
+    mocker.patch.object(backend, "set", side_effect=ConnectionError("backend down"))
+    livecounts = LivecountsClient(backend=backend, cache_ttl=60)
+    livecounts.http_client = DelayedHttpClient([])
+
+    with pytest.warns(UserWarning, match="skipped the shared response cache"):
+        data = livecounts.send_request(f"{env.TWITCH_USER_STATS_API}/jack")
+
+    assert data == {"success": True, "calls": 1}
+
+
+def test_undecodable_cached_responses_fall_through_to_upstream(mocker):
+    mocker.patch("unofficial_livecounts_api.client.get_random_user_agent", return_value="agent")
+    backend = MemoryBackend()
+    livecounts = LivecountsClient(backend=backend, cache_ttl=60)
+    livecounts.http_client = DelayedHttpClient([])
+    url = f"{env.TWITCH_USER_STATS_API}/jack"
+    backend.set(url, b"\x00not json", ttl=60)
+
+    with pytest.warns(UserWarning, match="skipped the shared response cache"):
+        data = livecounts.send_request(url)
+
+    assert data == {"success": True, "calls": 1}
+    assert livecounts.send_request(url) == data
+
+
+def test_rate_limit_waits_for_the_next_window(mocker):
+    mocker.patch("unofficial_livecounts_api.client.get_random_user_agent", return_value="agent")
+    now = [100.0]
+    sleep = mocker.patch("time.sleep", side_effect=lambda seconds: now.__setitem__(0, now[0] + seconds))
+    livecounts = LivecountsClient(backend=MemoryBackend(clock=lambda: now[0]), rate_limit=2, rate_limit_period=10)
+    livecounts.http_client = DelayedHttpClient([])
+    for _ in range(3):
+        livecounts.send_request(f"{env.TWITCH_USER_STATS_API}/jack")
+
+    assert livecounts.http_client.calls == 3
+    assert [call.args[0] for call in sleep.call_args_list if call.args[0]] == [10.0]
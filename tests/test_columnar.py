@@ -0,0 +1,94 @@
+import pytest
+
+from unofficial_livecounts_api import env
+from unofficial_livecounts_api.client import Endpoints, LivecountsClient, get_default_client
+from unofficial_livecounts_api.columnar import ColumnarBatch, fetch_metrics_columnar
+from unofficial_livecounts_api.error import RequestApiError
+
+
+def fake_send_request(responses):
+    def send(url):
+        response = responses[url]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    return send
+
+
+def test_fetch_tiktok_user_metrics_columnar(mocker):
+    mocker.patch.object(
+        get_default_client(),
+        "send_request",
+        side_effect=fake_send_request(
+            {
+                f"{env.TIKTOK_USER_STATS_API}/1": {"followerCount": 10, "likeCount": 20, "followingCount": 3, "videoCount": 4},
+                f"{env.TIKTOK_USER_STATS_API}/2": {"followerCount": 11},
+                f"{env.TIKTOK_USER_STATS_API}/3": RequestApiError("server reject response this request, status: 429"),
+            }
+        ),
+    )
+
+    batch = fetch_metrics_columnar("tiktok", "user-metrics", ["1", "2", "3"], concurrency=2)
+
+    assert sorted(batch.ids) == ["1", "2"]
+    assert list(batch.columns) == ["follower_count", "like_count", "following_count", "video_count"]
+    rows = {batch.row(i)["id"]: batch.row(i) for i in range(len(batch))}
+    assert rows["1"] == {"id": "1", "follower_count": 10, "like_count": 20, "following_count": 3, "video_count": 4}
+    assert rows["2"] == {"id": "2", "follower_count": 11, "like_count": 0, "following_count": 0, "video_count": 0}
+    assert batch.errors == {"3": "server reject response this request, status: 429"}
+
+
+def test_fetch_youtube_video_metrics_columnar_unpacks_bottom_odos(mocker):
+    mocker.patch.object(
+        get_default_client(),
+        "send_request",
+        return_value={"followerCount": 100, "bottomOdos": [10, 20, 30]},
+    )
+
+    batch = fetch_metrics_columnar("youtube", "video-metrics", ["v"])
+
+    assert batch.row(0) == {"id": "v", "view_count": 100, "like_count": 10, "dislike_count": 20, "comment_count": 30}
+
+
+def test_tiktok_video_urls_are_reduced_to_their_id(mocker):
+    send_request = mocker.patch.object(get_default_client(), "send_request", return_value={"viewCount": 5})
+
+    url = "https://www.tiktok.com/@best/video/7324489913931613189"
+
+    batch = fetch_metrics_columnar("tiktok", "video-metrics", [url])
+
+    send_request.assert_called_once_with(f"{env.TIKTOK_VIDEO_STATS_API}/7324489913931613189")
+    assert batch.ids == ["7324489913931613189"]
+
+
+def test_unsupported_metrics_are_rejected():
+    with pytest.raises(ValueError):
+        fetch_metrics_columnar("twitch", "video-metrics", ["1"])
+
+
+def test_to_numpy_and_pandas_share_counter_memory():
+    np = pytest.importorskip("numpy")
+    pd = pytest.importorskip("pandas")
+    batch = ColumnarBatch(["follower_count"])
+    batch.append("a", [1])
+    batch.append("b", [2])
+
+    columns = batch.to_numpy()
+    frame = batch.to_pandas()
+
+    assert columns["follower_count"].dtype == np.int64
+    assert np.shares_memory(columns["follower_count"], np.frombuffer(batch.columns["follower_count"], dtype=np.int64))
+    assert list(frame.index) == ["a", "b"]
+    assert frame.loc["b", "follower_count"] == 2
+    assert isinstance(frame, pd.DataFrame)
+
+
+def test_fetch_columnar_through_injected_client(mocker):
+    client = LivecountsClient(endpoints=Endpoints(TWITCH_USER_STATS_API="http://mirror.test/twitch/stats"))
+    send_request = mocker.patch.object(client, "send_request", return_value={"followerCount": 5})
+
+    batch = fetch_metrics_columnar("twitch", "user-metrics", ["jack"], client=client)
+
+    send_request.assert_called_once_with("http://mirror.test/twitch/stats/jack")
+    assert batch.row(0) == {"id": "jack", "follower_count": 5}
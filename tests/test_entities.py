@@ -0,0 +1,85 @@
+from unofficial_livecounts_api import env
+from unofficial_livecounts_api.client import LivecountsClient
+from unofficial_livecounts_api.entities import IdentityMap
+from unofficial_livecounts_api.tiktok import TiktokAgent, TiktokUser, TiktokVideo
+
+
+def author(display_name):
+    return {"userId": "42", "id": "best", "username": display_name, "avatar": "a.jpg"}
+
+
+def test_authors_are_interned_once_across_videos_and_searches(mocker):
+    identity_map = IdentityMap()
+    agent = TiktokAgent(LivecountsClient(identity_map=identity_map))
+    send_request = mocker.patch.object(TiktokAgent, "send_request")
+    send_request.side_effect = [
+        {"title": "one", "cover": "", "author": author("Best")},
+        {"title": "two", "cover": "", "author": author("Best")},
+        {"userData": [{**author("Best Renamed"), "verified": True}]},
+    ]
+
+    first = agent.find_video("1")
+    second = agent.find_video("2")
+    users = agent.find_user("best")
+
+    assert first.user is second.user is users[0]
+    assert first.user.display_name == "Best Renamed"
+    assert len(identity_map) == 3
+
+
+def test_fields_missing_from_a_later_response_are_kept(mocker):
+    agent = TiktokAgent(LivecountsClient(identity_map=IdentityMap()))
+    send_request = mocker.patch.object(TiktokAgent, "send_request")
+    send_request.side_effect = [
+        {"userData": [{**author("Best"), "verified": True}]},
+        {"title": "clip", "cover": "", "author": author("Best")},
+    ]
+
+    user = agent.find_user("best")[0]
+    video = agent.find_video("1")
+
+    assert video.user is user
+    assert user.verified is True
+
+
+def test_entities_without_an_id_are_not_merged(mocker):
+    agent = TiktokAgent(LivecountsClient(identity_map=IdentityMap()))
+    mocker.patch.object(TiktokAgent, "send_request").return_value = {
+        "userData": [{"id": "alice", "username": "Alice"}, {"id": "bob", "username": "Bob"}]
+    }
+
+    users = agent.find_user("a")
+
+    assert [user.username for user in users] == ["alice", "bob"]
+    assert users[0] is not users[1]
+    assert len(agent.client.identity_map) == 0
+
+
+def test_fresh_lookups_are_answered_locally(mocker):
+    now = [0.0]
+    identity_map = IdentityMap(ttl=60, clock=lambda: now[0])
+    agent = TiktokAgent(LivecountsClient(identity_map=identity_map))
+    send_request = mocker.patch.object(TiktokAgent, "send_request")
+    send_request.return_value = {"title": "clip", "cover": "", "author": author("Best")}
+
+    by_url = agent.find_video("https://www.tiktok.com/@best/video/7324489913931613189")
+    by_id = agent.find_video("7324489913931613189")
+    assert by_id is by_url
+    assert identity_map.get(TiktokVideo, "7324489913931613189") is by_url
+    assert identity_map.get(TiktokUser, "42") is by_url.user
+    assert send_request.call_count == 1
+
+    now[0] = 61
+    agent.find_video("7324489913931613189")
+
+    send_request.assert_called_with(url=f"{env.TIKTOK_VIDEO_SEARCH_API}/7324489913931613189")
+    assert send_request.call_count == 2
+    assert (identity_map.hits, identity_map.misses) == (1, 2)
+
+
+def test_lru_bound_evicts_oldest_entities():
+    identity_map = IdentityMap(max_size=2)
+    users = [identity_map.intern(TiktokUser(str(n), "u", "U", "")) for n in range(3)]
+
+    assert identity_map.get(TiktokUser, "0") is None
+    assert identity_map.get(TiktokUser, "2") is users[2]
@@ -0,0 +1,32 @@
+import pytest
+
+from unofficial_livecounts_api.hedging import HedgingPolicy
+
+
+def test_delay_is_the_latency_percentile_once_enough_samples_exist():
+    policy = HedgingPolicy(percentile=90, min_samples=10)
+    for latency in range(1, 10):
+        policy.record("https://api/stats", latency / 10)
+
+    assert policy.delay("https://api/stats") is None
+
+    policy.record("https://api/stats", 1.0)
+
+    assert policy.delay("https://api/stats") == 0.9
+    assert policy.delay("https://api/other") is None
+
+
+def test_hedges_are_limited_by_the_extra_load_budget():
+    policy = HedgingPolicy(max_extra_ratio=0.1, burst=1)
+    granted = 0
+    for _ in range(100):
+        policy.start_request()
+        granted += policy.try_hedge()
+
+    assert granted == 10
+    assert policy.stats() == {"requests": 100, "hedged": 10, "hedge_wins": 0}
+
+
+def test_percentile_must_be_within_range():
+    with pytest.raises(ValueError):
+        HedgingPolicy(percentile=0)
@@ -0,0 +1,72 @@
+import pytest
+
+from unofficial_livecounts_api.interpolation import LiveCountEstimator
+
+
+def test_estimate_is_none_before_first_poll():
+    assert LiveCountEstimator(clock=lambda: 0).estimate() is None
+
+
+def test_single_poll_holds_value():
+    estimator = LiveCountEstimator()
+    estimator.observe(100, at=0)
+    assert estimator.estimate(at=5) == 100
+
+
+def test_extrapolates_along_fitted_rate():
+    estimator = LiveCountEstimator(correction_seconds=0)
+    estimator.observe(1000, at=0)
+    estimator.observe(1100, at=10)
+    estimator.observe(1200, at=20)
+
+    assert estimator.rate == pytest.approx(10)
+    assert estimator.estimate(at=20.1) == pytest.approx(1201)
+    assert estimator.estimate(at=25) == pytest.approx(1250)
+
+
+def test_correction_blends_misprediction_without_jump():
+    estimator = LiveCountEstimator(correction_seconds=2)
+    estimator.observe(0, at=0)
+    estimator.observe(100, at=10)
+    shown_before = estimator.estimate(at=20)
+    assert shown_before == pytest.approx(200)
+
+    estimator.observe(150, at=20)
+
+    assert estimator.estimate(at=20) == pytest.approx(shown_before)
+    assert estimator.estimate(at=22) == pytest.approx(150 + estimator.rate * 2)
+
+
+def test_extrapolation_stops_after_max_extrapolation():
+    estimator = LiveCountEstimator(max_extrapolation=30, correction_seconds=0)
+    estimator.observe(0, at=0)
+    estimator.observe(10, at=10)
+    assert estimator.estimate(at=40) == estimator.estimate(at=1000) == pytest.approx(40)
+
+
+def test_monotonic_estimate_never_goes_backwards():
+    estimator = LiveCountEstimator(correction_seconds=2, monotonic=True)
+    estimator.observe(0, at=0)
+    estimator.observe(100, at=10)
+    assert estimator.estimate(at=20) == pytest.approx(200)
+
+    estimator.observe(120, at=20)
+
+    readings = [estimator.estimate(at=20 + step / 10) for step in range(0, 40)]
+    assert readings == sorted(readings)
+    assert readings[0] == pytest.approx(200)
+
+
+def test_uses_clock_by_default():
+    now = [0.0]
+    estimator = LiveCountEstimator(correction_seconds=0, clock=lambda: now[0])
+    estimator.observe(0)
+    now[0] = 1
+    estimator.observe(10)
+    now[0] = 1.5
+    assert estimator.estimate() == pytest.approx(15)
+
+
+def test_invalid_history_is_rejected():
+    with pytest.raises(ValueError):
+        LiveCountEstimator(history=0)
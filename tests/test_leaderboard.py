@@ -0,0 +1,42 @@
+import random
+
+from unofficial_livecounts_api.leaderboard import Leaderboard, _SortedList
+from unofficial_livecounts_api.tiktok import TiktokUserCount
+from unofficial_livecounts_api.twitch import TwitchUserCount
+
+
+def test_incremental_updates_match_a_full_sort(mocker):
+    mocker.patch.object(_SortedList, "LOAD", 4)
+    leaderboard = Leaderboard("follower_count")
+    expected = {}
+    rng = random.Random(7)
+    for step in range(2000):
+        key = f"user-{rng.randrange(300)}"
+        if key in expected and rng.random() < 0.1:
+            leaderboard.remove(key)
+            del expected[key]
+            continue
+        expected[key] = rng.randrange(1000)
+        leaderboard.update(TiktokUserCount(key, expected[key], 0, 0, 0), at=step)
+
+    ranking = sorted(((value, key) for key, value in expected.items()), reverse=True)
+    assert len(leaderboard) == len(expected)
+    assert leaderboard.top(10) == [(key, value) for value, key in ranking[:10]]
+    assert leaderboard.bottom(5) == [(key, value) for value, key in reversed(ranking[-5:])]
+    key = ranking[42][1]
+    assert leaderboard.rank(key) == 43
+    assert leaderboard.get(key) == expected[key]
+
+
+def test_fastest_growing_uses_smoothed_rate_per_second():
+    leaderboard = Leaderboard("follower_count", smoothing=1)
+    leaderboard.update_many([TwitchUserCount("a", 100), TwitchUserCount("b", 1000), TwitchUserCount("c", 5)], at=0)
+    leaderboard.update_many([TwitchUserCount("a", 160), TwitchUserCount("b", 1010)], at=10)
+
+    assert leaderboard.top(1) == [("b", 1010)]
+    assert leaderboard.fastest_growing(5) == [("a", 6.0), ("b", 1.0)]
+
+    leaderboard.update(TwitchUserCount("a", 160), at=20)
+
+    assert leaderboard.fastest_growing(1) == [("b", 1.0)]
+    assert "c" in leaderboard
@@ -0,0 +1,85 @@
+import threading
+import time
+
+import pytest
+
+from unofficial_livecounts_api.error import RequestApiError
+from unofficial_livecounts_api.pipeline import Pipeline
+from unofficial_livecounts_api.tiktok import TiktokAgent
+
+
+def test_items_flow_through_every_stage():
+    sunk = []
+    lock = threading.Lock()
+
+    def sink(item):
+        with lock:
+            sunk.append(item)
+
+    stats = (
+        Pipeline(range(100), queue_size=4)
+        .stage("fetch", lambda item: item * 2, workers=4)
+        .stage("transform", lambda item: item + 1 if item % 4 == 0 else None, workers=2)
+        .stage("sink", sink)
+        .run()
+    )
+
+    assert sorted(sunk) == [item * 2 + 1 for item in range(0, 100, 2)]
+    assert stats["source"]["produced"] == 100
+    assert stats["stages"]["fetch"]["processed"] == 100
+    assert stats["stages"]["transform"]["processed"] == 50
+    assert stats["stages"]["transform"]["dropped"] == 50
+    assert stats["stages"]["sink"]["processed"] == 50
+    assert all(stage["queue_depth"] == 0 for stage in stats["stages"].values())
+
+
+def test_slow_sink_bounds_the_items_in_flight():
+    fetched = []
+    sunk = []
+
+    def fetch(item):
+        fetched.append(item)
+        return item
+
+    def sink(item):
+        time.sleep(0.005)
+        sunk.append(item)
+        # Fetched but not yet sunk: at most both queues, plus one item held by each worker.
+        assert len(fetched) - len(sunk) <= 2 + 2 + 2 + 1
+
+    stats = Pipeline(range(100), queue_size=2).stage("fetch", fetch, workers=2).stage("sink", sink).run()
+
+    assert len(sunk) == 100
+    assert stats["stages"]["sink"]["max_queue_depth"] == 2
+    assert stats["stages"]["fetch"]["blocked_seconds"] > stats["stages"]["sink"]["blocked_seconds"]
+
+
+def test_request_errors_are_counted_and_other_errors_stop_the_pipeline():
+    def fetch(item):
+        if item % 3 == 0:
+            raise RequestApiError("upstream failed")
+        return item
+
+    stats = Pipeline(range(9)).stage("fetch", fetch, workers=3).stage("sink", lambda item: None).run()
+    assert stats["stages"]["fetch"]["errors"] == 3
+    assert stats["stages"]["sink"]["processed"] == 6
+
+    def sink(item):
+        raise KeyError(item)
+
+    pipeline = Pipeline(range(1000), queue_size=1).stage("fetch", lambda item: item).stage("sink", sink)
+    with pytest.raises(KeyError):
+        pipeline.run()
+    assert pipeline.stats()["source"]["produced"] < 1000
+
+
+def test_fetch_metrics_stage_calls_the_agent(mocker):
+    fetch = mocker.patch.object(TiktokAgent, "fetch_user_metrics", side_effect=lambda query: f"count-{query}")
+    sunk = []
+
+    Pipeline(["1", "2"]).fetch_metrics("tiktok", "user-metrics", workers=1).stage("sink", sunk.append).run()
+
+    assert sunk == ["count-1", "count-2"]
+    assert fetch.call_count == 2
+    with pytest.raises(ValueError):
+        Pipeline([]).fetch_metrics("tiktok", "user")
@@ -0,0 +1,55 @@
+import io
+import json
+
+from unofficial_livecounts_api import profiling
+from unofficial_livecounts_api.client import LivecountsClient
+from unofficial_livecounts_api.tiktok import TiktokAgent
+
+
+class Response:
+    status = 200
+    data = json.dumps({"title": "clip", "cover": "", "author": {"userId": "1", "id": "best"}}).encode()
+
+    def tell(self):
+        return len(self.data)
+
+
+def test_profiled_calls_record_every_stage_of_the_request_path(mocker):
+    mocker.patch("unofficial_livecounts_api.client.get_random_user_agent", return_value="agent")
+    mocker.patch.object(profiling.profiler, "enabled", True)
+    profiling.profiler.reset()
+    client = LivecountsClient()
+    mocker.patch.object(client, "http_client").request.return_value = Response()
+
+    video = TiktokAgent(client).find_video("https://www.tiktok.com/@best/video/7324489913931613189")
+
+    assert video.user.user_id == "1"
+    stacks = {line.rsplit(" ", 1)[0] for line in profiling.profiler.folded()}
+    root = "TiktokAgent.find_video"
+    assert stacks == {
+        root,
+        f"{root};validators.url",
+        f"{root};video_id_regex",
+        f"{root};build_url",
+        f"{root};build_model",
+        f"{root};send_request",
+        f"{root};send_request;sign_headers",
+        f"{root};send_request;sign_headers;user_agent",
+        f"{root};send_request;network",
+        f"{root};send_request;json_decode",
+    }
+    output = io.StringIO()
+    profiling.profiler.write(output)
+    table = output.getvalue().splitlines()
+    assert table[0].split() == ["stage", "calls", "total", "ms", "share"]
+    assert {line.split()[0] for line in table[1:]} == {stack.rsplit(";", 1)[-1] for stack in stacks}
+    profiling.profiler.reset()
+
+
+def test_stages_are_free_when_profiling_is_disabled():
+    profiling.profiler.reset()
+
+    with profiling.stage("network"):
+        profiling.phase("build_url")
+
+    assert profiling.profiler.folded() == []
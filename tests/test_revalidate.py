@@ -0,0 +1,161 @@
+import threading
+import time
+
+import pytest
+
+from unofficial_livecounts_api.error import RequestApiError
+from unofficial_livecounts_api.revalidate import RevalidatingCache
+from unofficial_livecounts_api.youtube import YoutubeAgent
+
+
+class Upstream:
+    def __init__(self):
+        self.calls = 0
+        self.fail = False
+        self.gate = threading.Event()
+        self.gate.set()
+        self.done = threading.Event()
+
+    def __call__(self, query):
+        self.gate.wait(5)
+        self.calls += 1
+        try:
+            if self.fail:
+                raise RequestApiError("upstream failed")
+            return f"{query}-{self.calls}"
+        finally:
+            self.done.set()
+
+
+def test_stale_results_are_served_while_refreshing():
+    now = [0.0]
+    upstream = Upstream()
+    with RevalidatingCache(upstream, ttl=10, max_staleness=60, clock=lambda: now[0]) as cache:
+        assert cache.get("a") == "a-1"
+        assert cache.get("a") == "a-1"
+
+        now[0] = 15
+        upstream.gate.clear()
+        upstream.done.clear()
+        assert cache.get("a") == "a-1"
+        assert cache.get("a") == "a-1"
+        upstream.gate.set()
+        assert upstream.done.wait(5)
+
+        cache.close()
+        cache._executor.shutdown(wait=True)
+        assert cache.peek("a")[0] == "a-2"
+        assert upstream.calls == 2
+        assert cache.stats == {"fresh": 1, "stale": 2, "misses": 1, "refreshes": 1, "refresh_errors": 0}
+
+
+def test_failed_refresh_keeps_the_last_result_until_max_staleness():
+    now = [0.0]
+    upstream = Upstream()
+    with RevalidatingCache(upstream, ttl=10, max_staleness=60, workers=1, clock=lambda: now[0]) as cache:
+        cache.get("a")
+        upstream.fail = True
+
+        now[0] = 30
+        upstream.done.clear()
+        assert cache.get("a") == "a-1"
+        assert upstream.done.wait(5)
+        cache._executor.submit(lambda: None).result()
+        assert cache.stats["refresh_errors"] == 1
+
+        now[0] = 61
+        with pytest.raises(RequestApiError):
+            cache.get("a")
+
+
+def test_hot_keys_are_refreshed_ahead_of_their_ttl():
+    now = [0.0]
+    upstream = Upstream()
+    with RevalidatingCache(upstream, ttl=10, refresh_ahead=0.8, hot_reads=2, workers=1, clock=lambda: now[0]) as c:
+        c.get("hot")
+        c.get("cold")
+        c.get("hot")
+
+        now[0] = 8.5
+        upstream.done.clear()
+        assert c.get("hot") == "hot-1"
+        assert c.get("cold") == "cold-2"
+        assert upstream.done.wait(5)
+        c._executor.submit(lambda: None).result()
+
+        assert c.peek("hot")[0] == "hot-3"
+        assert c.peek("cold") == ("cold-2", 8.5)
+        assert upstream.calls == 3
+
+
+def test_concurrent_misses_fetch_once():
+    upstream = Upstream()
+    upstream.gate.clear()
+    with RevalidatingCache(upstream) as cache:
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get("a"))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        upstream.gate.set()
+        for thread in threads:
+            thread.join(5)
+
+    assert results == ["a-1"] * 4
+    assert upstream.calls == 1
+
+
+def test_close_fails_readers_waiting_on_cancelled_refreshes():
+    now = [0.0]
+    upstream = Upstream()
+    cache = RevalidatingCache(upstream, ttl=10, max_staleness=60, workers=1, clock=lambda: now[0])
+    cache.get("a")
+    cache.get("b")
+
+    now[0] = 30
+    upstream.gate.clear()
+    cache.get("a")
+    cache.get("b")
+    now[0] = 70
+    errors = []
+
+    def read():
+        try:
+            cache.get("b")
+        except RuntimeError as e:
+            errors.append(e)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    time.sleep(0.05)  # let the reader wait on the queued refresh of "b"; closing first fails it the same way
+    cache.close()
+    reader.join(5)
+    upstream.gate.set()
+
+    assert len(errors) == 1
+    with pytest.raises(RuntimeError, match="closed"):
+        cache.get("a")
+
+
+def test_results_are_bounded_to_the_most_recently_read():
+    upstream = Upstream()
+    with RevalidatingCache(upstream, max_size=2) as cache:
+        cache.get("a")
+        cache.get("b")
+        cache.get("a")
+        cache.get("c")
+
+        assert cache.peek("a") is not None
+        assert cache.peek("b") is None
+        assert cache.peek("c") is not None
+
+
+def test_for_metrics_wraps_the_agent_method(mocker):
+    fetch = mocker.patch.object(YoutubeAgent, "fetch_channel_metrics", return_value="count")
+    with RevalidatingCache.for_metrics("youtube", "channel-metrics") as cache:
+        assert cache.get("UC123") == "count"
+    fetch.assert_called_once_with("UC123")
+
+    with pytest.raises(ValueError):
+        RevalidatingCache.for_metrics("youtube", "channel")
+    with pytest.raises(ValueError):
+        RevalidatingCache(fetch, ttl=10, max_staleness=5)
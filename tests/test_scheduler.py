@@ -0,0 +1,172 @@
+import threading
+import time
+
+import pytest
+
+from unofficial_livecounts_api.error import RequestApiError
+from unofficial_livecounts_api.scheduler import AdaptiveScheduler
+from unofficial_livecounts_api.tiktok import TikTokVideoCount
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def make_fetch(values):
+    counts = {query: iter(series) for query, series in values.items()}
+
+    def fetch(query):
+        return TikTokVideoCount(
+            video_id=query, view_count=next(counts[query]), like_count=0, comment_count=0, share_count=0
+        )
+
+    return fetch
+
+
+def test_fast_moving_item_is_polled_more_often_than_dormant_item():
+    clock = FakeClock()
+    scheduler = AdaptiveScheduler(
+        budget_per_second=100, min_interval=1, max_interval=64, clock=clock, sleep=clock.sleep
+    )
+    fetch = make_fetch({"viral": range(0, 10**9, 1000), "dormant": iter(lambda: 5, None)})
+    scheduler.track("viral", fetch, "view_count", key="viral")
+    scheduler.track("dormant", fetch, "view_count", key="dormant")
+
+    polled = []
+    scheduler.run(lambda item, result, error: polled.append(item.key), should_stop=lambda: clock.now > 300)
+
+    assert polled.count("viral") > 10 * polled.count("dormant")
+    assert scheduler.get("viral").interval == 1
+    assert scheduler.get("dormant").interval == 64
+
+
+def test_interval_follows_rate_of_change():
+    clock = FakeClock()
+    scheduler = AdaptiveScheduler(budget_per_second=10, min_interval=1, max_interval=600, clock=clock)
+    scheduler.track("1", make_fetch({"1": [0, 10, 20]}), "view_count", interval=10, key="1")
+
+    scheduler.poll_once()
+    clock.now = 10
+    scheduler.poll_once()
+
+    assert scheduler.get("1").rate == 1.0
+    assert scheduler.get("1").interval == 1.0
+
+
+def test_budget_spaces_requests():
+    clock = FakeClock()
+    scheduler = AdaptiveScheduler(budget_per_second=2, clock=clock)
+    fetch = make_fetch({str(i): iter(lambda: 0, None) for i in range(3)})
+    for i in range(3):
+        scheduler.track(str(i), fetch, "view_count")
+
+    assert scheduler.poll_once() is not None
+    assert scheduler.poll_once() is None
+    assert scheduler.next_wakeup() == 0.5
+    clock.now = 0.5
+    assert scheduler.poll_once() is not None
+
+
+def test_error_backs_off_and_is_reported():
+    clock = FakeClock()
+    scheduler = AdaptiveScheduler(budget_per_second=10, min_interval=2, clock=clock)
+
+    def failing_fetch(query):
+        raise RequestApiError("server reject response this request, status: 429")
+
+    scheduler.track("1", failing_fetch, "view_count", key="1")
+    item, result, error = scheduler.poll_once()
+
+    assert result is None
+    assert isinstance(error, RequestApiError)
+    assert item.errors == 1
+    assert item.interval == 4
+    assert item.next_due_at == 4
+
+
+def test_any_fetch_failure_keeps_the_item_scheduled():
+    clock = FakeClock()
+    scheduler = AdaptiveScheduler(budget_per_second=10, min_interval=2, clock=clock)
+    scheduler.track("1", lambda query: None, "view_count", key="1")
+
+    def broken_fetch(query):
+        raise ConnectionError("connection reset")
+
+    scheduler.track("2", broken_fetch, "view_count", key="2")
+    _, _, first_error = scheduler.poll_once()
+    clock.sleep(0.1)
+    _, _, second_error = scheduler.poll_once()
+
+    assert isinstance(first_error, AttributeError)
+    assert isinstance(second_error, ConnectionError)
+    assert len(scheduler) == 2
+    assert scheduler.next_wakeup() == 4
+    assert scheduler.get("2").errors == 1
+
+
+def test_a_metric_turning_null_is_a_poll_error():
+    clock = FakeClock()
+    scheduler = AdaptiveScheduler(budget_per_second=10, min_interval=2, clock=clock)
+    scheduler.track("1", make_fetch({"1": [5, None]}), "view_count", key="1")
+
+    assert scheduler.poll_once()[2] is None
+    clock.now = 2
+    _, result, error = scheduler.poll_once()
+
+    assert result is None
+    assert isinstance(error, ValueError)
+    assert len(scheduler) == 1
+    assert scheduler.next_wakeup() == 6
+    assert scheduler.get("1").last_value == 5
+
+
+def test_slow_and_hung_calls_do_not_stall_the_other_items():
+    scheduler = AdaptiveScheduler(budget_per_second=1000, min_interval=0.05, max_interval=0.05, workers=4)
+    release = threading.Event()
+
+    def hung_fetch(query):
+        release.wait(5)
+        raise ConnectionError("timed out")
+
+    def slow_fetch(query):
+        time.sleep(0.05)
+        return TikTokVideoCount(video_id=query, view_count=0, like_count=0, comment_count=0, share_count=0)
+
+    scheduler.track("hung", hung_fetch, "view_count", key="hung")
+    for query in ("1", "2", "3"):
+        scheduler.track(query, slow_fetch, "view_count", key=query)
+    polled = []
+    deadline = time.monotonic() + 0.5
+
+    def should_stop():
+        if time.monotonic() > deadline:
+            release.set()
+        return release.is_set()
+
+    scheduler.run(lambda item, result, error: polled.append(item.key), should_stop)
+
+    assert all(polled.count(query) >= 3 for query in ("1", "2", "3"))
+    assert len(polled) > 0.5 / 0.05
+
+
+def test_untracked_item_is_not_polled():
+    clock = FakeClock()
+    scheduler = AdaptiveScheduler(budget_per_second=10, clock=clock)
+    scheduler.track("1", make_fetch({"1": [0]}), "view_count", key="1")
+    scheduler.untrack("1")
+
+    assert scheduler.poll_once() is None
+    assert scheduler.next_wakeup() is None
+    assert len(scheduler) == 0
+
+
+def test_invalid_budget_is_rejected():
+    with pytest.raises(ValueError):
+        AdaptiveScheduler(budget_per_second=0)
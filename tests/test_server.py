@@ -0,0 +1,153 @@
+import asyncio
+import json
+import threading
+
+from unofficial_livecounts_api.error import RequestApiError
+from unofficial_livecounts_api.server import FanoutHub, LivecountsServer
+from unofficial_livecounts_api.twitch import TwitchUserCount
+
+
+class StubUpstream:
+    def __init__(self, fail_queries=()):
+        self.calls = []
+        self.fail_queries = fail_queries
+        self.lock = threading.Lock()
+
+    def __call__(self, platform, kind, query):
+        with self.lock:
+            self.calls.append((platform, kind, query))
+            count = len(self.calls)
+        if query in self.fail_queries:
+            raise RequestApiError(f"api server error, query: {query}")
+        return TwitchUserCount(user_id=query, follower_count=count)
+
+
+class GatedUpstream(StubUpstream):
+    """
+    Records every call as soon as it starts, then holds it until the test opens the gate.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+        self.gate.set()
+        self.waiting = 0
+
+    def __call__(self, platform, kind, query):
+        result = super().__call__(platform, kind, query)
+        with self.lock:
+            self.waiting += 1
+        self.gate.wait(5)
+        with self.lock:
+            self.waiting -= 1
+        return result
+
+
+async def open_stream(port, path):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    status = (await reader.readline()).decode()
+    while (await reader.readline()).strip():
+        pass
+    return status, reader, writer
+
+
+async def read_event(reader):
+    lines = []
+    while True:
+        line = (await asyncio.wait_for(reader.readline(), 5)).decode().rstrip("\n")
+        if not line:
+            break
+        lines.append(line)
+    fields = dict(line.split(": ", 1) for line in lines)
+    return fields["event"], json.loads(fields["data"])
+
+
+def test_many_subscribers_share_one_upstream_poller():
+    async def scenario():
+        upstream = StubUpstream()
+        server = LivecountsServer(FanoutHub(fetch=upstream, interval=0.05), port=0)
+        await server.start()
+        path = "/subscribe?platform=twitch&kind=user-metrics&id=jack"
+        clients = [await open_stream(server.port, path) for _ in range(5)]
+        events = [[await read_event(reader) for _ in range(3)] for _, reader, _ in clients]
+        stats = server.hub.stats()
+        for _, _, writer in clients:
+            writer.close()
+        await server.close()
+        return upstream, clients, events, stats
+
+    upstream, clients, events, stats = asyncio.run(scenario())
+
+    assert all(status.startswith("HTTP/1.1 200") for status, _, _ in clients)
+    assert stats["topics"] == 1
+    assert stats["subscriptions"] == 5
+    assert {call[:2] for call in upstream.calls} == {("twitch", "user-metrics")}
+    assert len(upstream.calls) <= 5
+    for client_events in events:
+        assert [name for name, _ in client_events] == ["count"] * 3
+        assert client_events[-1][1]["result"]["user_id"] == "jack"
+
+
+def test_errors_are_streamed_as_error_events():
+    async def scenario():
+        server = LivecountsServer(FanoutHub(fetch=StubUpstream(fail_queries={"bad"}), interval=10), port=0)
+        await server.start()
+        _, reader, writer = await open_stream(server.port, "/subscribe?platform=twitch&kind=user-metrics&id=bad")
+        event = await read_event(reader)
+        writer.close()
+        await server.close()
+        return event
+
+    name, data = asyncio.run(scenario())
+
+    assert name == "error"
+    assert data["error"] == "api server error, query: bad"
+
+
+def test_invalid_subscriptions_are_rejected():
+    async def scenario():
+        server = LivecountsServer(FanoutHub(fetch=StubUpstream()), port=0)
+        await server.start()
+        responses = []
+        for path in ["/subscribe?platform=twitch&kind=video-metrics&id=1", "/subscribe?platform=twitch&kind=user", "/x"]:
+            status, reader, writer = await open_stream(server.port, path)
+            responses.append((status.split()[1], json.loads(await reader.read())))
+            writer.close()
+        await server.close()
+        return responses
+
+    responses = asyncio.run(scenario())
+
+    assert [status for status, _ in responses] == ["400", "400", "404"]
+    assert "unsupported kind for twitch" in responses[0][1]["error"]
+
+
+def test_poller_stops_when_last_subscriber_leaves():
+    async def scenario():
+        upstream = GatedUpstream()
+        hub = FanoutHub(fetch=upstream, interval=0.01)
+        first = hub.subscribe([("tiktok", "user-metrics", "1")])
+        second = hub.subscribe([("tiktok", "user-metrics", "1"), ("tiktok", "user-metrics", "2")])
+        await anext(first)
+
+        # Hold the next fetch of both topics, so every poll already submitted has been recorded.
+        upstream.gate.clear()
+
+        async def held():
+            while upstream.waiting < 2:
+                await asyncio.sleep(0.001)
+
+        await asyncio.wait_for(held(), 5)
+        hub.unsubscribe(first)
+        assert hub.stats()["topics"] == 2
+        hub.unsubscribe(second)
+        assert hub.stats()["topics"] == 0
+        calls = len(upstream.calls)
+        upstream.gate.set()
+        await asyncio.sleep(0.05)
+        return calls, len(upstream.calls)
+
+    before, after = asyncio.run(scenario())
+    assert before == after
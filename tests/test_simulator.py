@@ -0,0 +1,73 @@
+import pytest
+
+from unofficial_livecounts_api.error import RequestApiError
+from unofficial_livecounts_api.simulator import FaultProfile, UpstreamSimulator, constant, run_load, run_profiles
+from unofficial_livecounts_api.tiktok import TiktokAgent
+from unofficial_livecounts_api.twitch import TwitchAgent
+from unofficial_livecounts_api.twitter import TwitterAgent
+from unofficial_livecounts_api.youtube import YoutubeAgent
+
+
+def test_simulator_serves_every_agent_call(mocker):
+    mocker.patch("unofficial_livecounts_api.client.get_random_user_agent", return_value="agent")
+    with UpstreamSimulator() as simulator:
+        client = simulator.client()
+        tiktok, youtube = TiktokAgent(client), YoutubeAgent(client)
+        twitter, twitch = TwitterAgent(client), TwitchAgent(client)
+
+        assert tiktok.find_user("best")[0].username == "best"
+        assert tiktok.find_video("7324489913931613189").user.user_id == "7324489913931613189-id"
+        assert tiktok.fetch_user_metrics("1").follower_count > 1_000_000
+        assert tiktok.fetch_video_metrics("1").view_count > 9_000_000
+        assert youtube.find_channel("mr")[0].channel_id == "mr"
+        assert youtube.find_video("song")[0].video_id == "song"
+        assert youtube.fetch_channel_metrics("mr").video_count == 42
+        assert youtube.fetch_video_metrics("song").like_count > 9_000_000
+        assert twitter.find_user("jack").display_name == "Jack"
+        assert twitter.fetch_user_metrics("jack").following_count == 42
+        assert twitch.find_user("ninja")[0].user_id == "ninja-id"
+        assert twitch.fetch_user_metrics("ninja").follower_count > 1_000_000
+        client.close()
+
+
+@pytest.mark.parametrize("fault", ["not_success", "truncated", "malformed", "reset", 429, 503])
+def test_every_fault_reaches_the_caller_as_request_api_error(mocker, fault):
+    mocker.patch("unofficial_livecounts_api.client.get_random_user_agent", return_value="agent")
+    with UpstreamSimulator(FaultProfile(str(fault), schedule=[(0, 60, fault)])) as simulator:
+        client = simulator.client()
+        with pytest.raises(RequestApiError):
+            TwitchAgent(client).fetch_user_metrics("ninja")
+        client.close()
+
+    assert simulator.faults[str(fault)] >= 1
+
+
+def test_load_reports_goodput_and_latency_per_profile(mocker):
+    mocker.patch("unofficial_livecounts_api.client.get_random_user_agent", return_value="agent")
+    profiles = [
+        FaultProfile("healthy", latency=constant(0.002)),
+        FaultProfile("flaky", latency=constant(0.002), rates={500: 0.5}),
+    ]
+
+    healthy, flaky = run_profiles(profiles, "twitch", "user-metrics", requests=100, concurrency=4, seed=3)
+
+    assert (healthy.name, healthy.requests, healthy.successes) == ("healthy", 100, 100)
+    assert healthy.faults == {"ok": 100}
+    assert healthy.goodput > flaky.goodput > 0
+    assert flaky.successes == flaky.faults["ok"]
+    assert flaky.errors == {"server reject response this request": flaky.faults["500"]}
+    assert 0.002 <= healthy.percentile(50) <= healthy.percentile(99)
+
+
+def test_run_load_uses_the_current_profile(mocker):
+    mocker.patch("unofficial_livecounts_api.client.get_random_user_agent", return_value="agent")
+    with UpstreamSimulator(FaultProfile("down", schedule=[(0, 60, 502)])) as simulator:
+        report = run_load(simulator, "youtube", "channel-metrics", ["a", "b"], concurrency=2)
+
+    assert report.successes == 0
+    assert report.__dict__()["profile"] == "down"
+
+
+def test_unknown_faults_are_rejected():
+    with pytest.raises(ValueError):
+        FaultProfile("bad", rates={"teapot": 0.1})
@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+from unofficial_livecounts_api.snapshot_log import SnapshotLogReader, SnapshotLogWriter
+from unofficial_livecounts_api.tiktok import TiktokUserCount
+
+COLUMNS = ("follower_count", "like_count", "following_count", "video_count")
+
+
+def test_snapshots_round_trip_and_are_smaller_than_json(tmp_path):
+    path = tmp_path / "tiktok.lcsl"
+    rows = []
+    with SnapshotLogWriter(path, COLUMNS, block_size=50) as writer:
+        for step in range(120):
+            for user_id, base in (("1", 1_000_000), ("2", 5)):
+                count = TiktokUserCount(user_id, base + step * 3, base * 10 + step * step, 321, 42 - (step > 60))
+                writer.append_count(count, at=1_700_000_000 + step * 10.5)
+                rows.append(count.__dict__())
+
+    reader = SnapshotLogReader(path)
+
+    assert reader.columns == COLUMNS
+    assert reader.keys() == ["1", "2"]
+    assert len(reader) == 240
+    snapshots = list(reader.read("1"))
+    assert snapshots[0] == (1_700_000_000.0, (1_000_000, 10_000_000, 321, 42))
+    assert snapshots[-1] == (1_700_000_000 + 119 * 10.5, (1_000_357, 10_014_161, 321, 41))
+    assert [at for at, _ in reader.read("2", since=1_700_000_100, until=1_700_000_200)] == [
+        1_700_000_000 + step * 10.5 for step in range(10, 20)
+    ]
+    assert len(list(reader.scan())) == 240
+    assert path.stat().st_size * 10 < len(json.dumps(rows))
+
+
+def test_appending_continues_an_unclosed_log(tmp_path):
+    path = tmp_path / "twitch.lcsl"
+    writer = SnapshotLogWriter(path, ("follower_count",), block_size=2)
+    for step in range(5):
+        writer.append("a", [100 + step], at=step)
+    writer._file.close()
+
+    with SnapshotLogWriter(path, ("follower_count",)) as writer:
+        writer.append("a", [200], at=10)
+
+    assert list(SnapshotLogReader(path).read("a")) == [(0, (100,)), (1, (101,)), (2, (102,)), (3, (103,)), (10, (200,))]
+    with pytest.raises(ValueError):
+        SnapshotLogWriter(path, ("view_count",))
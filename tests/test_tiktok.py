@@ -9,7 +9,7 @@ from unofficial_livecounts_api.tiktok import (
 
 
 def test_find_users_with_existed_user(mocker):
-    mock_send_request = mocker.patch("unofficial_livecounts_api.tiktok.send_request")
+    mock_send_request = mocker.patch("unofficial_livecounts_api.tiktok.TiktokAgent.send_request")
     mock_send_request.return_value = {
         "userData": [
             {
@@ -66,7 +66,7 @@ def test_find_users_with_existed_user(mocker):
 
 
 def test_find_users_with_not_existed_user(mocker):
-    mock_send_request = mocker.patch("unofficial_livecounts_api.tiktok.send_request")
+    mock_send_request = mocker.patch("unofficial_livecounts_api.tiktok.TiktokAgent.send_request")
     mock_response = {"userData": []}
     mock_send_request.return_value = mock_response
     users = TiktokAgent.find_user("best")
@@ -75,7 +75,7 @@ def test_find_users_with_not_existed_user(mocker):
 
 
 def test_fetch_user_metrics_with_existed_user_by_id(mocker):
-    mock_send_request = mocker.patch("unofficial_livecounts_api.tiktok.send_request")
+    mock_send_request = mocker.patch("unofficial_livecounts_api.tiktok.TiktokAgent.send_request")
     mock_send_request.return_value = {
         "followerCount": 1,
         "likeCount": 2,
@@ -102,7 +102,7 @@ def test_fetch_user_metrics_with_existed_user_by_id(mocker):
 
 
 def test_find_video_with_existed_video_by_id(mocker):
-    mock_send_request = mocker.patch("unofficial_livecounts_api.tiktok.send_request")
+    mock_send_request = mocker.patch("unofficial_livecounts_api.tiktok.TiktokAgent.send_request")
     mock_send_request.return_value = {
         "title": "bo-so-et",
         "id": "1",
@@ -132,7 +132,7 @@ def test_find_video_with_existed_video_by_id(mocker):
 
 
 def test_fetch_video_stats_with_existed_video_with_id(mocker):
-    mocker_send_request = mocker.patch("unofficial_livecounts_api.tiktok.send_request")
+    mocker_send_request = mocker.patch("unofficial_livecounts_api.tiktok.TiktokAgent.send_request")
     mocker_send_request.return_value = {
         "viewCount": 1,
         "commentCount": 2,
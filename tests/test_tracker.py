@@ -0,0 +1,70 @@
+import pytest
+
+from unofficial_livecounts_api.tiktok import TikTokVideoCount
+from unofficial_livecounts_api.tracker import CountTracker
+from unofficial_livecounts_api.youtube import YoutubeChannelCount
+
+
+def test_updates_report_changed_counters():
+    tracker = CountTracker.for_metrics("tiktok", "video-metrics")
+
+    assert tracker.update_count(TikTokVideoCount("7324489913931613189", 100, 10, 1, 0), at=1) == tracker.columns
+    assert tracker.update_count(TikTokVideoCount("7324489913931613189", 100, 10, 1, 0), at=2) == ()
+    assert tracker.update_count(TikTokVideoCount("7324489913931613189", 150, 10, 2, 0), at=3) == (
+        "view_count",
+        "comment_count",
+    )
+    assert tracker.get("7324489913931613189") == {
+        "view_count": 150,
+        "like_count": 10,
+        "comment_count": 2,
+        "share_count": 0,
+        "updated_at": 3,
+    }
+    assert tracker.get("missing") is None
+    assert "7324489913931613189" in tracker and len(tracker) == 1
+
+
+def test_invalid_updates_leave_the_columns_aligned():
+    tracker = CountTracker(("follower_count", "like_count"))
+
+    with pytest.raises(ValueError):
+        tracker.update("1", [1])
+    with pytest.raises(OverflowError):
+        tracker.update("1", [1, 2**63])
+    tracker.update("2", [5, 6], at=1.0)
+
+    assert "1" not in tracker
+    assert tracker.get("2") == {"follower_count": 5, "like_count": 6, "updated_at": 1.0}
+
+
+def test_remove_moves_the_last_row_into_the_gap():
+    tracker = CountTracker(["follower_count"])
+    tracker.update_many([YoutubeChannelCount(key, n, [0, 0, 0]) for n, key in enumerate(["UCa", "007", "42"])], at=0)
+
+    tracker.remove("UCa")
+
+    assert sorted(tracker.keys()) == ["007", "42"]
+    assert tracker.value("42", "follower_count") == 2
+    assert tracker.value("007", "follower_count") == 1
+
+
+def test_snapshot_round_trip(tmp_path):
+    tracker = CountTracker.for_metrics("youtube", "channel-metrics")
+    changes = tracker.update_many(
+        [YoutubeChannelCount(f"UC{n}", n * 10, [n, 1, 2]) for n in range(1000)]
+        + [YoutubeChannelCount(str(n), n, [0, 0, 0]) for n in range(1000)],
+        at=5,
+    )
+    path = tmp_path / "youtube.tracker"
+
+    tracker.save(path)
+    restored = CountTracker.load(path)
+
+    assert len(changes) == 2000
+    assert restored.columns == tracker.columns
+    assert list(restored.keys()) == list(tracker.keys())
+    assert restored.get("UC999") == {"follower_count": 9990, "view_count": 999, "video_count": 1, "goal_count": 2, "updated_at": 5}
+    assert restored.update_count(YoutubeChannelCount("999", 999, [0, 0, 0])) == ()
+    CountTracker([]).save(tmp_path / "empty")
+    assert len(CountTracker.load(tmp_path / "empty")) == 0
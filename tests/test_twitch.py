@@ -3,7 +3,7 @@ from unofficial_livecounts_api.twitch import TwitchAgent, TwitchUser, TwitchUser
 
 
 def test_find_user_with_existed_user_by_username(mocker):
-    mock_send_request = mocker.patch("unofficial_livecounts_api.twitch.send_request")
+    mock_send_request = mocker.patch("unofficial_livecounts_api.twitch.TwitchAgent.send_request")
     mock_send_request.return_value = {
         "userData": [
             {
@@ -26,7 +26,7 @@ def test_find_user_with_existed_user_by_username(mocker):
 
 
 def test_fetch_user_metrics(mocker):
-    mock_send_request = mocker.patch("unofficial_livecounts_api.twitch.send_request")
+    mock_send_request = mocker.patch("unofficial_livecounts_api.twitch.TwitchAgent.send_request")
     mock_send_request.return_value = {"followerCount": 6536924}
     metrics = TwitchAgent.fetch_user_metrics("101020771")
     mock_send_request.assert_called_once_with(f"{env.TWITCH_USER_STATS_API}/101020771")
@@ -1,4 +1,5 @@
 from unofficial_livecounts_api import env
+from unofficial_livecounts_api.error import RequestApiError
 from unofficial_livecounts_api.twitter import (
     TwitterAgent,
     TwitterUser,
@@ -7,7 +8,7 @@ from unofficial_livecounts_api.twitter import (
 
 
 def test_find_user_with_existed_user_by_username(mocker):
-    mock_send_request = mocker.patch("unofficial_livecounts_api.twitter.send_request")
+    mock_send_request = mocker.patch("unofficial_livecounts_api.twitter.TwitterAgent.send_request")
     mock_send_request.return_value = {
         "userData": [
             {
@@ -29,8 +30,40 @@ def test_find_user_with_existed_user_by_username(mocker):
     )
 
 
+def test_find_user_with_non_existed_user(mocker):
+    mock_send_request = mocker.patch("unofficial_livecounts_api.twitter.TwitterAgent.send_request")
+    mock_send_request.return_value = {"userData": []}
+
+    assert TwitterAgent.find_user("nobody") is None
+
+
+def test_find_user_many_searches_each_handle_once(mocker):
+    def send_request(url):
+        query = url.rsplit("/", 1)[1]
+        if query == "broken":
+            raise RequestApiError(f"api server error, query: {url}")
+        if query == "nobody":
+            return {"userData": []}
+        return {"userData": [{"id": query, "username": query.title(), "avatar": "", "verified": True}]}
+
+    mock_send_request = mocker.patch(
+        "unofficial_livecounts_api.twitter.TwitterAgent.send_request", side_effect=send_request
+    )
+
+    results = TwitterAgent.find_user_many(["@Jack", " jack ", "nobody", "broken", "JACK", "  "])
+
+    assert sorted(call.args[0] for call in mock_send_request.call_args_list) == [
+        f"{env.TWITTER_USER_SEARCH_API}/{query}" for query in ("broken", "jack", "nobody")
+    ]
+    assert [result.query for result in results] == ["@Jack", " jack ", "nobody", "broken", "JACK", "  "]
+    assert [result.result.user_id for result in results if result.ok and result.result] == ["jack"] * 3
+    assert results[2].ok and results[2].result is None
+    assert isinstance(results[3].error, RequestApiError)
+    assert isinstance(results[5].error, ValueError)
+
+
 def test_fetch_user_metrics(mocker):
-    mock_send_request = mocker.patch("unofficial_livecounts_api.twitter.send_request")
+    mock_send_request = mocker.patch("unofficial_livecounts_api.twitter.TwitterAgent.send_request")
     mock_send_request.return_value = {
         "followerCount": 6536924,
         "bottomOdos": [29488, 0, 463076],
@@ -1,6 +1,8 @@
 import pytest
 from urllib3 import HTTPResponse
 
+from unofficial_livecounts_api import utils
+from unofficial_livecounts_api.client import get_default_client
 from unofficial_livecounts_api.error import RequestApiError
 from unofficial_livecounts_api.utils import send_request
 
@@ -29,3 +31,16 @@ def test_send_request_when_server_response_error(mocker):
         send_request(url="http://test.test")
     mock_send_request.assert_called_once_with(method="GET", url="http://test.test", headers=mocker.ANY)
     assert str(exec_info.value) == "server reject response this request, status: 500"
+
+
+def test_module_level_shims_use_the_default_client(mocker):
+    send_request_mock = mocker.patch.object(get_default_client(), "send_request", return_value={"success": True})
+    warm_up = mocker.patch.object(get_default_client(), "warm_up", return_value={})
+
+    assert send_request(url="http://test.test") == {"success": True}
+    utils.warm_up(connections_per_host=3)
+
+    send_request_mock.assert_called_once_with("http://test.test")
+    warm_up.assert_called_once_with(3, None, None)
+    assert utils.http_client is get_default_client().http_client
+    assert utils.transfer_stats is get_default_client().transfer_stats
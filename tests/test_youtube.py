@@ -9,7 +9,7 @@ from unofficial_livecounts_api.youtube import (
 
 
 def test_find_channels_with_existed_channel(mocker):
-    mock_send_request = mocker.patch("unofficial_livecounts_api.youtube.send_request")
+    mock_send_request = mocker.patch("unofficial_livecounts_api.youtube.YoutubeAgent.send_request")
     mock_send_request.return_value = {
         "userData": [
             {
@@ -55,7 +55,7 @@ def test_find_channels_with_existed_channel(mocker):
 
 
 def test_find_channels_with_non_existed_channel(mocker):
-    mock_send_request = mocker.patch("unofficial_livecounts_api.youtube.send_request")
+    mock_send_request = mocker.patch("unofficial_livecounts_api.youtube.YoutubeAgent.send_request")
     mock_send_request.return_value = {"userData": []}
 
     channels = YoutubeAgent.find_channel("test")
@@ -64,8 +64,19 @@ def test_find_channels_with_non_existed_channel(mocker):
     assert channels == []
 
 
+def test_find_channel_many_maps_results_to_queries(mocker):
+    mock_send_request = mocker.patch("unofficial_livecounts_api.youtube.YoutubeAgent.send_request")
+    mock_send_request.return_value = {"userData": [{"id": "1111111111111111", "username": "Test", "avatar": ""}]}
+
+    results = YoutubeAgent.find_channel_many(["Test", "@test"], concurrency=2)
+
+    mock_send_request.assert_called_once_with(f"{env.YOUTUBE_CHANNEL_SEARCH_API}/test")
+    assert [result.normalized_query for result in results] == ["test", "test"]
+    assert results[0].result == results[1].result == [YoutubeChannel("1111111111111111", "Test", "")]
+
+
 def test_find_videos_with_existed_video(mocker):
-    mock_send_request = mocker.patch("unofficial_livecounts_api.youtube.send_request")
+    mock_send_request = mocker.patch("unofficial_livecounts_api.youtube.YoutubeAgent.send_request")
     mock_send_request.return_value = {
         "userData": [
             {
@@ -98,7 +109,7 @@ def test_find_videos_with_existed_video(mocker):
 
 
 def test_fetch_channel_metrics(mocker):
-    mock_send_request = mocker.patch("unofficial_livecounts_api.youtube.send_request")
+    mock_send_request = mocker.patch("unofficial_livecounts_api.youtube.YoutubeAgent.send_request")
     mock_send_request.return_value = {"bottomOdos": [10, 20, 30], "followerCount": 100}
 
     metrics = YoutubeAgent.fetch_channel_metrics("test")
@@ -109,7 +120,7 @@ def test_fetch_channel_metrics(mocker):
 
 
 def test_fetch_channel_metrics_with_non_existed_channel(mocker):
-    mock_send_request = mocker.patch("unofficial_livecounts_api.youtube.send_request")
+    mock_send_request = mocker.patch("unofficial_livecounts_api.youtube.YoutubeAgent.send_request")
     mock_send_request.return_value = {}
 
     metrics = YoutubeAgent.fetch_channel_metrics("test")
@@ -120,7 +131,7 @@ def test_fetch_channel_metrics_with_non_existed_channel(mocker):
 
 
 def test_fetch_video_metrics(mocker):
-    mock_send_request = mocker.patch("unofficial_livecounts_api.youtube.send_request")
+    mock_send_request = mocker.patch("unofficial_livecounts_api.youtube.YoutubeAgent.send_request")
     mock_send_request.return_value = {"bottomOdos": [10, 20, 30], "followerCount": 100}
 
     metrics = YoutubeAgent.fetch_video_metrics("test")
@@ -0,0 +1,68 @@
+from typing import Any, Callable
+
+from unofficial_livecounts_api.client import LivecountsClient
+from unofficial_livecounts_api.entities import ID_ATTRIBUTES, entity_id  # noqa: F401
+from unofficial_livecounts_api.tiktok import TiktokAgent
+from unofficial_livecounts_api.twitch import TwitchAgent
+from unofficial_livecounts_api.twitter import TwitterAgent
+from unofficial_livecounts_api.youtube import YoutubeAgent
+
+AGENTS = {
+    "tiktok": TiktokAgent,
+    "youtube": YoutubeAgent,
+    "twitter": TwitterAgent,
+    "twitch": TwitchAgent,
+}
+
+
+def resolve(platform: str, kind: str, client: LivecountsClient = None) -> Callable[[str], Any]:
+    """
+    Resolve a platform and a kind of call to the agent method serving it.
+
+    Args:
+        platform (str): One of ``tiktok``, ``youtube``, ``twitter`` or ``twitch``
+        kind (str): ``<entity>`` for a search (``find_<entity>``) or ``<entity>-metrics`` for live counts
+            (``fetch_<entity>_metrics``), e.g. ``user``, ``video-metrics`` or ``channel-metrics``
+        client (LivecountsClient): Client the agent runs against, by default the default client
+
+    Returns:
+        Callable[[str], Any]: The agent method, called with a query
+
+    Raises:
+        ValueError: If the platform or the kind is not supported
+    """
+    agent = AGENTS.get(platform)
+    if agent is None:
+        raise ValueError(f"unsupported platform: {platform}, expected one of {', '.join(AGENTS)}")
+    entity, _, suffix = kind.replace("_", "-").partition("-")
+    name = f"fetch_{entity}_metrics" if suffix == "metrics" else f"find_{entity}"
+    if suffix not in ("", "metrics") or not hasattr(agent, name):
+        raise ValueError(f"unsupported kind for {platform}: {kind}, expected one of {', '.join(kinds(platform))}")
+    return getattr(agent(client) if client is not None else agent, name)
+
+
+def kinds(platform: str) -> list[str]:
+    """
+    Returns:
+        list[str]: The kinds accepted by ``resolve`` for the given platform
+    """
+    supported = []
+    for name in vars(AGENTS[platform]):
+        if name.startswith("find_") and not name.endswith("_many"):
+            supported.append(name.removeprefix("find_"))
+        elif name.startswith("fetch_") and name.endswith("_metrics"):
+            supported.append(name.removeprefix("fetch_").removesuffix("_metrics") + "-metrics")
+    return supported
+
+
+def to_dict(entity: Any) -> Any:
+    """
+    Convert models, count objects and lists of them into plain JSON-serializable values.
+    """
+    if isinstance(entity, (list, tuple)):
+        return [to_dict(item) for item in entity]
+    if isinstance(entity, dict):
+        return {key: to_dict(value) for key, value in entity.items()}
+    if any(callable(vars(cls).get("__dict__")) for cls in type(entity).__mro__):
+        return to_dict(entity.__dict__())
+    return entity
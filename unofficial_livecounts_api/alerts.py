@@ -0,0 +1,261 @@
+import heapq
+import itertools
+import time
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Callable
+
+from unofficial_livecounts_api import agents
+
+MetricKey = tuple[str, str]
+
+_INFINITY = float("inf")
+
+
+class AlertRule:
+    def __init__(
+        self,
+        rule_id: int,
+        kind: str,
+        key: str,
+        metric: str,
+        amount: float,
+        window: float = None,
+        direction: str = "up",
+        once: bool = True,
+        payload: Any = None,
+    ):
+        self.rule_id = rule_id
+        self.kind = kind
+        self.key = key
+        self.metric = metric
+        self.amount = amount
+        self.window = window
+        self.direction = direction
+        self.once = once
+        self.payload = payload
+        self.armed = True
+
+    def __eq__(self, other):
+        return self.rule_id == other.rule_id if isinstance(other, AlertRule) else False
+
+    def __hash__(self):
+        return hash(self.rule_id)
+
+    def __dict__(self):
+        return {
+            "rule_id": self.rule_id,
+            "kind": self.kind,
+            "key": self.key,
+            "metric": self.metric,
+            "amount": self.amount,
+            "window": self.window,
+            "direction": self.direction,
+            "once": self.once,
+            "payload": self.payload,
+        }
+
+
+class Alert:
+    def __init__(self, rule: AlertRule, value: int, change: int, at: float):
+        self.rule = rule
+        self.value = value
+        self.change = change
+        self.at = at
+
+    def __dict__(self):
+        return {"rule": self.rule.__dict__(), "value": self.value, "change": self.change, "at": self.at}
+
+
+class AlertEngine:
+    """
+    Evaluate milestone and growth rules against incoming counts without scanning the rules.
+
+    Threshold rules of an ID and metric are kept sorted by threshold, so a new value fires exactly the rules
+    between the previous and the new value with two bisections. Growth rules are kept sorted by amount per
+    window, so the gain over a window fires the prefix of rules it reaches. Repeating growth rules sleep for
+    one window after firing.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        """
+        Args:
+            clock (Callable[[], float]): Time source used when counts carry no timestamp
+        """
+        self.clock = clock
+        self._ids = itertools.count(1)
+        self._rules: dict[int, AlertRule] = {}
+        self._thresholds: dict[tuple[str, str, str], list[tuple[float, int]]] = {}
+        self._growth: dict[MetricKey, dict[float, list[tuple[float, int]]]] = {}
+        self._last: dict[MetricKey, int] = {}
+        self._history: dict[MetricKey, list[tuple[float, int]]] = {}
+        self._watched: dict[str, dict[str, int]] = {}
+        self._rearm: list[tuple[float, int]] = []
+
+    def __len__(self):
+        return len(self._rules)
+
+    def add_threshold(
+        self,
+        key: str,
+        metric: str,
+        threshold: float,
+        direction: str = "up",
+        once: bool = True,
+        payload: Any = None,
+    ) -> AlertRule:
+        """
+        Args:
+            key (str): ID the rule watches, e.g. a TikTok user ID
+            metric (str): Counter attribute of the count objects, e.g. ``follower_count``
+            threshold (float): Milestone to pass
+            direction (str): ``up`` fires when the counter reaches the threshold, ``down`` when it falls below it
+            once (bool): Remove the rule after it fired, otherwise it fires on every crossing
+            payload (Any): Caller data returned with the alert, e.g. who to notify
+
+        Returns:
+            AlertRule: The registered rule, to pass to ``remove``
+        """
+        if direction not in ("up", "down"):
+            raise ValueError(f"unsupported direction: {direction}, expected up or down")
+        rule = AlertRule(next(self._ids), "threshold", key, metric, threshold, None, direction, once, payload)
+        self.__register(rule)
+        return rule
+
+    def add_growth(
+        self,
+        key: str,
+        metric: str,
+        amount: float,
+        window: float,
+        once: bool = False,
+        payload: Any = None,
+    ) -> AlertRule:
+        """
+        Args:
+            key (str): ID the rule watches, e.g. a YouTube video ID
+            metric (str): Counter attribute of the count objects, e.g. ``view_count``
+            amount (float): Gain that fires the rule
+            window (float): Seconds the gain must happen within, measured from the oldest count seen in the window
+            once (bool): Remove the rule after it fired, otherwise it fires again at most once per window
+            payload (Any): Caller data returned with the alert, e.g. who to notify
+
+        Returns:
+            AlertRule: The registered rule, to pass to ``remove``
+        """
+        if window <= 0:
+            raise ValueError("window must be positive")
+        rule = AlertRule(next(self._ids), "growth", key, metric, amount, window, "up", once, payload)
+        self.__register(rule)
+        return rule
+
+    def remove(self, rule: AlertRule) -> None:
+        if self._rules.pop(rule.rule_id, None) is None:
+            return
+        if rule.armed:
+            self.__disarm(rule)
+        watched = self._watched[rule.key]
+        watched[rule.metric] -= 1
+        if not watched[rule.metric]:
+            del watched[rule.metric]
+            self._last.pop((rule.key, rule.metric), None)
+            self._history.pop((rule.key, rule.metric), None)
+            if not watched:
+                del self._watched[rule.key]
+
+    def observe(self, count: Any, at: float = None) -> list[Alert]:
+        """
+        Args:
+            count (Any): Count object returned by a ``fetch_*_metrics`` call
+            at (float): Time the count was observed, by default now
+
+        Returns:
+            list[Alert]: The alerts fired by the count, for every watched metric of its ID
+        """
+        key = agents.entity_id(count)
+        at = self.clock() if at is None else at
+        alerts = []
+        for metric in list(self._watched.get(key, ())):
+            value = getattr(count, metric, None)
+            if value is not None:
+                alerts.extend(self.observe_value(key, metric, value, at))
+        return alerts
+
+    def observe_value(self, key: str, metric: str, value: int, at: float = None) -> list[Alert]:
+        """
+        Returns:
+            list[Alert]: The alerts fired by the new value of the ID's metric; the first value of a metric only
+            sets the baseline for threshold rules
+        """
+        at = self.clock() if at is None else at
+        self.__rearm(at)
+        metric_key = (key, metric)
+        if metric not in self._watched.get(key, ()):
+            return []
+        fired = []
+        previous = self._last.get(metric_key)
+        self._last[metric_key] = value
+        if previous is not None and previous != value:
+            low, high = sorted((previous, value))
+            thresholds = self._thresholds.get((key, metric, "up" if value > previous else "down"), [])
+            start, end = bisect_right(thresholds, (low, _INFINITY)), bisect_right(thresholds, (high, _INFINITY))
+            crossed = thresholds[start:end]
+            fired.extend(Alert(self._rules[rule_id], value, value - previous, at) for _, rule_id in crossed)
+
+        windows = self._growth.get(metric_key)
+        if windows:
+            history = self._history.setdefault(metric_key, [])
+            history.append((at, value))
+            del history[: bisect_left(history, (at - max(windows),))]
+            for window, amounts in windows.items():
+                gain = value - history[bisect_left(history, (at - window,))][1]
+                reached = amounts[: bisect_right(amounts, (gain, _INFINITY))]
+                fired.extend(Alert(self._rules[rule_id], value, gain, at) for _, rule_id in reached)
+
+        for alert in fired:
+            rule = alert.rule
+            if rule.once:
+                self.remove(rule)
+            elif rule.kind == "growth":
+                self.__disarm(rule)
+                heapq.heappush(self._rearm, (at + rule.window, rule.rule_id))
+        return fired
+
+    def __register(self, rule: AlertRule) -> None:
+        self._rules[rule.rule_id] = rule
+        watched = self._watched.setdefault(rule.key, {})
+        watched[rule.metric] = watched.get(rule.metric, 0) + 1
+        self.__arm(rule)
+
+    def __arm(self, rule: AlertRule) -> None:
+        rule.armed = True
+        if rule.kind == "threshold":
+            thresholds = self._thresholds.setdefault((rule.key, rule.metric, rule.direction), [])
+            insort(thresholds, (rule.amount, rule.rule_id))
+        else:
+            windows = self._growth.setdefault((rule.key, rule.metric), {})
+            insort(windows.setdefault(rule.window, []), (rule.amount, rule.rule_id))
+
+    def __disarm(self, rule: AlertRule) -> None:
+        rule.armed = False
+        if rule.kind == "threshold":
+            index_key = (rule.key, rule.metric, rule.direction)
+            entries = self._thresholds[index_key]
+        else:
+            windows = self._growth[(rule.key, rule.metric)]
+            entries = windows[rule.window]
+        del entries[bisect_left(entries, (rule.amount, rule.rule_id))]
+        if entries:
+            return
+        if rule.kind == "threshold":
+            del self._thresholds[index_key]
+        else:
+            del windows[rule.window]
+            if not windows:
+                del self._growth[(rule.key, rule.metric)]
+
+    def __rearm(self, at: float) -> None:
+        while self._rearm and self._rearm[0][0] <= at:
+            _, rule_id = heapq.heappop(self._rearm)
+            rule = self._rules.get(rule_id)
+            if rule is not None and not rule.armed:
+                self.__arm(rule)
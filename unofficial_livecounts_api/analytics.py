@@ -0,0 +1,129 @@
+from datetime import datetime
+from typing import Any, Mapping, Sequence
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError(
+        "unofficial_livecounts_api.analytics requires numpy, install it with: pip install unofficial-livecounts-api[analytics]"
+    ) from e
+
+SECONDS_PER_HOUR = 3600.0
+
+
+def snapshot_matrix(
+    history: Mapping[str, Sequence[tuple[float | datetime, Any]]],
+    metric: str,
+) -> tuple[list[str], np.ndarray, np.ndarray]:
+    """
+    Stack per-ID snapshot histories of count objects into right-aligned 2-D arrays.
+
+    Args:
+        history (Mapping[str, Sequence[tuple[float | datetime, Any]]]): For every ID, its snapshots in time order
+            as ``(timestamp, count)`` pairs, where ``count`` is e.g. a ``TiktokUserCount`` or ``YoutubeVideoCount``
+            and ``timestamp`` is a datetime or epoch seconds
+        metric (str): Attribute read from every count object, e.g. ``follower_count`` or ``view_count``
+
+    Returns:
+        tuple[list[str], np.ndarray, np.ndarray]: The IDs (one row each), the timestamps in epoch seconds and
+        the metric values, both of shape ``(len(ids), longest_history)``. Shorter histories are padded with NaN
+        at the start, so the last column always holds each ID's latest snapshot.
+    """
+    ids = list(history)
+    width = max((len(snapshots) for snapshots in history.values()), default=0)
+    timestamps = np.full((len(ids), width), np.nan)
+    values = np.full((len(ids), width), np.nan)
+    for row, snapshots in enumerate(history.values()):
+        if not snapshots:
+            continue
+        start = width - len(snapshots)
+        timestamps[row, start:] = [t.timestamp() if isinstance(t, datetime) else t for t, _ in snapshots]
+        values[row, start:] = [getattr(count, metric) for _, count in snapshots]
+    return ids, timestamps, values
+
+
+def deltas(values: np.ndarray) -> np.ndarray:
+    """
+    Returns:
+        np.ndarray: Change between consecutive snapshots, one column fewer than ``values``
+    """
+    return np.diff(np.asarray(values, dtype=float), axis=-1)
+
+
+def hourly_rates(values: np.ndarray, timestamps: np.ndarray) -> np.ndarray:
+    """
+    Args:
+        values (np.ndarray): Metric values of shape ``(ids, snapshots)``
+        timestamps (np.ndarray): Epoch seconds, of the same shape or a shared row of shape ``(snapshots,)``
+
+    Returns:
+        np.ndarray: Change per hour between consecutive snapshots, NaN where no time elapsed
+    """
+    elapsed = np.diff(np.asarray(timestamps, dtype=float), axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(elapsed > 0, deltas(values) * SECONDS_PER_HOUR / elapsed, np.nan)
+
+
+def moving_average(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Args:
+        values (np.ndarray): Series of shape ``(ids, n)``, e.g. values or hourly rates
+        window (int): Number of consecutive points averaged
+
+    Returns:
+        np.ndarray: Trailing means of shape ``(ids, n - window + 1)``, NaN only for windows containing a NaN,
+        such as the left padding of shorter histories
+    """
+    if window < 1:
+        raise ValueError("window must be at least 1")
+    values = np.asarray(values, dtype=float)
+    padding = np.zeros(values.shape[:-1] + (1,))
+    sums = np.concatenate([padding, np.nancumsum(values, axis=-1)], axis=-1)
+    missing = np.concatenate([padding, np.cumsum(np.isnan(values), axis=-1)], axis=-1)
+    means = (sums[..., window:] - sums[..., :-window]) / window
+    return np.where(missing[..., window:] - missing[..., :-window] > 0, np.nan, means)
+
+
+def acceleration(values: np.ndarray, timestamps: np.ndarray) -> np.ndarray:
+    """
+    Returns:
+        np.ndarray: Change of the hourly rate per hour, measured between the midpoints of consecutive
+        snapshot intervals, two columns fewer than ``values``
+    """
+    timestamps = np.broadcast_to(np.asarray(timestamps, dtype=float), np.shape(values))
+    midpoints = (timestamps[..., 1:] + timestamps[..., :-1]) / 2
+    return hourly_rates(hourly_rates(values, timestamps), midpoints)
+
+
+def milestone_eta(
+    values: np.ndarray,
+    timestamps: np.ndarray,
+    milestone: float | np.ndarray,
+    window: int = 1,
+) -> np.ndarray:
+    """
+    Project how long each ID needs to reach a milestone at its recent growth rate.
+
+    Args:
+        values (np.ndarray): Metric values of shape ``(ids, snapshots)``
+        timestamps (np.ndarray): Epoch seconds, of the same shape or a shared row
+        milestone (float | np.ndarray): Target value, shared or one per ID
+        window (int): Number of trailing snapshot intervals the growth rate is averaged over
+
+    Returns:
+        np.ndarray: Seconds after each ID's latest snapshot until the milestone is reached; 0 when already
+        reached, inf when the count is not growing and NaN when the history is too short
+    """
+    values = np.asarray(values, dtype=float)
+    timestamps = np.broadcast_to(np.asarray(timestamps, dtype=float), values.shape)
+    window = min(window, values.shape[-1] - 1)
+    if window < 1:
+        raise ValueError("at least two snapshots are needed to project a milestone")
+    latest = values[..., -1]
+    elapsed = timestamps[..., -1] - timestamps[..., -1 - window]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = np.where(elapsed > 0, (latest - values[..., -1 - window]) / elapsed, np.nan)
+        remaining = np.asarray(milestone, dtype=float) - latest
+        eta = np.where(rate > 0, remaining / rate, np.inf)
+    eta = np.where(np.isnan(rate) | np.isnan(remaining), np.nan, eta)
+    return np.where(remaining <= 0, 0.0, eta)
@@ -0,0 +1,285 @@
+import math
+import socket
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from urllib.parse import urlsplit
+
+
+class SharedBackend(ABC):
+    """
+    Storage shared by the clients of many processes or hosts: a fixed-window request counter per key, so the
+    workers together stay within one upstream quota, and a response cache, so a fresh result fetched by one
+    worker is reused by the others.
+    """
+
+    @abstractmethod
+    def acquire(self, key: str, limit: int, period: float) -> float:
+        """
+        Count one request against ``key`` if the current window still allows it.
+
+        Args:
+            key (str): Quota the request belongs to, e.g. an upstream host
+            limit (int): Requests allowed per window
+            period (float): Window length in seconds, windows are aligned on the Unix epoch
+
+        Returns:
+            float: 0 if the request was counted, otherwise the seconds until the next window opens
+        """
+
+    @abstractmethod
+    def get(self, key: str) -> bytes | None:
+        """
+        Returns:
+            bytes | None: The cached response under ``key`` if it has not expired yet
+        """
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        """
+        Cache a response under ``key`` for ``ttl`` seconds.
+        """
+
+    def close(self) -> None:
+        pass
+
+    @staticmethod
+    def window(period: float, now: float) -> tuple[int, float]:
+        """
+        Returns:
+            tuple[int, float]: The number of the window ``now`` falls in and the seconds left in it
+        """
+        window = math.floor(now / period)
+        return window, (window + 1) * period - now
+
+
+class MemoryBackend(SharedBackend):
+    """
+    Backend kept in the memory of one process, for a single worker or for tests. Expired responses are dropped
+    when read and purged every ``PURGE_EVERY`` writes.
+    """
+
+    PURGE_EVERY = 256
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._sets = 0
+        self._windows: dict[str, tuple[int, int]] = {}
+        self._cache: dict[str, tuple[float, bytes]] = {}
+
+    def acquire(self, key: str, limit: int, period: float) -> float:
+        window, remaining = self.window(period, self.clock())
+        with self._lock:
+            current, count = self._windows.get(key, (window, 0))
+            count = count if current == window else 0
+            if count >= limit:
+                return remaining
+            self._windows[key] = (window, count + 1)
+            return 0.0
+
+    def get(self, key: str) -> bytes | None:
+        now = self.clock()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is None:
+                return None
+            if cached[0] <= now:
+                del self._cache[key]
+                return None
+        return cached[1]
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        now = self.clock()
+        with self._lock:
+            self._cache[key] = (now + ttl, value)
+            self._sets += 1
+            if self._sets % self.PURGE_EVERY == 0:
+                self._cache = {key: cached for key, cached in self._cache.items() if cached[0] > now}
+
+
+class SqliteBackend(SharedBackend):
+    """
+    Backend in a SQLite database file, shared by the processes of one host. SQLite's file lock serializes the
+    updates of concurrent workers.
+    """
+
+    PURGE_EVERY = 256
+
+    def __init__(self, path: str, clock=time.time, timeout: float = 30.0):
+        """
+        Args:
+            path (str): Database file, created if missing
+            clock (Callable[[], float]): Time source, wall-clock time by default so windows match across processes
+            timeout (float): Seconds to wait for a lock held by another process
+        """
+        self.path = path
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._sets = 0
+        self._connection = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS rate_windows (key TEXT PRIMARY KEY, window INTEGER, count INTEGER)"
+        )
+        self._connection.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, expires REAL, value BLOB)")
+
+    def acquire(self, key: str, limit: int, period: float) -> float:
+        window, remaining = self.window(period, self.clock())
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._connection.execute("SELECT window, count FROM rate_windows WHERE key = ?", (key,)).fetchone()
+                count = row[1] if row is not None and row[0] == window else 0
+                if count >= limit:
+                    return remaining
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO rate_windows (key, window, count) VALUES (?, ?, ?)", (key, window, count + 1)
+                )
+                return 0.0
+            finally:
+                self._connection.execute("COMMIT")
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM cache WHERE key = ? AND expires > ?", (key, self.clock())
+            ).fetchone()
+        return None if row is None else bytes(row[0])
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        now = self.clock()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO cache (key, expires, value) VALUES (?, ?, ?)", (key, now + ttl, value)
+            )
+            self._sets += 1
+            if self._sets % self.PURGE_EVERY == 0:
+                self._connection.execute("DELETE FROM cache WHERE expires <= ?", (now,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class RedisBackend(SharedBackend):
+    """
+    Backend on a Redis server (or anything speaking its protocol), shared by every host. Windows are counted
+    with ``INCR`` and expire with ``PEXPIRE``; cached responses are stored with ``SET ... PX``.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 6379,
+        db: int = 0,
+        password: str = None,
+        prefix: str = "livecounts:",
+        timeout: float = 5.0,
+        clock=time.time,
+    ):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.prefix = prefix
+        self.timeout = timeout
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._socket: socket.socket | None = None
+        self._reader = None
+
+    def acquire(self, key: str, limit: int, period: float) -> float:
+        window, remaining = self.window(period, self.clock())
+        counter = f"{self.prefix}rate:{key}:{window}"
+        count = self.execute("INCR", counter)
+        if count == 1:
+            self.execute("PEXPIRE", counter, math.ceil(period * 1000) + 1000)
+        return 0.0 if count <= limit else remaining
+
+    def get(self, key: str) -> bytes | None:
+        return self.execute("GET", f"{self.prefix}cache:{key}")
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.execute("SET", f"{self.prefix}cache:{key}", value, "PX", max(math.ceil(ttl * 1000), 1))
+
+    def execute(self, *args):
+        """
+        Send one command and return its reply; the connection is opened on first use and reopened after an error.
+
+        Raises:
+            RuntimeError: If the server replied with an error
+        """
+        with self._lock:
+            try:
+                if self._socket is None:
+                    self.__connect()
+                return self.__call(*args)
+            except OSError:
+                self.__disconnect()
+                raise
+
+    def close(self) -> None:
+        with self._lock:
+            self.__disconnect()
+
+    def __connect(self) -> None:
+        self._socket = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._reader = self._socket.makefile("rb")
+        if self.password:
+            self.__call("AUTH", self.password)
+        if self.db:
+            self.__call("SELECT", self.db)
+
+    def __disconnect(self) -> None:
+        if self._socket is not None:
+            self._reader.close()
+            self._socket.close()
+        self._socket = self._reader = None
+
+    def __call(self, *args):
+        command = bytearray(f"*{len(args)}\r\n".encode())
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+            command += f"${len(data)}\r\n".encode() + data + b"\r\n"
+        self._socket.sendall(command)
+        return self.__read_reply()
+
+    def __read_reply(self):
+        line = self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("connection closed by the shared backend")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            raise RuntimeError(f"shared backend error: {payload.decode()}")
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            return None if length < 0 else self._reader.read(length + 2)[:-2]
+        if kind == b"*":
+            length = int(payload)
+            return None if length < 0 else [self.__read_reply() for _ in range(length)]
+        raise ConnectionError(f"unexpected reply from the shared backend: {line!r}")
+
+
+def backend_from_url(url: str) -> SharedBackend:
+    """
+    Args:
+        url (str): ``memory://``, ``sqlite:///path/to/file.db`` or ``redis://[:password@]host[:port][/db]``
+
+    Returns:
+        SharedBackend: The backend the URL describes
+    """
+    parts = urlsplit(url)
+    if parts.scheme == "memory":
+        return MemoryBackend()
+    if parts.scheme == "sqlite":
+        return SqliteBackend(parts.netloc + parts.path)
+    if parts.scheme == "redis":
+        db = parts.path.strip("/")
+        return RedisBackend(parts.hostname or "127.0.0.1", parts.port or 6379, int(db or 0), parts.password)
+    raise ValueError(f"unsupported shared backend: {url}, expected memory://, sqlite:// or redis://")
@@ -0,0 +1,191 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator, TextIO
+
+from unofficial_livecounts_api import agents, simulator
+from unofficial_livecounts_api.server import FanoutHub, LivecountsServer
+
+
+class FetchSummary:
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.succeeded = 0
+        self.failed = 0
+
+    @property
+    def total(self) -> int:
+        return self.succeeded + self.failed
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        return self.total / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __str__(self):
+        return (
+            f"{self.total} queries ({self.succeeded} ok, {self.failed} failed) "
+            f"in {self.elapsed:.1f}s, {self.throughput:.1f}/s"
+        )
+
+
+def read_queries(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Lazily yield the non-empty, non-comment lines of an input stream.
+    """
+    for line in lines:
+        query = line.strip()
+        if query and not query.startswith("#"):
+            yield query
+
+
+def fetch_stream(
+    fetch: Callable[[str], Any],
+    queries: Iterable[str],
+    output: TextIO,
+    concurrency: int = 8,
+    on_progress: Callable[[FetchSummary], None] = None,
+) -> FetchSummary:
+    """
+    Run queries through an agent call concurrently and write one NDJSON record per query as soon as it completes.
+
+    At most ``concurrency * 2`` queries are read ahead of the writer, so memory stays flat regardless of the
+    input size. Records are written in completion order as ``{"query": ..., "result": ...}`` or
+    ``{"query": ..., "error": ...}``.
+
+    Args:
+        fetch (Callable[[str], Any]): Agent call, e.g. ``TiktokAgent.fetch_video_metrics``
+        queries (Iterable[str]): IDs or URLs, consumed lazily
+        output (TextIO): Stream the NDJSON records are written to
+        concurrency (int): Number of requests in flight
+        on_progress (Callable[[FetchSummary], None]): Called after every written record
+
+    Returns:
+        FetchSummary: Counts of succeeded and failed queries and the overall throughput
+    """
+    summary = FetchSummary()
+    pending: dict[Future, str] = {}
+
+    def drain() -> None:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            query = pending.pop(future)
+            try:
+                record = {"query": query, "result": agents.to_dict(future.result())}
+                summary.succeeded += 1
+            except Exception as e:
+                record = {"query": query, "error": str(e)}
+                summary.failed += 1
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            if on_progress:
+                on_progress(summary)
+        output.flush()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for query in queries:
+            pending[executor.submit(fetch, query)] = query
+            if len(pending) >= concurrency * 2:
+                drain()
+        while pending:
+            drain()
+    return summary
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="livecounts", description="Unofficial Livecounts.io API")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    fetch = commands.add_parser("fetch", help="fetch searches or live counts for a stream of IDs/URLs as NDJSON")
+    fetch.add_argument("--platform", required=True, choices=sorted(agents.AGENTS))
+    fetch.add_argument("--kind", required=True, help="e.g. user, video, channel, user-metrics, video-metrics")
+    fetch.add_argument("--input", "-i", type=argparse.FileType("r", encoding="utf-8"), default=sys.stdin)
+    fetch.add_argument("--output", "-o", type=argparse.FileType("w", encoding="utf-8"), default=sys.stdout)
+    fetch.add_argument("--concurrency", "-c", type=int, default=8)
+    fetch.add_argument("--progress-every", type=float, default=5.0, help="seconds between progress lines, 0 to disable")
+
+    serve = commands.add_parser("serve", help="serve live counts to many subscribers over Server-Sent Events")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--interval", type=float, default=10.0, help="seconds between upstream polls of one ID")
+
+    simulate = commands.add_parser("simulate", help="measure goodput and latency against a fault-injecting upstream")
+    simulate.add_argument("--platform", default="tiktok", choices=sorted(agents.AGENTS))
+    simulate.add_argument("--kind", default="user-metrics")
+    simulate.add_argument("--profile", action="append", choices=sorted(simulator.PROFILES), help="repeatable")
+    simulate.add_argument("--requests", "-n", type=int, default=1000)
+    simulate.add_argument("--concurrency", "-c", type=int, default=8)
+    simulate.add_argument("--seed", type=int, default=None)
+    return parser
+
+
+def main(argv: list[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == "serve":
+        return run_serve(args)
+    if args.command == "simulate":
+        return run_simulate(args)
+    return run_fetch(args)
+
+
+def run_fetch(args: argparse.Namespace) -> int:
+    try:
+        fetch = agents.resolve(args.platform, args.kind)
+    except ValueError as e:
+        print(f"livecounts: {e}", file=sys.stderr)
+        return 2
+    if args.concurrency < 1:
+        print("livecounts: --concurrency must be at least 1", file=sys.stderr)
+        return 2
+
+    last_reported_at = time.monotonic()
+
+    def report_progress(summary: FetchSummary) -> None:
+        nonlocal last_reported_at
+        if args.progress_every > 0 and time.monotonic() - last_reported_at >= args.progress_every:
+            last_reported_at = time.monotonic()
+            print(f"livecounts: {summary}", file=sys.stderr)
+
+    summary = fetch_stream(
+        fetch=fetch,
+        queries=read_queries(args.input),
+        output=args.output,
+        concurrency=args.concurrency,
+        on_progress=report_progress,
+    )
+    print(f"livecounts: done, {summary}", file=sys.stderr)
+    return 1 if summary.failed else 0
+
+
+def run_serve(args: argparse.Namespace) -> int:
+    server = LivecountsServer(FanoutHub(interval=args.interval), host=args.host, port=args.port)
+    print(f"livecounts: serving on http://{args.host}:{args.port}/subscribe", file=sys.stderr)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def run_simulate(args: argparse.Namespace) -> int:
+    try:
+        agents.resolve(args.platform, args.kind)
+    except ValueError as e:
+        print(f"livecounts: {e}", file=sys.stderr)
+        return 2
+    profiles = [simulator.PROFILES[name] for name in args.profile or simulator.PROFILES]
+    print(f"{'profile':<16} {'requests':>8} {'ok':>8} {'goodput':>12} {'p50':>10} {'p99':>10}")
+    for report in simulator.run_profiles(
+        profiles, args.platform, args.kind, args.requests, args.concurrency, args.seed
+    ):
+        print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
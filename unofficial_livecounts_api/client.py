@@ -0,0 +1,625 @@
+import functools
+import hashlib
+import ipaddress
+import json
+import socket
+import threading
+import time
+import warnings
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Iterable
+from urllib.parse import urlsplit
+
+import urllib3
+from Crypto.Hash import RIPEMD160
+from latest_user_agents import get_random_user_agent
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.connection import allowed_gai_family
+from urllib3.util.request import ACCEPT_ENCODING
+
+from unofficial_livecounts_api import env, profiling
+from unofficial_livecounts_api.backends import MemoryBackend, SharedBackend, backend_from_url
+from unofficial_livecounts_api.entities import IdentityMap
+from unofficial_livecounts_api.error import RequestApiError
+from unofficial_livecounts_api.hedging import HedgingPolicy
+
+warnings.simplefilter("ignore", urllib3.exceptions.InsecureRequestWarning)
+
+_HEDGE_CHECK_INTERVAL = 0.05
+
+
+class Endpoints:
+    """
+    The livecounts endpoints a client talks to. Every endpoint not overridden follows the matching ``env`` setting.
+    """
+
+    NAMES = tuple(name for name in vars(env) if name.endswith("_API"))
+
+    def __init__(self, **overrides: str):
+        unknown = set(overrides) - set(self.NAMES)
+        if unknown:
+            raise ValueError(f"unknown endpoints: {', '.join(sorted(unknown))}")
+        self._overrides = {name: url.removesuffix("/") for name, url in overrides.items()}
+
+    def __getattr__(self, name: str) -> str:
+        if name in Endpoints.NAMES:
+            return self._overrides.get(name, getattr(env, name))
+        raise AttributeError(name)
+
+    @classmethod
+    def rebased(cls, origin: str) -> "Endpoints":
+        """
+        Args:
+            origin (str): Scheme and host of a mirror, e.g. ``http://127.0.0.1:8080``
+
+        Returns:
+            Endpoints: Every endpoint with the same path on the given origin
+        """
+        origin = origin.removesuffix("/")
+        return cls(**{name: origin + urlsplit(getattr(env, name)).path for name in cls.NAMES})
+
+    def items(self) -> list[tuple[str, str]]:
+        return [(name, getattr(self, name)) for name in self.NAMES]
+
+
+class DnsCache:
+    """
+    Thread-safe cache of resolved host addresses, so new connections skip the DNS lookup until ``ttl`` expires.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._addresses: dict[tuple[str, int], tuple[float, str]] = {}
+
+    def resolve(self, host: str, port: int, refresh: bool = False) -> str:
+        """
+        Returns:
+            str: The cached address of the host, resolving it first if it is unknown, expired or ``refresh``
+            is set; a failed refresh keeps the cached address
+        """
+        try:
+            ipaddress.ip_address(host.strip("[]"))
+            return host
+        except ValueError:
+            pass
+        with self._lock:
+            cached = self._addresses.get((host, port))
+        if cached is not None and cached[0] > time.monotonic() and not refresh:
+            return cached[1]
+        try:
+            address = socket.getaddrinfo(host, port, allowed_gai_family(), socket.SOCK_STREAM)[0][4][0]
+        except OSError:
+            if refresh and cached is not None:
+                return cached[1]
+            raise
+        with self._lock:
+            self._addresses[(host, port)] = (time.monotonic() + self.ttl, address)
+        return address
+
+    def invalidate(self, host: str, port: int) -> None:
+        with self._lock:
+            self._addresses.pop((host, port), None)
+
+
+class TransferStats:
+    """
+    Thread-safe per-endpoint accounting of response bytes, as received on the wire and after decompression.
+    """
+
+    def __init__(self, endpoints: Endpoints = None):
+        self.endpoints = endpoints or Endpoints()
+        self._lock = threading.Lock()
+        self._endpoints: dict[str, dict[str, int]] = {}
+
+    def record(self, url: str, wire_bytes: int, decoded_bytes: int) -> None:
+        endpoint = url.rsplit("/", 1)[0]
+        with self._lock:
+            stats = self._endpoints.setdefault(endpoint, {"requests": 0, "wire_bytes": 0, "decoded_bytes": 0})
+            stats["requests"] += 1
+            stats["wire_bytes"] += wire_bytes
+            stats["decoded_bytes"] += decoded_bytes
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        """
+        Returns:
+            dict[str, dict[str, int]]: For every endpoint (request URL without its last path segment), the number
+            of requests, ``wire_bytes`` (compressed) and ``decoded_bytes`` (decompressed)
+        """
+        with self._lock:
+            return {endpoint: dict(stats) for endpoint, stats in self._endpoints.items()}
+
+    def by_platform(self) -> dict[str, dict[str, int]]:
+        """
+        Returns:
+            dict[str, dict[str, int]]: The endpoint statistics summed per platform (``tiktok``, ``youtube``,
+            ``twitter``, ``twitch``), using the configured endpoints; unknown endpoints are reported as ``other``
+        """
+        platforms = {url: name.split("_", 1)[0].lower() for name, url in self.endpoints.items()}
+        totals: dict[str, dict[str, int]] = {}
+        for endpoint, stats in self.snapshot().items():
+            total = totals.setdefault(platforms.get(endpoint, "other"), dict.fromkeys(stats, 0))
+            for key, value in stats.items():
+                total[key] += value
+        return totals
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+
+
+class _CachedDnsHTTPConnection(HTTPConnection):
+    dns_cache: DnsCache = None
+
+    def _new_conn(self) -> socket.socket:
+        host = self._dns_host
+        try:
+            self._dns_host = self.dns_cache.resolve(host, self.port)
+        except OSError:
+            return super()._new_conn()
+        try:
+            return super()._new_conn()
+        except Exception:
+            self.dns_cache.invalidate(host, self.port)
+            raise
+        finally:
+            self._dns_host = host
+
+
+class _CachedDnsHTTPSConnection(_CachedDnsHTTPConnection, HTTPSConnection):
+    pass
+
+
+class LivecountsClient:
+    """
+    An HTTP session against the livecounts endpoints: its own connection pool, proxy, DNS cache, endpoints,
+    headers and transfer statistics. Clients share no state, so one process can run several configurations
+    side by side, e.g. one per tenant.
+    """
+
+    def __init__(
+        self,
+        proxy_server: str = None,
+        pool_maxsize: int = 10,
+        dns_cache_ttl: float = 300.0,
+        endpoints: Endpoints = None,
+        headers: dict[str, str] = None,
+        hedging: HedgingPolicy = None,
+        hedge_proxy_server: str = None,
+        backend: SharedBackend = None,
+        rate_limit: int = None,
+        rate_limit_period: float = 1.0,
+        cache_ttl: float = None,
+        identity_map: IdentityMap = None,
+        request_timeout: float = 30.0,
+    ):
+        """
+        Args:
+            proxy_server (str): Proxy URL every request goes through, or None to connect directly
+            pool_maxsize (int): Keep-alive connections kept per host
+            dns_cache_ttl (float): Seconds a resolved host address is reused
+            endpoints (Endpoints): Endpoints to call, by default those configured in ``env``
+            headers (dict[str, str]): Extra headers sent with every request, overriding the defaults
+            hedging (HedgingPolicy): If given, slow requests to the endpoints it covers are raced by a second one
+            hedge_proxy_server (str): Proxy URL hedged requests go through instead of ``proxy_server``
+            backend (SharedBackend): Where the rate limit is counted and responses are cached, shared with the
+                clients of other processes or hosts using the same backend; by default kept in this process
+            rate_limit (int): Requests per upstream host allowed every ``rate_limit_period`` seconds, or None
+            rate_limit_period (float): Length of a rate limit window in seconds
+            cache_ttl (float): Seconds a successful response is served from the backend, or None to not cache
+            identity_map (IdentityMap): If given, entities found by the agents are shared between results and
+                repeated searches and lookups are answered from it while fresh
+            request_timeout (float): Seconds a request may take to connect and, separately, between received bytes
+        """
+        self.proxy_server = proxy_server
+        self.pool_maxsize = pool_maxsize
+        self.request_timeout = request_timeout
+        self.endpoints = endpoints or Endpoints()
+        self.headers = headers or {}
+        self.hedging = hedging
+        self.backend = backend or (MemoryBackend() if rate_limit or cache_ttl else None)
+        self.rate_limit = rate_limit
+        self.rate_limit_period = rate_limit_period
+        self.cache_ttl = cache_ttl
+        self.identity_map = identity_map
+        self.dns_cache = DnsCache(ttl=dns_cache_ttl)
+        self.transfer_stats = TransferStats(self.endpoints)
+        self.http_client = self.__create_http_client(proxy_server)
+        self.hedge_http_client = self.__create_http_client(hedge_proxy_server) if hedge_proxy_server else None
+        self._keep_warm_stop = threading.Event()
+        self._hedge_executors: dict[str, ThreadPoolExecutor] = {}
+        self._hedge_lock = threading.Lock()
+        self._hedge_slots = threading.BoundedSemaphore(pool_maxsize)
+
+    @classmethod
+    def from_env(cls, **kwargs) -> "LivecountsClient":
+        """
+        Returns:
+            LivecountsClient: A client configured by ``env`` (proxy, pool size, DNS cache TTL, request timeout,
+            shared backend, rate limit and response cache TTL), with ``kwargs`` taking precedence
+        """
+        settings = {
+            "proxy_server": env.PROXY_SERVER if env.PROXY_ENABLED == "on" else None,
+            "pool_maxsize": env.HTTP_POOL_MAXSIZE,
+            "dns_cache_ttl": env.DNS_CACHE_TTL,
+            "request_timeout": env.HTTP_TIMEOUT,
+            "backend": backend_from_url(env.SHARED_BACKEND_URL) if env.SHARED_BACKEND_URL else None,
+            "rate_limit": env.RATE_LIMIT or None,
+            "rate_limit_period": env.RATE_LIMIT_PERIOD,
+            "cache_ttl": env.RESPONSE_CACHE_TTL or None,
+        }
+        return cls(**{**settings, **kwargs})
+
+    def send_request(self, url: str) -> dict[str, str]:
+        if self.cache_ttl:
+            cached = self.__call_cache(url, lambda: self.__decode_cached(self.backend.get(url)))
+            if cached is not None:
+                return cached
+        endpoint = url.rsplit("/", 1)[0]
+        if self.hedging is not None and endpoint in self.__hedged_endpoints():
+            data = self.__send_hedged(url, endpoint)
+        else:
+            data = self.__send(url, self.http_client)
+        if self.cache_ttl:
+            self.__call_cache(url, self.backend.set, url, json.dumps(data).encode("utf-8"), self.cache_ttl)
+        return data
+
+    @staticmethod
+    def __decode_cached(cached: bytes | None) -> dict | None:
+        if cached is None:
+            return None
+        data = json.loads(cached)
+        if not isinstance(data, dict):
+            raise ValueError(f"cached response is not a JSON object: {type(data).__name__}")
+        return data
+
+    @staticmethod
+    def __call_cache(url: str, operation, *args):
+        """
+        The response cache is an optimisation only: when the backend fails or holds an undecodable value, warn and
+        go on as on a cache miss.
+        """
+        try:
+            return operation(*args)
+        except Exception as e:
+            warnings.warn(f"skipped the shared response cache, query: {url}: {e}")
+            return None
+
+    def __call_backend(self, url: str, operation, *args):
+        try:
+            return operation(*args)
+        except Exception as e:
+            raise RequestApiError(f"shared backend error, query: {url}") from e
+
+    def __wait_for_rate_limit(self, url: str) -> None:
+        host = urlsplit(url).netloc
+        with profiling.stage("rate_limit"):
+            while True:
+                wait = self.__call_backend(url, self.backend.acquire, host, self.rate_limit, self.rate_limit_period)
+                if not wait:
+                    return
+                time.sleep(wait)
+
+    def __send(self, url: str, http_client: urllib3.PoolManager, sending: threading.Event = None) -> dict[str, str]:
+        if self.rate_limit:
+            self.__wait_for_rate_limit(url)
+        if sending is not None:
+            sending.set()
+        try:
+            with profiling.stage("sign_headers"):
+                headers = self.__get_default_header()
+            started = time.monotonic()
+            with profiling.stage("network"):
+                response = http_client.request(method="GET", url=url, headers=headers)
+                decoded = response.data or b""
+            if self.hedging is not None:
+                self.hedging.record(url.rsplit("/", 1)[0], time.monotonic() - started)
+            self.transfer_stats.record(url, wire_bytes=response.tell() or len(decoded), decoded_bytes=len(decoded))
+            if response.status != 200:
+                raise RequestApiError(f"server reject response this request, status: {response.status}")
+
+            with profiling.stage("json_decode"):
+                data = json.loads(decoded.decode("utf-8"))
+            if not data.get("success", True):
+                raise RequestApiError(f"server response that it's not success, query: {url}")
+            return data
+        except Exception as e:
+            if isinstance(e, RequestApiError):
+                raise e
+            raise RequestApiError(f"api server error, query: {url}") from e
+
+    def __send_hedged(self, url: str, endpoint: str) -> dict[str, str]:
+        self.hedging.start_request()
+        delay = self.hedging.delay(endpoint)
+        if delay is None:
+            return self.__send(url, self.http_client)
+        # The hedge delay counts from when the primary is sent upstream, not while it waits for a worker of the
+        # bounded primary pool or for the rate limit.
+        sending = threading.Event()
+        primary = self.__get_executor("primary").submit(self.__send, url, self.http_client, sending)
+        while not sending.wait(_HEDGE_CHECK_INTERVAL):
+            if primary.done():
+                return primary.result()
+        done, _ = wait([primary], timeout=delay)
+        # Hedges never queue: without a free slot in the hedge pool the primary is awaited without spending budget.
+        if done or not self._hedge_slots.acquire(blocking=False):
+            return primary.result()
+        if not self.hedging.try_hedge():
+            self._hedge_slots.release()
+            return primary.result()
+        hedge = self.__get_executor("hedge").submit(self.__send_hedge, url)
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        self.hedging.record_win()
+                    return future.result()
+        return primary.result()
+
+    def __send_hedge(self, url: str) -> dict[str, str]:
+        try:
+            return self.__send(url, self.hedge_http_client or self.http_client)
+        finally:
+            self._hedge_slots.release()
+
+    def __hedged_endpoints(self) -> set[str]:
+        return {url for name, url in self.endpoints.items() if name.endswith(self.hedging.endpoint_suffix)}
+
+    def __get_executor(self, name: str) -> ThreadPoolExecutor:
+        with self._hedge_lock:
+            if name not in self._hedge_executors:
+                self._hedge_executors[name] = ThreadPoolExecutor(
+                    max_workers=self.pool_maxsize, thread_name_prefix=f"livecounts-{name}"
+                )
+            return self._hedge_executors[name]
+
+    def warm_up(
+        self,
+        connections_per_host: int = 2,
+        keep_warm_interval: float = None,
+        origins: Iterable[str] = None,
+    ) -> dict[str, int]:
+        """
+        Resolve and cache DNS and open keep-alive connections to the livecounts hosts ahead of the first request.
+
+        Args:
+            connections_per_host (int): Connections opened per host, capped at ``pool_maxsize``
+            keep_warm_interval (float): If given, repeat the warm-up in a daemon thread every that many seconds,
+                refreshing DNS and reopening connections the server dropped, until ``stop_keep_warm()`` is called
+            origins (Iterable[str]): URLs whose hosts are warmed, by default the hosts of every endpoint
+
+        Returns:
+            dict[str, int]: The number of live connections now pooled per origin; hosts that failed to resolve
+            or connect report 0 and issue a warning
+        """
+        if origins is None:
+            origins = [url for _, url in self.endpoints.items()]
+        origins = sorted({f"{url.scheme}://{url.netloc}" for url in map(urlsplit, origins)})
+        warmed = {origin: self.__warm_up_origin(origin, connections_per_host) for origin in origins}
+
+        if keep_warm_interval:
+            self._keep_warm_stop.clear()
+
+            def keep_warm():
+                while not self._keep_warm_stop.wait(keep_warm_interval):
+                    for origin in origins:
+                        self.__warm_up_origin(origin, connections_per_host)
+
+            threading.Thread(target=keep_warm, name="livecounts-keep-warm", daemon=True).start()
+        return warmed
+
+    def stop_keep_warm(self) -> None:
+        self._keep_warm_stop.set()
+
+    def close(self) -> None:
+        self.stop_keep_warm()
+        for executor in self._hedge_executors.values():
+            executor.shutdown(wait=False)
+        self.http_client.clear()
+        if self.hedge_http_client is not None:
+            self.hedge_http_client.clear()
+        if self.backend is not None:
+            self.backend.close()
+
+    def __create_http_client(self, proxy_server: str = None) -> urllib3.PoolManager:
+        pool_kwargs = {
+            "cert_reqs": "CERT_NONE",
+            "assert_hostname": False,
+            "maxsize": self.pool_maxsize,
+            "timeout": urllib3.Timeout(connect=self.request_timeout, read=self.request_timeout),
+        }
+        if proxy_server:
+            http_client = urllib3.ProxyManager(proxy_server, **pool_kwargs)
+        else:
+            http_client = urllib3.PoolManager(**pool_kwargs)
+        scope = {"dns_cache": self.dns_cache}
+        http_connection = type("CachedDnsHTTPConnection", (_CachedDnsHTTPConnection,), scope)
+        https_connection = type("CachedDnsHTTPSConnection", (_CachedDnsHTTPSConnection,), scope)
+        http_client.pool_classes_by_scheme = {
+            "http": type("CachedDnsHTTPConnectionPool", (HTTPConnectionPool,), {"ConnectionCls": http_connection}),
+            "https": type("CachedDnsHTTPSConnectionPool", (HTTPSConnectionPool,), {"ConnectionCls": https_connection}),
+        }
+        return http_client
+
+    def __warm_up_origin(self, origin: str, connections: int) -> int:
+        pool = self.http_client.connection_from_url(origin)
+        target = pool.proxy or pool
+        checked_out = []
+        try:
+            self.dns_cache.resolve(target.host, target.port or (443 if target.scheme == "https" else 80), refresh=True)
+            for _ in range(min(connections, self.pool_maxsize)):
+                connection = pool._get_conn()
+                checked_out.append(connection)
+                if not connection.is_connected:
+                    connection.connect()
+        except Exception as e:
+            warnings.warn(f"failed to warm up connections to {origin}: {e}")
+            for connection in checked_out:
+                connection.close()
+        for connection in checked_out:
+            pool._put_conn(connection)
+        return sum(1 for connection in checked_out if connection.is_connected)
+
+    def __get_default_header(self):
+        x_ajay = int(datetime.now().timestamp() * 1000)
+        x_catto = self.__get_ripemd160_hash(str(x_ajay))
+        x_midas = self.__get_sha384_hash(self.__get_sha256_hash(str(x_ajay + 64)))
+        with profiling.stage("user_agent"):
+            user_agent = get_random_user_agent()
+        return {
+            "User-Agent": user_agent,
+            "Accept": "*",
+            "Accept-Encoding": ", ".join(ACCEPT_ENCODING.split(",")),
+            "Origin": "https://livecounts.io",
+            "Referer": "https://livecounts.io/",
+            "X-Ajay": x_ajay,
+            "X-Catto": x_catto,
+            "X-Midas": x_midas,
+            **self.headers,
+        }
+
+    @staticmethod
+    def __get_ripemd160_hash(message: str):
+        h = RIPEMD160.new()
+        h.update(message.encode("utf-8"))
+        return h.hexdigest()
+
+    @staticmethod
+    def __get_sha256_hash(message):
+        sha256 = hashlib.sha256()
+        sha256.update(message.encode("utf-8"))
+        return sha256.hexdigest()
+
+    @staticmethod
+    def __get_sha384_hash(message):
+        sha384 = hashlib.sha384()
+        sha384.update(message.encode("utf-8"))
+        return sha384.hexdigest()
+
+
+_default_client: LivecountsClient | None = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client() -> LivecountsClient:
+    """
+    Returns:
+        LivecountsClient: The process-wide client configured by ``env``, used by the static agent calls
+    """
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = LivecountsClient.from_env()
+        return _default_client
+
+
+class agent_method:
+    """
+    Make an agent method callable both on an agent instance and, as before, on the agent class itself.
+
+    ``TiktokAgent(client).find_user(...)`` runs against ``client``; ``TiktokAgent.find_user(...)`` runs
+    against the class's default instance, which uses the default client.
+    """
+
+    def __init__(self, method):
+        self.method = method
+        functools.update_wrapper(self, method)
+
+    def __get__(self, instance, owner):
+        bound = self.method.__get__(instance if instance is not None else owner.default(), owner)
+        if not profiling.profiler.enabled:
+            return bound
+        name = f"{owner.__name__}.{self.method.__name__}"
+
+        @functools.wraps(bound)
+        def profiled(*args, **kwargs):
+            with profiling.stage(name):
+                result = bound(*args, **kwargs)
+                profiling.phase("build_model")
+                return result
+
+        return profiled
+
+
+class SearchResult:
+    """
+    Outcome of one query of a batch search: the agent's result, or the error raised for it.
+    """
+
+    def __init__(self, query: str, normalized_query: str, result=None, error: Exception = None):
+        self.query = query
+        self.normalized_query = normalized_query
+        self.result = result
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __dict__(self):
+        return {
+            "query": self.query,
+            "normalized_query": self.normalized_query,
+            "result": self.result,
+            "error": None if self.error is None else str(self.error),
+        }
+
+
+def normalize_query(query: str) -> str:
+    """
+    Returns:
+        str: The query without surrounding whitespace and leading ``@``, in lower case, so that spellings of
+        the same handle share one upstream call
+    """
+    return query.strip().lstrip("@").strip().lower()
+
+
+class BaseAgent:
+    def __init__(self, client: LivecountsClient = None):
+        self._client = client
+
+    @property
+    def client(self) -> LivecountsClient:
+        return self._client or get_default_client()
+
+    @property
+    def endpoints(self) -> Endpoints:
+        return self.client.endpoints
+
+    @classmethod
+    def default(cls):
+        """
+        Returns:
+            The shared instance backing calls made on the agent class, bound to the default client
+        """
+        instance = cls.__dict__.get("_default_instance")
+        if instance is None:
+            instance = cls()
+            setattr(cls, "_default_instance", instance)
+        return instance
+
+    def send_request(self, *args, **kwargs) -> dict[str, str]:
+        profiling.phase("build_url")
+        with profiling.stage("send_request"):
+            return self.client.send_request(*args, **kwargs)
+
+    def _find_many(self, find, queries: Iterable[str], concurrency: int) -> list[SearchResult]:
+        queries = list(queries)
+        normalized = [normalize_query(query) for query in queries]
+        outcomes: dict[str, tuple] = {"": (None, ValueError("empty query"))}
+
+        def search(query: str) -> tuple:
+            try:
+                return find(query), None
+            except Exception as e:
+                return None, e
+
+        unique = [query for query in dict.fromkeys(normalized) if query not in outcomes]
+        if unique:
+            with ThreadPoolExecutor(max_workers=min(concurrency, len(unique))) as executor:
+                outcomes.update(zip(unique, executor.map(search, unique)))
+        return [SearchResult(query, key, *outcomes[key]) for query, key in zip(queries, normalized)]
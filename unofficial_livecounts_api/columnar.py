@@ -0,0 +1,171 @@
+from array import array
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Iterable
+
+from unofficial_livecounts_api.client import LivecountsClient, get_default_client
+from unofficial_livecounts_api.tiktok import video_id_from_query
+
+# For each (platform, kind): the endpoint name and, per column, the response key and, for the
+# ``bottomOdos`` triple, the position inside it. Mirrors the count objects built by the agents.
+METRIC_COLUMNS = {
+    ("tiktok", "user-metrics"): (
+        "TIKTOK_USER_STATS_API",
+        {
+            "follower_count": ("followerCount", None),
+            "like_count": ("likeCount", None),
+            "following_count": ("followingCount", None),
+            "video_count": ("videoCount", None),
+        },
+    ),
+    ("tiktok", "video-metrics"): (
+        "TIKTOK_VIDEO_STATS_API",
+        {
+            "view_count": ("viewCount", None),
+            "like_count": ("likeCount", None),
+            "comment_count": ("commentCount", None),
+            "share_count": ("shareCount", None),
+        },
+    ),
+    ("youtube", "channel-metrics"): (
+        "YOUTUBE_CHANNEL_STATS_API",
+        {
+            "follower_count": ("followerCount", None),
+            "view_count": ("bottomOdos", 0),
+            "video_count": ("bottomOdos", 1),
+            "goal_count": ("bottomOdos", 2),
+        },
+    ),
+    ("youtube", "video-metrics"): (
+        "YOUTUBE_VIDEO_STATS_API",
+        {
+            "view_count": ("followerCount", None),
+            "like_count": ("bottomOdos", 0),
+            "dislike_count": ("bottomOdos", 1),
+            "comment_count": ("bottomOdos", 2),
+        },
+    ),
+    ("twitter", "user-metrics"): (
+        "TWITTER_USER_STATS_API",
+        {
+            "follower_count": ("followerCount", None),
+            "tweet_count": ("bottomOdos", 0),
+            "following_count": ("bottomOdos", 1),
+            "goal_count": ("bottomOdos", 2),
+        },
+    ),
+    ("twitch", "user-metrics"): (
+        "TWITCH_USER_STATS_API",
+        {"follower_count": ("followerCount", None)},
+    ),
+}
+
+# Queries the matching agent call reduces to an ID before building the URL, e.g. TikTok video URLs.
+QUERY_IDS: dict[tuple[str, str], Callable[[str], str | None]] = {
+    ("tiktok", "video-metrics"): video_id_from_query,
+}
+
+
+class ColumnarBatch:
+    """
+    Metric results of a batch as parallel columns: ``ids[i]`` owns row ``i`` of every counter column.
+
+    Counter columns are ``array('q')`` (signed 64-bit) and convert to NumPy arrays and pandas DataFrames
+    without copying the counters. Failed queries are kept apart in ``errors``.
+    """
+
+    def __init__(self, columns: Iterable[str]):
+        self.ids: list[str] = []
+        self.columns: dict[str, array] = {name: array("q") for name in columns}
+        self.errors: dict[str, str] = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def append(self, query: str, values: Iterable[int]) -> None:
+        self.ids.append(query)
+        for column, value in zip(self.columns.values(), values):
+            column.append(value)
+
+    def row(self, index: int) -> dict:
+        return {"id": self.ids[index], **{name: column[index] for name, column in self.columns.items()}}
+
+    def to_numpy(self) -> dict:
+        """
+        Returns:
+            dict: ``id`` as a NumPy object array and every counter as an int64 view over its column
+        """
+        import numpy as np
+
+        return {
+            "id": np.array(self.ids, dtype=object),
+            **{name: np.frombuffer(column, dtype=np.int64) for name, column in self.columns.items()},
+        }
+
+    def to_pandas(self):
+        """
+        Returns:
+            pandas.DataFrame: One row per ID, indexed by ``id``, with the counters as int64 columns
+        """
+        import pandas as pd
+
+        columns = self.to_numpy()
+        index = pd.Index(columns.pop("id"), name="id")
+        return pd.DataFrame(columns, index=index, copy=False)
+
+
+def fetch_metrics_columnar(
+    platform: str,
+    kind: str,
+    queries: Iterable[str],
+    concurrency: int = 8,
+    client: LivecountsClient = None,
+) -> ColumnarBatch:
+    """
+    Fetch live counts for many IDs straight into columns, without building a count object per row.
+
+    Args:
+        platform (str): One of ``tiktok``, ``youtube``, ``twitter`` or ``twitch``
+        kind (str): A metrics kind of that platform, e.g. ``user-metrics`` or ``video-metrics``
+        queries (Iterable[str]): IDs, or URLs where the matching ``fetch_*_metrics`` call accepts them, consumed
+            lazily; rows and errors are keyed by the ID
+        concurrency (int): Number of requests in flight
+        client (LivecountsClient): Client the requests go through, by default the default client
+
+    Returns:
+        ColumnarBatch: Rows in completion order, and the error message of every failed query
+    """
+    spec = METRIC_COLUMNS.get((platform, kind))
+    if spec is None:
+        raise ValueError(f"unsupported metrics for columnar results: {platform} {kind}")
+    endpoint, columns = spec
+    client = client or get_default_client()
+    base_url = getattr(client.endpoints, endpoint)
+    batch = ColumnarBatch(columns)
+    pending: dict[Future, str] = {}
+
+    def drain() -> None:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            query = pending.pop(future)
+            try:
+                metrics = future.result()
+                batch.append(query, [__read(metrics, key, position) for key, position in columns.values()])
+            except Exception as e:
+                batch.errors[query] = str(e)
+
+    to_id = QUERY_IDS.get((platform, kind))
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for query in queries:
+            query = to_id(query) if to_id is not None else query
+            pending[executor.submit(client.send_request, f"{base_url}/{query}")] = query
+            if len(pending) >= concurrency * 2:
+                drain()
+        while pending:
+            drain()
+    return batch
+
+
+def __read(metrics: dict, key: str, position: int | None) -> int:
+    if position is None:
+        return int(metrics.get(key) or 0)
+    return int((metrics.get(key) or [0, 0, 0])[position] or 0)
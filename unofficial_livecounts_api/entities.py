@@ -0,0 +1,161 @@
+import functools
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+ID_ATTRIBUTES = ("user_id", "channel_id", "video_id")
+
+_MISSING = object()
+
+
+def entity_id(entity: Any) -> str | None:
+    """
+    Returns:
+        str | None: The user_id, channel_id or video_id of a model or count object
+    """
+    for attribute in ID_ATTRIBUTES:
+        value = getattr(entity, attribute, None)
+        if value is not None:
+            return value
+    return None
+
+
+def is_entity(value: Any) -> bool:
+    """
+    Returns:
+        bool: Whether the value is a model or count object with a non-empty ID; the agents default a missing ID
+        to ``""``, and such objects must not be merged into one
+    """
+    return bool(entity_id(value)) and any(callable(vars(cls).get("__dict__")) for cls in type(value).__mro__)
+
+
+class IdentityMap:
+    """
+    One shared instance per entity (user, channel or video) across every response, and a short-lived memory of
+    lookups answered with them.
+
+    An entity seen again, e.g. as the author of another video or in another search, updates the instance already
+    interned instead of creating a copy. Lookups remembered with ``remember`` are answered by ``recall`` until
+    ``ttl`` expires. Both are bounded to ``max_size`` entries, evicting the least recently used.
+    """
+
+    def __init__(self, ttl: float = 300.0, max_size: int = 100_000, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            ttl (float): Seconds an entity or lookup stays fresh
+            max_size (int): Entities, and separately lookups, kept at most
+            clock (Callable[[], float]): Time source
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        self._entities: OrderedDict[tuple[type, str], tuple[float, Any]] = OrderedDict()
+        self._lookups: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self):
+        return len(self._entities)
+
+    def intern(self, entity: Any) -> Any:
+        """
+        Returns:
+            Any: The canonical instance of the entity, updated with the fields ``entity`` carries, i.e. those not
+            None; nested entities, such as the author of a video, are interned as well
+        """
+        if not is_entity(entity):
+            return entity
+        fields = {name: self.intern(value) for name, value in entity.__dict__().items()}
+        key = (type(entity), entity_id(entity))
+        with self._lock:
+            cached = self._entities.get(key)
+            canonical = entity if cached is None else cached[1]
+            for name, value in fields.items():
+                if value is not None and getattr(canonical, name, None) is not value:
+                    setattr(canonical, name, value)
+            self.__store(self._entities, key, canonical)
+        return canonical
+
+    def get(self, entity_type: type, key: str) -> Any | None:
+        """
+        Returns:
+            Any | None: The fresh interned entity of the given type and ID, or None
+        """
+        found, entity = self.__fresh(self._entities, (entity_type, key))
+        return entity if found else None
+
+    def remember(self, key: Hashable, result: Any) -> Any:
+        """
+        Intern the entities of a lookup result and remember the result under ``key``.
+
+        Returns:
+            Any: The result with its entities replaced by their canonical instances
+        """
+        if isinstance(result, list):
+            result = [self.intern(item) for item in result]
+        else:
+            result = self.intern(result)
+        with self._lock:
+            self.__store(self._lookups, key, result)
+        return result
+
+    def recall(self, key: Hashable) -> tuple[bool, Any]:
+        """
+        Returns:
+            tuple[bool, Any]: Whether a fresh result is remembered under ``key``, and that result
+        """
+        found, result = self.__fresh(self._lookups, key)
+        with self._lock:
+            if found:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return found, list(result) if isinstance(result, list) else result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entities.clear()
+            self._lookups.clear()
+
+    def __store(self, entries: OrderedDict, key: Hashable, value: Any) -> None:
+        entries[key] = (self.clock() + self.ttl, value)
+        entries.move_to_end(key)
+        while len(entries) > self.max_size:
+            entries.popitem(last=False)
+
+    def __fresh(self, entries: OrderedDict, key: Hashable) -> tuple[bool, Any]:
+        with self._lock:
+            cached = entries.get(key, _MISSING)
+            if cached is _MISSING:
+                return False, None
+            if cached[0] <= self.clock():
+                del entries[key]
+                return False, None
+            entries.move_to_end(key)
+            return True, cached[1]
+
+
+def identity_cached(method):
+    """
+    Answer an agent lookup from the identity map of the agent's client while it is fresh, and intern the
+    entities of every result. A lookup resolving to a single entity is also remembered under that entity's ID,
+    so e.g. a video found by URL is later found by its ID without a request.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, query: str):
+        identity_map = self.client.identity_map
+        if identity_map is None:
+            return method(self, query)
+        key = (type(self).__name__, method.__name__, query)
+        found, result = identity_map.recall(key)
+        if found:
+            return result
+        result = identity_map.remember(key, method(self, query))
+        if is_entity(result) and entity_id(result) != query:
+            identity_map.remember((type(self).__name__, method.__name__, entity_id(result)), result)
+        return result
+
+    return wrapper
@@ -8,6 +8,18 @@ load_dotenv()
 PROXY_ENABLED = os.getenv("PROXY_ENABLED", "off")
 PROXY_SERVER = os.getenv("PROXY_SERVER", None)
 
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "10"))
+DNS_CACHE_TTL = float(os.getenv("DNS_CACHE_TTL", "300"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "30"))
+
+SHARED_BACKEND_URL = os.getenv("SHARED_BACKEND_URL", "")
+RATE_LIMIT = int(os.getenv("RATE_LIMIT", "0"))
+RATE_LIMIT_PERIOD = float(os.getenv("RATE_LIMIT_PERIOD", "1"))
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "0"))
+
+PROFILE_OUTPUT = os.getenv("PROFILE_OUTPUT", "")
+PROFILE_FORMAT = os.getenv("PROFILE_FORMAT", "table")
+
 TIKTOK_USER_SEARCH_API = os.getenv("TIKTOK_USER_SEARCH_API", "https://tiktok.livecounts.io/user/search").removesuffix("/")
 TIKTOK_USER_STATS_API = os.getenv("TIKTOK_USER_STATS_API", "https://tiktok.livecounts.io/user/stats").removesuffix("/")
 TIKTOK_VIDEO_SEARCH_API = os.getenv("TIKTOK_VIDEO_SEARCH_API", "https://tiktok.livecounts.io/video/data").removesuffix("/")
@@ -0,0 +1,87 @@
+import math
+import threading
+from collections import deque
+
+
+class HedgingPolicy:
+    """
+    Decide when a slow request gets a second, identical request racing it.
+
+    A request is hedged once it has been waiting longer than the ``percentile`` of the recent latencies of
+    its endpoint. Hedges are paid from a token bucket that earns ``max_extra_ratio`` of a token per request
+    and holds at most ``burst`` tokens, so hedging never adds more than that fraction of extra load.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        max_extra_ratio: float = 0.05,
+        burst: float = 10.0,
+        min_samples: int = 20,
+        window: int = 200,
+        endpoint_suffix: str = "_STATS_API",
+    ):
+        """
+        Args:
+            percentile (float): Latency percentile after which a request is hedged
+            max_extra_ratio (float): Upper bound of hedged requests per request sent
+            burst (float): Hedges that may be spent at once after a quiet period
+            min_samples (int): Latencies an endpoint needs before its requests are hedged
+            window (int): Recent latencies kept per endpoint
+            endpoint_suffix (str): Only endpoints whose name ends with it are hedged, by default the stats endpoints
+        """
+        if not 0 < percentile <= 100:
+            raise ValueError("percentile must be within (0, 100]")
+        self.percentile = percentile
+        self.max_extra_ratio = max_extra_ratio
+        self.burst = burst
+        self.min_samples = min_samples
+        self.window = window
+        self.endpoint_suffix = endpoint_suffix
+        self._lock = threading.Lock()
+        self._latencies: dict[str, deque[float]] = {}
+        self._tokens = burst
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def record(self, endpoint: str, latency: float) -> None:
+        with self._lock:
+            self._latencies.setdefault(endpoint, deque(maxlen=self.window)).append(latency)
+
+    def delay(self, endpoint: str) -> float | None:
+        """
+        Returns:
+            float | None: Seconds to wait for the first response before hedging, or None while the endpoint
+            has fewer than ``min_samples`` recorded latencies
+        """
+        with self._lock:
+            latencies = sorted(self._latencies.get(endpoint, ()))
+        if not latencies or len(latencies) < self.min_samples:
+            return None
+        return latencies[max(math.ceil(len(latencies) * self.percentile / 100) - 1, 0)]
+
+    def start_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+            self._tokens = min(self._tokens + self.max_extra_ratio, self.burst)
+
+    def try_hedge(self) -> bool:
+        """
+        Returns:
+            bool: Whether the budget allows one more hedge, which is then charged
+        """
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            self.hedged += 1
+            return True
+
+    def record_win(self) -> None:
+        with self._lock:
+            self.hedge_wins += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"requests": self.requests, "hedged": self.hedged, "hedge_wins": self.hedge_wins}
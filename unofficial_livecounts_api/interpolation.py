@@ -0,0 +1,98 @@
+import time
+from collections import deque
+from typing import Callable
+
+
+class LiveCountEstimator:
+    """
+    Extrapolate a live count between polls so it can be rendered as a smoothly moving odometer.
+
+    The growth rate is the least-squares slope over the last ``history`` polled values, and the estimate runs
+    along that slope from the latest real value. When a new real value arrives, the gap between what was shown
+    and the new trajectory is faded out linearly over ``correction_seconds`` instead of jumping. Extrapolation
+    stops ``max_extrapolation`` seconds after the last poll, so a stalled poller freezes the count rather than
+    inventing growth.
+    """
+
+    def __init__(
+        self,
+        history: int = 5,
+        correction_seconds: float = 1.0,
+        max_extrapolation: float = 60.0,
+        monotonic: bool = False,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            history (int): Number of recent polls the rate is fitted on
+            correction_seconds (float): Time over which a misprediction is blended into the new trajectory
+            max_extrapolation (float): Seconds after the last poll beyond which the estimate stops moving
+            monotonic (bool): Never let the estimate go backwards, for counters that only grow such as views
+            clock (Callable[[], float]): Time source, in seconds
+        """
+        if history < 1:
+            raise ValueError("history must be at least 1")
+        self.correction_seconds = correction_seconds
+        self.max_extrapolation = max_extrapolation
+        self.monotonic = monotonic
+        self._clock = clock
+        self._polls: deque[tuple[float, float]] = deque(maxlen=history)
+        self._rate = 0.0
+        self._offset = 0.0
+        self._last_estimate = None
+
+    @property
+    def rate(self) -> float:
+        """
+        Returns:
+            float: Fitted change per second
+        """
+        return self._rate
+
+    def observe(self, value: float, at: float = None) -> None:
+        """
+        Record a real polled value, e.g. ``TiktokUserCount.follower_count`` or ``YoutubeVideoCount.view_count``.
+
+        Args:
+            value (float): The polled count
+            at (float): Clock time of the poll, defaults to now
+        """
+        at = self._clock() if at is None else at
+        shown = self.estimate(at) if self._polls else value
+        self._polls.append((at, float(value)))
+        self._rate = self.__fit_rate()
+        self._offset = shown - value
+
+    def estimate(self, at: float = None) -> float | None:
+        """
+        Args:
+            at (float): Clock time to estimate the count for, defaults to now
+
+        Returns:
+            float | None: The extrapolated count, or None before the first poll
+        """
+        if not self._polls:
+            return None
+        at = self._clock() if at is None else at
+        polled_at, value = self._polls[-1]
+        elapsed = min(max(at - polled_at, 0.0), self.max_extrapolation)
+        estimate = value + self._rate * elapsed
+        if self.correction_seconds > 0 and elapsed < self.correction_seconds:
+            estimate += self._offset * (1 - elapsed / self.correction_seconds)
+        if self.monotonic and self._last_estimate is not None:
+            estimate = max(estimate, self._last_estimate)
+        self._last_estimate = estimate
+        return estimate
+
+    def __fit_rate(self) -> float:
+        if len(self._polls) < 2:
+            return 0.0
+        times = [t for t, _ in self._polls]
+        values = [v for _, v in self._polls]
+        mean_time = sum(times) / len(times)
+        mean_value = sum(values) / len(values)
+        variance = sum((t - mean_time) ** 2 for t in times)
+        if variance == 0:
+            return self._rate
+        slope = sum((t - mean_time) * (v - mean_value) for t, v in zip(times, values)) / variance
+        return max(slope, 0.0) if self.monotonic else slope
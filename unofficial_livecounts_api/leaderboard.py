@@ -0,0 +1,167 @@
+import time
+from bisect import bisect_left, insort
+from itertools import chain, islice
+from typing import Any, Callable, Iterable, Iterator
+
+from unofficial_livecounts_api import agents
+
+
+class _SortedList:
+    """
+    Sorted list split into buckets of a few hundred items: insertions and removals move one bucket instead of
+    the whole list, and the smallest or largest items are read without sorting.
+    """
+
+    LOAD = 512
+
+    def __init__(self):
+        self._buckets: list[list] = []
+        self._maxes: list = []
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self) -> Iterator:
+        return chain.from_iterable(self._buckets)
+
+    def __reversed__(self) -> Iterator:
+        return chain.from_iterable(reversed(bucket) for bucket in reversed(self._buckets))
+
+    def add(self, item) -> None:
+        self._len += 1
+        if not self._buckets:
+            self._buckets.append([item])
+            self._maxes.append(item)
+            return
+        index = min(bisect_left(self._maxes, item), len(self._buckets) - 1)
+        bucket = self._buckets[index]
+        insort(bucket, item)
+        self._maxes[index] = bucket[-1]
+        if len(bucket) > 2 * self.LOAD:
+            self._buckets.insert(index + 1, bucket[self.LOAD :])
+            del bucket[self.LOAD :]
+            self._maxes.insert(index, bucket[-1])
+
+    def remove(self, item) -> None:
+        index = bisect_left(self._maxes, item)
+        bucket = self._buckets[index]
+        del bucket[bisect_left(bucket, item)]
+        self._len -= 1
+        if bucket:
+            self._maxes[index] = bucket[-1]
+        else:
+            del self._buckets[index]
+            del self._maxes[index]
+
+    def index(self, item) -> int:
+        index = bisect_left(self._maxes, item)
+        return sum(len(bucket) for bucket in self._buckets[:index]) + bisect_left(self._buckets[index], item)
+
+
+class Leaderboard:
+    """
+    Rank tracked accounts or videos by one counter, kept up to date as count objects arrive.
+
+    Every update repositions a single entry in an order-statistics structure, so reading the top-K, the
+    bottom-K or the fastest-growing-K costs O(K) regardless of how many IDs are tracked. Growth is the
+    smoothed per-second change of the counter between updates of the same ID.
+    """
+
+    def __init__(self, metric: str, smoothing: float = 0.5, clock: Callable[[], float] = time.time):
+        """
+        Args:
+            metric (str): Counter attribute of the count objects, e.g. ``follower_count`` or ``view_count``
+            smoothing (float): Weight of the latest change in the growth rate, 1 keeps only the latest change
+            clock (Callable[[], float]): Time source used when updates carry no timestamp
+        """
+        self.metric = metric
+        self.smoothing = smoothing
+        self.clock = clock
+        self._observed: dict[str, tuple[int, float]] = {}
+        self._rates: dict[str, float] = {}
+        self._by_value = _SortedList()
+        self._by_rate = _SortedList()
+
+    def __len__(self):
+        return len(self._observed)
+
+    def __contains__(self, key: str):
+        return key in self._observed
+
+    def update(self, count: Any, at: float = None) -> None:
+        """
+        Args:
+            count (Any): Count object returned by a ``fetch_*_metrics`` call; counts without the metric are ignored
+            at (float): Time the count was observed, by default now
+        """
+        value = getattr(count, self.metric, None)
+        if value is not None:
+            self.set(agents.entity_id(count), value, at)
+
+    def update_many(self, counts: Iterable[Any], at: float = None) -> None:
+        at = self.clock() if at is None else at
+        for count in counts:
+            self.update(count, at)
+
+    def set(self, key: str, value: int, at: float = None) -> None:
+        at = self.clock() if at is None else at
+        previous = self._observed.get(key)
+        self._observed[key] = (value, at)
+        if previous is None:
+            self._by_value.add((value, key))
+            return
+        previous_value, previous_at = previous
+        if previous_value != value:
+            self._by_value.remove((previous_value, key))
+            self._by_value.add((value, key))
+        if at <= previous_at:
+            return
+        rate = (value - previous_value) / (at - previous_at)
+        previous_rate = self._rates.get(key)
+        if previous_rate is not None:
+            rate = self.smoothing * rate + (1 - self.smoothing) * previous_rate
+            self._by_rate.remove((previous_rate, key))
+        self._rates[key] = rate
+        self._by_rate.add((rate, key))
+
+    def remove(self, key: str) -> None:
+        value, _ = self._observed.pop(key)
+        self._by_value.remove((value, key))
+        rate = self._rates.pop(key, None)
+        if rate is not None:
+            self._by_rate.remove((rate, key))
+
+    def get(self, key: str) -> int | None:
+        observed = self._observed.get(key)
+        return None if observed is None else observed[0]
+
+    def rank(self, key: str) -> int:
+        """
+        Returns:
+            int: 1 for the ID with the highest counter, ``len(self)`` for the lowest
+        """
+        value, _ = self._observed[key]
+        return len(self._by_value) - self._by_value.index((value, key))
+
+    def top(self, k: int) -> list[tuple[str, int]]:
+        """
+        Returns:
+            list[tuple[str, int]]: The ``k`` IDs with the highest counter and their counter, highest first
+        """
+        return [(key, value) for value, key in islice(reversed(self._by_value), k)]
+
+    def bottom(self, k: int) -> list[tuple[str, int]]:
+        """
+        Returns:
+            list[tuple[str, int]]: The ``k`` IDs with the lowest counter and their counter, lowest first
+        """
+        return [(key, value) for value, key in islice(self._by_value, k)]
+
+    def fastest_growing(self, k: int) -> list[tuple[str, float]]:
+        """
+        Returns:
+            list[tuple[str, float]]: The ``k`` IDs with the highest growth per second, fastest first; IDs
+            updated only once have no growth yet and are not ranked
+        """
+        return [(key, rate) for rate, key in islice(reversed(self._by_rate), k)]
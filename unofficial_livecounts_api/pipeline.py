@@ -0,0 +1,263 @@
+import queue
+import threading
+import time
+from typing import Any, Callable, Iterable
+
+from unofficial_livecounts_api import agents
+from unofficial_livecounts_api.client import LivecountsClient
+from unofficial_livecounts_api.error import RequestApiError
+
+_DONE = object()
+_POLL_INTERVAL = 0.1
+
+
+class Stage:
+    def __init__(self, name: str, func: Callable[[Any], Any], workers: int, queue_size: int):
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.inbox: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.processed = 0
+        self.dropped = 0
+        self.errors = 0
+        self.last_error: Exception | None = None
+        self.busy_seconds = 0.0
+        self.blocked_seconds = 0.0
+        self.max_queue_depth = 0
+        self._alive = workers
+
+    def __dict__(self):
+        return {
+            "name": self.name,
+            "workers": self.workers,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "queue_depth": self.inbox.qsize(),
+            "queue_size": self.inbox.maxsize,
+            "max_queue_depth": self.max_queue_depth,
+            "busy_seconds": self.busy_seconds,
+            "blocked_seconds": self.blocked_seconds,
+        }
+
+
+class Pipeline:
+    """
+    Feed IDs from a source through stages, such as an agent fetch, a transform and a sink, each run by its own
+    worker threads and connected by bounded queues.
+
+    A stage blocks while the queue of the next stage is full, so a slow sink holds back the fetch workers and
+    the source instead of buffering results without limit. A stage returning None drops the item; the result of
+    the last stage, the sink, is discarded. A RequestApiError is counted on its stage and drops the item; any
+    other exception stops the pipeline and is raised by ``join``.
+    """
+
+    def __init__(self, source: Iterable[Any], queue_size: int = 100, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            source (Iterable[Any]): Items fed to the first stage, e.g. IDs
+            queue_size (int): Default capacity of the queue in front of every stage
+            clock (Callable[[], float]): Time source of the stats
+        """
+        self.source = source
+        self.queue_size = queue_size
+        self.clock = clock
+        self.stages: list[Stage] = []
+        self.produced = 0
+        self.source_blocked_seconds = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._error: Exception | None = None
+        self._started_at: float | None = None
+        self._finished_at: float | None = None
+
+    def stage(self, name: str, func: Callable[[Any], Any], workers: int = 1, queue_size: int = None) -> "Pipeline":
+        """
+        Append a stage.
+
+        Args:
+            name (str): Name of the stage in the stats
+            func (Callable[[Any], Any]): Called with every item of the previous stage; its result is passed on
+            workers (int): Threads running ``func``
+            queue_size (int): Capacity of the queue in front of the stage, by default the pipeline's
+
+        Returns:
+            Pipeline: The pipeline, to chain further stages
+        """
+        if self._threads:
+            raise ValueError("stages cannot be added to a started pipeline")
+        if workers < 1:
+            raise ValueError("a stage needs at least one worker")
+        self.stages.append(Stage(name, func, workers, self.queue_size if queue_size is None else queue_size))
+        return self
+
+    def fetch_metrics(
+        self, platform: str, kind: str, client: LivecountsClient = None, workers: int = 8, name: str = "fetch"
+    ) -> "Pipeline":
+        """
+        Append a stage calling the agent method of a metrics kind, e.g. ``("tiktok", "user-metrics")``, with every
+        item as query.
+        """
+        if not kind.endswith("metrics"):
+            raise ValueError(f"not a metrics kind: {kind}")
+        return self.stage(name, agents.resolve(platform, kind, client), workers=workers)
+
+    def start(self) -> "Pipeline":
+        if not self.stages:
+            raise ValueError("a pipeline needs at least one stage")
+        if self._threads:
+            raise ValueError("the pipeline is already started")
+        self._started_at = self.clock()
+        self._threads.append(threading.Thread(target=self.__feed, name="livecounts-pipeline-source", daemon=True))
+        for index, stage in enumerate(self.stages):
+            for worker in range(stage.workers):
+                self._threads.append(
+                    threading.Thread(
+                        target=self.__work,
+                        args=(index,),
+                        name=f"livecounts-pipeline-{stage.name}-{worker}",
+                        daemon=True,
+                    )
+                )
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def join(self, timeout: float = None) -> dict:
+        """
+        Wait until every item went through every stage or the pipeline was stopped.
+
+        Returns:
+            dict: The final stats, see ``stats``
+
+        Raises:
+            Exception: The first exception, other than a RequestApiError, raised by a stage or the source
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        if self._finished_at is None and not any(thread.is_alive() for thread in self._threads):
+            self._finished_at = self.clock()
+        if self._error is not None:
+            raise self._error
+        return self.stats()
+
+    def run(self) -> dict:
+        return self.start().join()
+
+    def stop(self) -> None:
+        """
+        Stop feeding and processing items; items still queued are discarded.
+        """
+        self._stop.set()
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: ``elapsed`` seconds, the ``source`` with ``produced`` items and ``blocked_seconds`` spent waiting
+            for the first queue, and per stage its counters, current and maximum queue depth, seconds its workers
+            spent busy and blocked on the next queue, and ``throughput`` in items per second
+        """
+        if self._started_at is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self._finished_at if self._finished_at is not None else self.clock()) - self._started_at
+        stages = {}
+        for stage in self.stages:
+            stages[stage.name] = {
+                **stage.__dict__(),
+                "throughput": stage.processed / elapsed if elapsed > 0 else 0.0,
+            }
+        return {
+            "elapsed": elapsed,
+            "source": {"produced": self.produced, "blocked_seconds": self.source_blocked_seconds},
+            "stages": stages,
+        }
+
+    def __feed(self) -> None:
+        first = self.stages[0]
+        try:
+            for item in self.source:
+                if self._stop.is_set():
+                    return
+                blocked = self.__put(first, item)
+                with self._lock:
+                    self.produced += 1
+                    self.source_blocked_seconds += blocked
+        except Exception as e:
+            self.__fail(e)
+        finally:
+            for _ in range(first.workers):
+                self.__put(first, _DONE)
+
+    def __work(self, index: int) -> None:
+        stage = self.stages[index]
+        downstream = self.stages[index + 1] if index + 1 < len(self.stages) else None
+        while True:
+            item = self.__get(stage)
+            if item is _DONE:
+                break
+            started_at = time.perf_counter()
+            try:
+                result = stage.func(item)
+            except RequestApiError as e:
+                with self._lock:
+                    stage.errors += 1
+                    stage.last_error = e
+                    stage.busy_seconds += time.perf_counter() - started_at
+                continue
+            except Exception as e:
+                self.__fail(e)
+                break
+            busy = time.perf_counter() - started_at
+            dropped = result is None and downstream is not None
+            blocked = 0.0
+            if downstream is not None and not dropped:
+                blocked = self.__put(downstream, result)
+            with self._lock:
+                stage.busy_seconds += busy
+                stage.blocked_seconds += blocked
+                if dropped:
+                    stage.dropped += 1
+                else:
+                    stage.processed += 1
+
+        # Every worker takes one end marker; the last one to finish passes one on to each worker downstream.
+        with self._lock:
+            stage._alive -= 1
+            last = stage._alive == 0
+        if last and downstream is not None:
+            for _ in range(downstream.workers):
+                self.__put(downstream, _DONE)
+
+    def __get(self, stage: Stage) -> Any:
+        while not self._stop.is_set():
+            try:
+                return stage.inbox.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def __put(self, stage: Stage, item: Any) -> float:
+        """
+        Returns:
+            float: Seconds spent waiting for room in the queue of the stage
+        """
+        started_at = time.perf_counter()
+        while not self._stop.is_set():
+            try:
+                stage.inbox.put(item, timeout=_POLL_INTERVAL)
+                break
+            except queue.Full:
+                continue
+        depth = stage.inbox.qsize()
+        with self._lock:
+            stage.max_queue_depth = max(stage.max_queue_depth, depth)
+        return time.perf_counter() - started_at
+
+    def __fail(self, error: Exception) -> None:
+        with self._lock:
+            if self._error is None:
+                self._error = error
+        self._stop.set()
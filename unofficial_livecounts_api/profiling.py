@@ -0,0 +1,170 @@
+import atexit
+import contextlib
+import sys
+import threading
+import time
+from typing import TextIO
+
+from unofficial_livecounts_api import env
+
+
+class _Frame:
+    def __init__(self, path: str, started: int):
+        self.path = path
+        self.started = started
+        self.mark = started
+        self.children = 0
+
+
+class Profiler:
+    """
+    Aggregate the time spent in each stage of the request path, per call stack.
+
+    Stages nest: a stage entered while another one runs on the same thread is recorded under it, e.g.
+    ``TiktokAgent.find_video;send_request;network``. Every stack keeps its self time (its time minus the time of
+    its nested stages), which is the input of flame graph tools, and its call count.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._self_ns: dict[str, int] = {}
+        self._calls: dict[str, int] = {}
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        stack = self.__stack()
+        now = time.perf_counter_ns()
+        path = f"{stack[-1].path};{name}" if stack else name
+        stack.append(_Frame(path, now))
+        try:
+            yield
+        finally:
+            frame = stack.pop()
+            ended = time.perf_counter_ns()
+            self.__record(frame.path, ended - frame.mark - frame.children, calls=1)
+            if stack:
+                stack[-1].children += ended - frame.started
+
+    def phase(self, name: str) -> None:
+        """
+        Record the time the current stage spent on its own since it started, or since its last phase, as the
+        nested stage ``name``. Lets a stage split its own work, e.g. into URL building and model construction.
+        """
+        stack = self.__stack()
+        if not stack:
+            return
+        frame = stack[-1]
+        now = time.perf_counter_ns()
+        self.__record(f"{frame.path};{name}", now - frame.mark - frame.children, calls=1)
+        frame.mark = now
+        frame.children = 0
+
+    def folded(self) -> list[str]:
+        """
+        Returns:
+            list[str]: ``stack self_microseconds`` lines, the folded format read by flamegraph.pl and speedscope
+        """
+        with self._lock:
+            return [f"{path} {self_ns // 1000}" for path, self_ns in sorted(self._self_ns.items())]
+
+    def summary(self) -> list[dict]:
+        """
+        Returns:
+            list[dict]: Per stage name, summed over the stacks it appears in: ``calls``, ``total_ms`` of self
+            time and its ``share`` of all recorded time, largest first
+        """
+        totals: dict[str, list[int]] = {}
+        with self._lock:
+            for path, self_ns in self._self_ns.items():
+                total = totals.setdefault(path.rsplit(";", 1)[-1], [0, 0])
+                total[0] += self._calls[path]
+                total[1] += self_ns
+        overall = sum(self_ns for _, self_ns in totals.values()) or 1
+        rows = [
+            {"stage": name, "calls": calls, "total_ms": self_ns / 1e6, "share": self_ns / overall}
+            for name, (calls, self_ns) in totals.items()
+        ]
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+    def write(self, output: TextIO, format: str = "table") -> None:
+        """
+        Args:
+            output (TextIO): Stream the report is written to
+            format (str): ``folded`` for flame graph stacks, ``table`` for the per-stage summary
+        """
+        if format == "folded":
+            output.writelines(line + "\n" for line in self.folded())
+            return
+        output.write(f"{'stage':<32} {'calls':>10} {'total ms':>12} {'share':>7}\n")
+        for row in self.summary():
+            output.write(f"{row['stage']:<32} {row['calls']:>10} {row['total_ms']:>12.3f} {row['share']:>7.1%}\n")
+
+    def reset(self) -> None:
+        with self._lock:
+            self._self_ns.clear()
+            self._calls.clear()
+
+    def __stack(self) -> list[_Frame]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def __record(self, path: str, self_ns: int, calls: int) -> None:
+        with self._lock:
+            self._self_ns[path] = self._self_ns.get(path, 0) + self_ns
+            self._calls[path] = self._calls.get(path, 0) + calls
+
+
+profiler = Profiler()
+_disabled = contextlib.nullcontext()
+
+
+def stage(name: str):
+    """
+    Returns:
+        A context manager timing the block as stage ``name`` while profiling is enabled, else a no-op
+    """
+    return profiler.stage(name) if profiler.enabled else _disabled
+
+
+def phase(name: str) -> None:
+    if profiler.enabled:
+        profiler.phase(name)
+
+
+def enable(output: str = None, format: str = "table") -> Profiler:
+    """
+    Start profiling the request path of every client and agent in the process.
+
+    Args:
+        output (str): File the report is written to at exit, ``-`` for stderr, or None to only collect it
+        format (str): ``folded`` for flame graph stacks, ``table`` for the per-stage summary
+
+    Returns:
+        Profiler: The process-wide profiler, to read or write the report on demand
+    """
+    if format not in ("folded", "table"):
+        raise ValueError(f"unsupported profile format: {format}, expected folded or table")
+    profiler.enabled = True
+    if output:
+        atexit.register(__write_report, output, format)
+    return profiler
+
+
+def disable() -> None:
+    profiler.enabled = False
+
+
+def __write_report(output: str, format: str) -> None:
+    if output == "-":
+        profiler.write(sys.stderr, format)
+        return
+    with open(output, "w", encoding="utf-8") as file:
+        profiler.write(file, format)
+
+
+if env.PROFILE_OUTPUT:
+    enable(env.PROFILE_OUTPUT, env.PROFILE_FORMAT)
@@ -0,0 +1,177 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+from unofficial_livecounts_api import agents
+from unofficial_livecounts_api.client import LivecountsClient
+
+
+class _Entry:
+    def __init__(self, value: Any, fetched_at: float):
+        self.value = value
+        self.fetched_at = fetched_at
+        self.reads = 0
+
+
+class RevalidatingCache:
+    """
+    Serve an agent call from its last result and refresh that result in the background (stale-while-revalidate).
+
+    A result younger than ``ttl`` is fresh. A result between ``ttl`` and ``max_staleness`` old is still returned
+    at once while a background worker fetches a new one; only a missing result, or one older than
+    ``max_staleness``, makes the caller wait for upstream. Hot keys, read at least ``hot_reads`` times since their
+    last refresh, are refreshed ahead once ``refresh_ahead`` of their ``ttl`` has passed, so their readers never
+    see them stale. Failed background refreshes keep the previous result. At most ``max_size`` results are kept,
+    evicting the least recently read.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Any],
+        ttl: float = 10.0,
+        max_staleness: float = 60.0,
+        refresh_ahead: float = 0.8,
+        hot_reads: int = 2,
+        workers: int = 4,
+        max_size: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            fetch (Callable[[str], Any]): Blocking upstream call, e.g. ``YoutubeAgent.fetch_channel_metrics``
+            ttl (float): Seconds a result is fresh
+            max_staleness (float): Seconds after which a result is no longer served, not even while refreshing
+            refresh_ahead (float): Fraction of ``ttl`` after which hot keys are refreshed
+            hot_reads (int): Reads since the last refresh that make a key hot
+            workers (int): Background refreshes in flight
+            max_size (int): Results kept at most
+            clock (Callable[[], float]): Time source
+        """
+        if max_staleness < ttl:
+            raise ValueError("max_staleness must be at least ttl")
+        self.fetch = fetch
+        self.ttl = ttl
+        self.max_staleness = max_staleness
+        self.refresh_ahead = refresh_ahead
+        self.hot_reads = hot_reads
+        self.max_size = max_size
+        self.clock = clock
+        self.stats = {"fresh": 0, "stale": 0, "misses": 0, "refreshes": 0, "refresh_errors": 0}
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._inflight: dict[str, Future] = {}
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="livecounts-revalidate")
+
+    @classmethod
+    def for_metrics(cls, platform: str, kind: str, client: LivecountsClient = None, **kwargs) -> "RevalidatingCache":
+        """
+        Returns:
+            RevalidatingCache: A cache in front of the agent method of a metrics kind, e.g.
+            ``("youtube", "channel-metrics")``, configured by ``kwargs``
+        """
+        if not kind.endswith("metrics"):
+            raise ValueError(f"stale-while-revalidate serves metrics kinds only, not {kind}")
+        return cls(agents.resolve(platform, kind, client), **kwargs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def get(self, query: str) -> Any:
+        """
+        Returns:
+            Any: The latest result of ``fetch(query)`` at most ``max_staleness`` old
+
+        Raises:
+            RequestApiError: If the result had to be fetched in the foreground and the fetch failed
+            RuntimeError: If the cache is closed
+        """
+        now = self.clock()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("the revalidating cache is closed")
+            entry = self._entries.get(query)
+            if entry is not None and now - entry.fetched_at <= self.max_staleness:
+                self._entries.move_to_end(query)
+                entry.reads += 1
+                age = now - entry.fetched_at
+                if age < self.ttl:
+                    self.stats["fresh"] += 1
+                    if entry.reads >= self.hot_reads and age >= self.ttl * self.refresh_ahead:
+                        self.__refresh_in_background(query)
+                else:
+                    self.stats["stale"] += 1
+                    self.__refresh_in_background(query)
+                return entry.value
+            self.stats["misses"] += 1
+            future = self._inflight.get(query)
+            if future is None:
+                future = self._inflight[query] = Future()
+                owner = True
+            else:
+                owner = False
+        if owner:
+            self.__run(query, future)
+        return future.result()
+
+    def peek(self, query: str) -> tuple[Any, float] | None:
+        """
+        Returns:
+            tuple[Any, float] | None: The cached result and its age in seconds without refreshing it, or None
+        """
+        with self._lock:
+            entry = self._entries.get(query)
+            return None if entry is None else (entry.value, self.clock() - entry.fetched_at)
+
+    def invalidate(self, query: str) -> None:
+        with self._lock:
+            self._entries.pop(query, None)
+
+    def close(self) -> None:
+        """
+        Stop refreshing; refreshes not started yet are cancelled and readers waiting on them get a RuntimeError.
+        """
+        with self._lock:
+            self._closed = True
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            inflight, self._inflight = self._inflight, {}
+            for future in inflight.values():
+                if not future.done():
+                    future.set_exception(RuntimeError("the revalidating cache is closed"))
+
+    def __refresh_in_background(self, query: str) -> None:
+        if query in self._inflight:
+            return
+        future = self._inflight[query] = Future()
+        self._executor.submit(self.__run, query, future, True)
+
+    def __run(self, query: str, future: Future, background: bool = False) -> None:
+        try:
+            value = self.fetch(query)
+        except Exception as e:
+            with self._lock:
+                self.__settle(query, future)
+                if background:
+                    self.stats["refresh_errors"] += 1
+                if not future.done():
+                    future.set_exception(e)
+            return
+        with self._lock:
+            self.__settle(query, future)
+            self._entries[query] = _Entry(value, self.clock())
+            self._entries.move_to_end(query)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            if background:
+                self.stats["refreshes"] += 1
+            if not future.done():
+                future.set_result(value)
+
+    def __settle(self, query: str, future: Future) -> None:
+        if self._inflight.get(query) is future:
+            del self._inflight[query]
@@ -0,0 +1,283 @@
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Hashable
+
+
+class TrackedItem:
+    def __init__(
+        self,
+        key: Hashable,
+        query: str,
+        fetch: Callable[[str], Any],
+        metric: str,
+        interval: float,
+    ):
+        self.key = key
+        self.query = query
+        self.fetch = fetch
+        self.metric = metric
+        self.interval = interval
+        self.rate = None
+        self.last_value = None
+        self.last_polled_at = None
+        self.next_due_at = 0.0
+        self.queue_sequence = None
+        self.polls = 0
+        self.errors = 0
+
+    def __eq__(self, other):
+        return self.key == other.key if isinstance(other, TrackedItem) else False
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __dict__(self):
+        return {
+            "key": self.key,
+            "query": self.query,
+            "metric": self.metric,
+            "interval": self.interval,
+            "rate": self.rate,
+            "last_value": self.last_value,
+            "last_polled_at": self.last_polled_at,
+            "next_due_at": self.next_due_at,
+            "polls": self.polls,
+            "errors": self.errors,
+        }
+
+
+class AdaptiveScheduler:
+    """
+    Poll tracked IDs on any platform under a global request budget, polling fast-moving counts often
+    and dormant ones rarely.
+
+    Each tracked ID keeps an exponentially smoothed rate of change of one metric. Its next polling interval
+    is the time that metric needs to move by ``target_change`` units, clamped to ``[min_interval, max_interval]``;
+    an unchanged count multiplies the interval by ``backoff`` instead. Due items are kept in a heap keyed by
+    next-due time, and consecutive requests are spaced at least ``1 / budget_per_second`` apart, so an
+    oversubscribed scheduler degrades by delaying polls rather than exceeding the budget. ``run`` hands due items
+    to a pool of ``workers`` threads, so slow calls do not cap throughput and a hung call holds one worker only.
+    """
+
+    def __init__(
+        self,
+        budget_per_second: float,
+        min_interval: float = 1.0,
+        max_interval: float = 600.0,
+        target_change: float = 1.0,
+        backoff: float = 2.0,
+        smoothing: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        workers: int = 8,
+    ):
+        if budget_per_second <= 0:
+            raise ValueError("budget_per_second must be positive")
+        if not 0 < min_interval <= max_interval:
+            raise ValueError("intervals must satisfy 0 < min_interval <= max_interval")
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.budget_per_second = budget_per_second
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_change = target_change
+        self.backoff = backoff
+        self.smoothing = smoothing
+        self._clock = clock
+        self._sleep = sleep
+        self._items: dict[Hashable, TrackedItem] = {}
+        self._queue: list[tuple[float, int, Hashable]] = []
+        self._sequence = itertools.count()
+        self._next_slot_at = 0.0
+        self.workers = workers
+        self._in_flight = 0
+        self._lock = threading.RLock()
+        self._polled = threading.Condition(self._lock)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def track(
+        self,
+        query: str,
+        fetch: Callable[[str], Any],
+        metric: str,
+        interval: float = None,
+        key: Hashable = None,
+    ) -> TrackedItem:
+        """
+        Start tracking an ID.
+
+        Args:
+            query (str): The ID or URL passed to ``fetch``
+            fetch (Callable[[str], Any]): Agent metric call, e.g. ``TiktokAgent.fetch_video_metrics``
+            metric (str): Attribute of the returned count object to adapt on, e.g. ``view_count``
+            interval (float): Initial polling interval, defaults to ``min_interval``
+            key (Hashable): Identity of the tracked item, defaults to ``(fetch.__qualname__, query)``
+
+        Returns:
+            TrackedItem: The tracked item, due immediately
+        """
+        key = key if key is not None else (getattr(fetch, "__qualname__", repr(fetch)), query)
+        item = TrackedItem(
+            key=key,
+            query=query,
+            fetch=fetch,
+            metric=metric,
+            interval=self.__clamp(interval if interval is not None else self.min_interval),
+        )
+        item.next_due_at = self._clock()
+        with self._lock:
+            self._items[key] = item
+            self.__push(item)
+        return item
+
+    def untrack(self, key: Hashable) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+
+    def get(self, key: Hashable) -> TrackedItem | None:
+        return self._items.get(key)
+
+    def next_wakeup(self) -> float | None:
+        """
+        Returns:
+            float | None: Clock time at which the next poll may run, or None if nothing is tracked
+        """
+        with self._lock:
+            item = self.__peek()
+            if item is None:
+                return None
+            return max(item.next_due_at, self._next_slot_at)
+
+    def poll_once(self) -> tuple[TrackedItem, Any, Exception | None] | None:
+        """
+        Poll the most overdue item if it is due and the budget allows it.
+
+        Returns:
+            tuple[TrackedItem, Any, Exception | None] | None: The polled item, the fetched count object
+            (None on error) and the raised exception, e.g. a RequestApiError or a result without the metric or
+            with a None value, or None when nothing could be polled yet
+        """
+        with self._lock:
+            item = self.__take_due()
+        if item is None:
+            return None
+        return self.__poll(item)
+
+    def run(
+        self,
+        callback: Callable[[TrackedItem, Any, Exception | None], None],
+        should_stop: Callable[[], bool] = lambda: False,
+    ) -> None:
+        """
+        Poll continuously on the worker pool, sleeping until the next item is due, and hand every poll to
+        ``callback``, which is called from the worker threads.
+
+        Args:
+            callback (Callable): Called with ``(item, result, error)`` after every poll
+            should_stop (Callable[[], bool]): Checked before every poll; the loop exits once it returns True and
+                the polls in flight have finished
+        """
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="livecounts-scheduler") as executor:
+            while not should_stop():
+                with self._lock:
+                    busy = self._in_flight >= self.workers
+                    item = None if busy else self.__take_due()
+                    if item is None and self._in_flight:
+                        # A finishing poll frees a worker and may bring its item due before the next one.
+                        self._polled.wait(self.max_interval if busy else self.__delay())
+                        continue
+                if item is not None:
+                    executor.submit(self.__poll_and_report, item, callback)
+                    continue
+                delay = self.__delay()
+                if delay > 0:
+                    self._sleep(delay)
+
+    def __delay(self) -> float:
+        wakeup = self.next_wakeup()
+        return self.max_interval if wakeup is None else min(max(wakeup - self._clock(), 0.0), self.max_interval)
+
+    def __take_due(self) -> TrackedItem | None:
+        now = self._clock()
+        item = self.__peek()
+        if item is None or item.next_due_at > now or self._next_slot_at > now:
+            return None
+        heapq.heappop(self._queue)
+        self._next_slot_at = max(now, self._next_slot_at) + 1.0 / self.budget_per_second
+        self._in_flight += 1
+        return item
+
+    def __poll_and_report(self, item: TrackedItem, callback: Callable) -> None:
+        callback(*self.__poll(item))
+
+    def __poll(self, item: TrackedItem) -> tuple[TrackedItem, Any, Exception | None]:
+        result, value, error = None, None, None
+        try:
+            result = item.fetch(item.query)
+            value = getattr(result, item.metric)
+            if value is None:
+                raise ValueError(f"{item.metric} missing from the result of {item.query}")
+        except Exception as e:
+            error = e
+
+        with self._lock:
+            return self.__complete(item, result, value, error)
+
+    def __complete(
+        self, item: TrackedItem, result: Any, value: Any, error: Exception | None
+    ) -> tuple[TrackedItem, Any, Exception | None]:
+        polled_at = self._clock()
+        try:
+            if error is None:
+                try:
+                    self.__observe(item, value, polled_at)
+                except Exception as e:
+                    error = e
+            if error is not None:
+                result = None
+                item.errors += 1
+                item.interval = self.__clamp(item.interval * self.backoff)
+            item.polls += 1
+            item.next_due_at = polled_at + item.interval
+        finally:
+            # Whatever failed, the item goes back on the heap, or it would never be polled again.
+            self._in_flight -= 1
+            if self._items.get(item.key) is item:
+                self.__push(item)
+            self._polled.notify_all()
+        return item, result, error
+
+    def __observe(self, item: TrackedItem, value: Any, polled_at: float) -> None:
+        if item.last_value is not None and polled_at > item.last_polled_at:
+            rate = abs(value - item.last_value) / (polled_at - item.last_polled_at)
+            item.rate = rate if item.rate is None else self.smoothing * rate + (1 - self.smoothing) * item.rate
+            if value == item.last_value:
+                item.interval = self.__clamp(item.interval * self.backoff)
+            else:
+                item.interval = self.__clamp(self.target_change / item.rate)
+        item.last_value = value
+        item.last_polled_at = polled_at
+
+    def __clamp(self, interval: float) -> float:
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def __push(self, item: TrackedItem) -> None:
+        item.queue_sequence = next(self._sequence)
+        heapq.heappush(self._queue, (item.next_due_at, item.queue_sequence, item.key))
+
+    def __peek(self) -> TrackedItem | None:
+        while self._queue:
+            _, sequence, key = self._queue[0]
+            item = self._items.get(key)
+            if item is not None and item.queue_sequence == sequence:
+                return item
+            heapq.heappop(self._queue)
+        return None
@@ -0,0 +1,217 @@
+import asyncio
+import json
+import time
+from typing import Any, Callable
+from urllib.parse import parse_qs, urlsplit
+
+from unofficial_livecounts_api import agents
+
+TopicKey = tuple[str, str, str]
+
+
+def fetch_from_agents(platform: str, kind: str, query: str) -> Any:
+    return agents.resolve(platform, kind)(query)
+
+
+class Subscription:
+    def __init__(self, keys: list[TopicKey], max_pending: int):
+        self.keys = keys
+        self.queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=max_pending)
+
+    def publish(self, event: dict) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> dict:
+        return await self.queue.get()
+
+
+class _Topic:
+    def __init__(self, key: TopicKey):
+        self.key = key
+        self.subscriptions: set[Subscription] = set()
+        self.last_event: dict | None = None
+        self.task: asyncio.Task | None = None
+        self.polls = 0
+
+
+class FanoutHub:
+    """
+    Share one upstream poller per subscribed ID between any number of subscribers.
+
+    A topic is a ``(platform, kind, query)`` triple, e.g. ``("tiktok", "video-metrics", "7324489913931613189")``.
+    The first subscription to a topic starts its polling task, every poll result is pushed to all subscriptions,
+    and the task is cancelled when the last subscription leaves. Late subscribers receive the latest result
+    immediately. Slow subscribers lose their oldest pending events instead of holding back the others.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str, str, str], Any] = fetch_from_agents,
+        interval: float = 10.0,
+        max_pending: int = 100,
+    ):
+        """
+        Args:
+            fetch (Callable[[str, str, str], Any]): Blocking upstream call, run in the default executor,
+                by default the agent method resolved by ``agents.resolve``
+            interval (float): Seconds between polls of one topic
+            max_pending (int): Events buffered per subscription
+        """
+        self.fetch = fetch
+        self.interval = interval
+        self.max_pending = max_pending
+        self._topics: dict[TopicKey, _Topic] = {}
+
+    def subscribe(self, keys: list[TopicKey]) -> Subscription:
+        subscription = Subscription(keys, self.max_pending)
+        for key in keys:
+            topic = self._topics.get(key)
+            if topic is None:
+                topic = self._topics[key] = _Topic(key)
+                topic.task = asyncio.get_running_loop().create_task(self.__poll(topic))
+            topic.subscriptions.add(subscription)
+            if topic.last_event is not None:
+                subscription.publish(topic.last_event)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        for key in subscription.keys:
+            topic = self._topics.get(key)
+            if topic is None:
+                continue
+            topic.subscriptions.discard(subscription)
+            if not topic.subscriptions:
+                topic.task.cancel()
+                del self._topics[key]
+
+    async def close(self) -> None:
+        tasks = [topic.task for topic in self._topics.values()]
+        self._topics.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "topics": len(self._topics),
+            "subscriptions": len({s for topic in self._topics.values() for s in topic.subscriptions}),
+            "polls": sum(topic.polls for topic in self._topics.values()),
+        }
+
+    async def __poll(self, topic: _Topic) -> None:
+        loop = asyncio.get_running_loop()
+        platform, kind, query = topic.key
+        while True:
+            event = {"platform": platform, "kind": kind, "query": query, "polled_at": time.time()}
+            try:
+                result = await loop.run_in_executor(None, self.fetch, platform, kind, query)
+                event["result"] = agents.to_dict(result)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                event["error"] = str(e)
+            topic.polls += 1
+            topic.last_event = event
+            for subscription in list(topic.subscriptions):
+                subscription.publish(event)
+            await asyncio.sleep(self.interval)
+
+
+class LivecountsServer:
+    """
+    Server-Sent Events front end of a ``FanoutHub``.
+
+    Endpoints:
+        ``GET /subscribe?platform=tiktok&kind=user-metrics&id=123&id=456`` streams ``count`` events (or
+        ``error`` events when the upstream call failed) for every given ID as ``text/event-stream``.
+        ``GET /health`` returns the hub statistics as JSON.
+    """
+
+    def __init__(self, hub: FanoutHub, host: str = "127.0.0.1", port: int = 8765, heartbeat: float = 15.0):
+        self.hub = hub
+        self.host = host
+        self.port = port
+        self.heartbeat = heartbeat
+        self._server: asyncio.Server | None = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self.__handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        await self.hub.close()
+
+    async def __handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            while (await reader.readline()).strip():
+                pass
+            if len(request_line) < 2 or request_line[0] != "GET":
+                return await self.__respond(writer, 405, {"error": "only GET is supported"})
+            url = urlsplit(request_line[1])
+            if url.path == "/health":
+                return await self.__respond(writer, 200, self.hub.stats())
+            if url.path != "/subscribe":
+                return await self.__respond(writer, 404, {"error": f"unknown path: {url.path}"})
+            params = parse_qs(url.query)
+            platform, kind, ids = params.get("platform", [""])[0], params.get("kind", [""])[0], params.get("id", [])
+            try:
+                agents.resolve(platform, kind)
+            except ValueError as e:
+                return await self.__respond(writer, 400, {"error": str(e)})
+            if not ids:
+                return await self.__respond(writer, 400, {"error": "at least one id is required"})
+            await self.__stream(writer, [(platform, kind, query) for query in dict.fromkeys(ids)])
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def __stream(self, writer: asyncio.StreamWriter, keys: list[TopicKey]) -> None:
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Cache-Control: no-cache\r\n"
+            b"Connection: keep-alive\r\n\r\n"
+        )
+        await writer.drain()
+        subscription = self.hub.subscribe(keys)
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), self.heartbeat)
+                except asyncio.TimeoutError:
+                    writer.write(b": ping\n\n")
+                else:
+                    name = "error" if "error" in event else "count"
+                    writer.write(f"event: {name}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n".encode("utf-8"))
+                await writer.drain()
+        finally:
+            self.hub.unsubscribe(subscription)
+
+    @staticmethod
+    async def __respond(writer: asyncio.StreamWriter, status: int, body: dict) -> None:
+        reasons = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+        payload = json.dumps(body).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status} {reasons[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: close\r\n\r\n".encode("latin-1")
+            + payload
+        )
+        await writer.drain()
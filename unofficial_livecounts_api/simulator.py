@@ -0,0 +1,374 @@
+import json
+import math
+import random
+import socket
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Iterable
+from urllib.parse import unquote, urlsplit
+
+from unofficial_livecounts_api import agents
+from unofficial_livecounts_api.client import Endpoints, LivecountsClient
+
+Latency = Callable[[random.Random], float]
+
+FAULTS = ("ok", "not_success", "truncated", "malformed", "reset", 429, 500, 502, 503)
+
+
+def constant(seconds: float) -> Latency:
+    return lambda rng: seconds
+
+
+def uniform(low: float, high: float) -> Latency:
+    return lambda rng: rng.uniform(low, high)
+
+
+def lognormal(median: float, sigma: float) -> Latency:
+    """
+    Returns:
+        Latency: Long-tailed latencies around ``median`` seconds, the usual shape of upstream response times
+    """
+    return lambda rng: rng.lognormvariate(math.log(median), sigma)
+
+
+class FaultProfile:
+    """
+    How the simulated upstream misbehaves.
+
+    Every request first waits for a latency drawn from ``latency``. Its outcome is the fault of the first
+    ``schedule`` window covering the time since the simulator started, or else a fault drawn from ``rates``.
+    Faults are ``ok``, an HTTP status such as ``429`` or ``503``, ``not_success`` (a ``"success": false`` body),
+    ``truncated`` (the connection closes halfway through the body), ``malformed`` (invalid JSON) and ``reset``
+    (the connection is reset before any response).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        latency: Latency = constant(0.0),
+        rates: dict[str | int, float] = None,
+        schedule: Iterable[tuple[float, float, str | int]] = (),
+    ):
+        """
+        Args:
+            name (str): Label of the profile in load reports
+            latency (Latency): Draws the delay of one response, e.g. ``lognormal(0.05, 0.5)``
+            rates (dict[str | int, float]): Probability of each fault per request outside scheduled windows
+            schedule (Iterable[tuple[float, float, str | int]]): ``(start, end, fault)`` windows in seconds since
+                the simulator started, e.g. ``(10, 15, 429)`` for a five second burst of rate limiting
+        """
+        rates = rates or {}
+        unknown = [fault for fault in [*rates, *(fault for _, _, fault in schedule)] if fault not in FAULTS]
+        if unknown:
+            raise ValueError(f"unknown faults: {unknown}, expected some of {FAULTS}")
+        if sum(rates.values()) > 1:
+            raise ValueError("fault rates must not add up to more than 1")
+        self.name = name
+        self.latency = latency
+        self.rates = rates
+        self.schedule = list(schedule)
+
+    def choose(self, elapsed: float, rng: random.Random) -> str | int:
+        for start, end, fault in self.schedule:
+            if start <= elapsed < end:
+                return fault
+        draw = rng.random()
+        for fault, rate in self.rates.items():
+            if draw < rate:
+                return fault
+            draw -= rate
+        return "ok"
+
+
+PROFILES = {
+    "healthy": FaultProfile("healthy", latency=lognormal(0.02, 0.3)),
+    "slow-tail": FaultProfile("slow-tail", latency=lognormal(0.05, 1.0)),
+    "rate-limited": FaultProfile("rate-limited", latency=lognormal(0.02, 0.3), schedule=[(0.5, 1.5, 429)]),
+    "flaky": FaultProfile(
+        "flaky",
+        latency=lognormal(0.02, 0.5),
+        rates={500: 0.05, 502: 0.02, "not_success": 0.03, "truncated": 0.02, "malformed": 0.02, "reset": 0.02},
+    ),
+}
+
+
+class _SimulatorHandler(BaseHTTPRequestHandler):
+    server: "_SimulatorServer"
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        simulator = self.server.simulator
+        name, query = simulator.route(urlsplit(self.path).path)
+        if name is None:
+            return self.__respond(404, b'{"success": false}')
+        fault, delay = simulator.next_fault()
+        time.sleep(delay)
+        if fault == "reset":
+            self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+            self.close_connection = True
+            self.connection.close()
+            return
+        if isinstance(fault, int):
+            return self.__respond(fault, b'{"success": false}')
+        body = json.dumps(simulator.body(name, query, success=fault != "not_success")).encode("utf-8")
+        if fault == "malformed":
+            body = body[:-1] + b",}"
+        if fault == "truncated":
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body[: len(body) // 2])
+            self.close_connection = True
+            return
+        self.__respond(200, body)
+
+    def __respond(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _SimulatorServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], simulator: "UpstreamSimulator"):
+        super().__init__(address, _SimulatorHandler)
+        self.simulator = simulator
+
+    def handle_error(self, request, client_address):
+        pass
+
+
+class UpstreamSimulator:
+    """
+    Local stand-in for the livecounts endpoints of all four agents, injecting faults from a ``FaultProfile``.
+
+    Search endpoints return one matching user, channel or video per query and stats endpoints return counters
+    that grow with every request, in the response shapes the agents parse.
+    """
+
+    def __init__(self, profile: FaultProfile = None, host: str = "127.0.0.1", port: int = 0, seed: int = None):
+        self.profile = profile or FaultProfile("healthy")
+        self.seed = seed
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = _SimulatorServer((host, port), self)
+        self._thread: threading.Thread | None = None
+        self._started = time.monotonic()
+        self._requests = 0
+        self.faults: dict[str, int] = {}
+        self.origin = f"http://{host}:{self._server.server_port}"
+        self.endpoints = Endpoints.rebased(self.origin)
+        self._routes = {urlsplit(url).path: name for name, url in self.endpoints.items()}
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.close()
+
+    def start(self) -> "UpstreamSimulator":
+        self._started = time.monotonic()
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, name="livecounts-simulator", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def use(self, profile: FaultProfile) -> None:
+        """
+        Switch to another fault profile; its schedule starts over and the fault counts are reset.
+        """
+        with self._lock:
+            self.profile = profile
+            self._rng = random.Random(self.seed)
+            self._started = time.monotonic()
+            self.faults = {}
+
+    def client(self, **kwargs) -> LivecountsClient:
+        """
+        Returns:
+            LivecountsClient: A client calling the simulator, configured by ``kwargs``
+        """
+        return LivecountsClient(endpoints=self.endpoints, **kwargs)
+
+    def route(self, path: str) -> tuple[str | None, str]:
+        endpoint, _, query = path.rpartition("/")
+        return self._routes.get(endpoint), unquote(query)
+
+    def next_fault(self) -> tuple[str | int, float]:
+        with self._lock:
+            self._requests += 1
+            fault = self.profile.choose(time.monotonic() - self._started, self._rng)
+            delay = max(self.profile.latency(self._rng), 0.0)
+            self.faults[str(fault)] = self.faults.get(str(fault), 0) + 1
+        return fault, delay
+
+    def body(self, name: str, query: str, success: bool = True) -> dict:
+        with self._lock:
+            count = self._requests
+        if name.endswith("_STATS_API"):
+            return {
+                "success": success,
+                "followerCount": 1_000_000 + count,
+                "likeCount": 5_000_000 + 3 * count,
+                "followingCount": 100,
+                "videoCount": 42,
+                "viewCount": 9_000_000 + 7 * count,
+                "commentCount": 2_000 + count,
+                "shareCount": 500,
+                "bottomOdos": [9_000_000 + 7 * count, 42, 1_000_000],
+            }
+        user = {
+            "userId": f"{query}-id",
+            "id": query,
+            "username": query.title(),
+            "avatar": f"{self.origin}/avatar/{query}.jpg",
+            "verified": False,
+        }
+        if name == "TIKTOK_VIDEO_SEARCH_API":
+            return {"success": success, "title": f"video {query}", "cover": f"{self.origin}/cover.jpg", "author": user}
+        return {"success": success, "userData": [user]}
+
+
+class LoadReport:
+    def __init__(self, name: str, elapsed: float, latencies: list[float], errors: dict[str, int], faults: dict):
+        self.name = name
+        self.elapsed = elapsed
+        self.latencies = sorted(latencies)
+        self.errors = errors
+        self.faults = faults
+
+    def __str__(self):
+        return (
+            f"{self.name:<16} {self.requests:>8} {self.successes:>8} {self.goodput:>10.1f}/s "
+            f"{self.percentile(50) * 1000:>8.1f}ms {self.percentile(99) * 1000:>8.1f}ms"
+        )
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies) + sum(self.errors.values())
+
+    @property
+    def successes(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def goodput(self) -> float:
+        """
+        Returns:
+            float: Successful calls per second
+        """
+        return self.successes / self.elapsed if self.elapsed else 0.0
+
+    def percentile(self, percentile: float) -> float:
+        """
+        Returns:
+            float: Latency of successful calls at the given percentile, in seconds, or NaN without any success
+        """
+        if not self.latencies:
+            return math.nan
+        return self.latencies[max(math.ceil(len(self.latencies) * percentile / 100) - 1, 0)]
+
+    def __dict__(self):
+        return {
+            "profile": self.name,
+            "requests": self.requests,
+            "successes": self.successes,
+            "goodput": self.goodput,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "errors": self.errors,
+            "faults": self.faults,
+        }
+
+
+def run_load(
+    simulator: UpstreamSimulator,
+    platform: str,
+    kind: str,
+    queries: Iterable[str],
+    concurrency: int = 8,
+    client: LivecountsClient = None,
+) -> LoadReport:
+    """
+    Call an agent method for every query against the simulator and measure what the caller gets.
+
+    Args:
+        simulator (UpstreamSimulator): Running simulator; its current profile names the report
+        platform (str): One of ``tiktok``, ``youtube``, ``twitter`` or ``twitch``
+        kind (str): Kind of call as accepted by ``agents.resolve``, e.g. ``user-metrics``
+        queries (Iterable[str]): Queries sent, one call each
+        concurrency (int): Calls in flight
+        client (LivecountsClient): Client to measure, by default a new client of the simulator
+
+    Returns:
+        LoadReport: Goodput, latencies of successful calls, errors by message prefix and the injected faults
+    """
+    own_client = client is None
+    client = client or simulator.client(pool_maxsize=concurrency)
+    fetch = agents.resolve(platform, kind, client)
+    latencies: list[float] = []
+    errors: dict[str, int] = {}
+    lock = threading.Lock()
+
+    def call(query: str) -> None:
+        started = time.perf_counter()
+        try:
+            fetch(query)
+        except Exception as e:
+            reason = str(e).split(",")[0]
+            with lock:
+                errors[reason] = errors.get(reason, 0) + 1
+            return
+        with lock:
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(call, queries))
+    elapsed = time.perf_counter() - started
+    if own_client:
+        client.close()
+    return LoadReport(simulator.profile.name, elapsed, latencies, errors, dict(simulator.faults))
+
+
+def run_profiles(
+    profiles: Iterable[FaultProfile],
+    platform: str = "tiktok",
+    kind: str = "user-metrics",
+    requests: int = 1000,
+    concurrency: int = 8,
+    seed: int = None,
+    **client_kwargs: Any,
+) -> list[LoadReport]:
+    """
+    Run the same load under each fault profile, to compare how goodput and latency degrade.
+
+    Returns:
+        list[LoadReport]: One report per profile, in order
+    """
+    reports = []
+    with UpstreamSimulator(seed=seed) as simulator:
+        for profile in profiles:
+            simulator.use(profile)
+            client = simulator.client(pool_maxsize=concurrency, **client_kwargs)
+            queries = (str(index) for index in range(requests))
+            reports.append(run_load(simulator, platform, kind, queries, concurrency, client))
+            client.close()
+    return reports
@@ -0,0 +1,337 @@
+import os
+import struct
+import time
+from typing import Any, BinaryIO, Iterable, Iterator, Sequence
+
+from unofficial_livecounts_api import agents
+
+# Layout of a snapshot log:
+#   header  MAGIC, VERSION, varint column count, per column a varint length and the UTF-8 name
+#   blocks  per block a varint payload length and the payload: varint ID length, the UTF-8 ID, varint row count,
+#           then the timestamp column (milliseconds) and every counter column, each delta-of-delta encoded
+#   index   varint block count, per block: ID, offset, row count, first and last timestamp
+#   footer  little-endian uint64 offset of the index followed by INDEX_MAGIC
+# A log that was not closed has no index and footer; it is rebuilt from the blocks when the log is opened.
+MAGIC = b"LCSL"
+INDEX_MAGIC = b"LCSI"
+VERSION = 1
+_FOOTER = struct.Struct("<Q4s")
+
+
+class _BlockInfo:
+    def __init__(self, key: str, offset: int, rows: int, first_at: int, last_at: int):
+        self.key = key
+        self.offset = offset
+        self.rows = rows
+        self.first_at = first_at
+        self.last_at = last_at
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, position: int) -> tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+def _write_signed(out: bytearray, value: int) -> None:
+    _write_varint(out, value << 1 if value >= 0 else (-value << 1) - 1)
+
+
+def _read_signed(data: bytes, position: int) -> tuple[int, int]:
+    value, position = _read_varint(data, position)
+    return (value >> 1) ^ -(value & 1), position
+
+
+def _write_text(out: bytearray, text: str) -> None:
+    encoded = text.encode("utf-8")
+    _write_varint(out, len(encoded))
+    out += encoded
+
+
+def _read_text(data: bytes, position: int) -> tuple[str, int]:
+    length, position = _read_varint(data, position)
+    return data[position : position + length].decode("utf-8"), position + length
+
+
+def _encode_column(out: bytearray, values: Sequence[int]) -> None:
+    previous = previous_delta = 0
+    for value in values:
+        delta = value - previous
+        _write_signed(out, delta - previous_delta)
+        previous, previous_delta = value, delta
+
+
+def _decode_column(data: bytes, position: int, rows: int) -> tuple[list[int], int]:
+    values = []
+    value = delta = 0
+    for _ in range(rows):
+        delta_of_delta, position = _read_signed(data, position)
+        delta += delta_of_delta
+        value += delta
+        values.append(value)
+    return values, position
+
+
+def _read_header(file: BinaryIO) -> tuple[list[str], int]:
+    data = file.read(4096)
+    if data[:4] != MAGIC or data[4] != VERSION:
+        raise ValueError(f"not a snapshot log: {file.name}")
+    position = 5
+    while True:
+        try:
+            count, position = _read_varint(data, position)
+            columns = []
+            for _ in range(count):
+                name, position = _read_text(data, position)
+                columns.append(name)
+            return columns, position
+        except IndexError:
+            more = file.read(4096)
+            if not more:
+                raise ValueError(f"truncated snapshot log header: {file.name}")
+            data += more
+            position = 5
+
+
+def _read_index(file: BinaryIO, blocks_start: int) -> tuple[list[_BlockInfo], int]:
+    """
+    Returns:
+        tuple[list[_BlockInfo], int]: The blocks of the log and the offset where the next block goes,
+        read from the index or, if the log was not closed, rebuilt by scanning the blocks
+    """
+    size = file.seek(0, os.SEEK_END)
+    if size - blocks_start >= _FOOTER.size:
+        file.seek(size - _FOOTER.size)
+        index_offset, magic = _FOOTER.unpack(file.read(_FOOTER.size))
+        if magic == INDEX_MAGIC and blocks_start <= index_offset < size:
+            file.seek(index_offset)
+            data = file.read(size - _FOOTER.size - index_offset)
+            count, position = _read_varint(data, 0)
+            blocks = []
+            for _ in range(count):
+                key, position = _read_text(data, position)
+                offset, position = _read_varint(data, position)
+                rows, position = _read_varint(data, position)
+                first_at, position = _read_signed(data, position)
+                last_at, position = _read_signed(data, position)
+                blocks.append(_BlockInfo(key, offset, rows, first_at, last_at))
+            return blocks, index_offset
+
+    file.seek(blocks_start)
+    data = file.read()
+    blocks, position = [], 0
+    while position < len(data):
+        try:
+            length, start = _read_varint(data, position)
+            if start + length > len(data):
+                break
+            key, timestamps, _ = _decode_block(data[start : start + length], 0)
+        except (IndexError, UnicodeDecodeError):
+            break
+        blocks.append(_BlockInfo(key, blocks_start + position, len(timestamps), timestamps[0], timestamps[-1]))
+        position = start + length
+    return blocks, blocks_start + position
+
+
+def _decode_block(payload: bytes, columns: int) -> tuple[str, list[int], list[list[int]]]:
+    key, position = _read_text(payload, 0)
+    rows, position = _read_varint(payload, position)
+    timestamps, position = _decode_column(payload, position, rows)
+    values = []
+    for _ in range(columns):
+        column, position = _decode_column(payload, position, rows)
+        values.append(column)
+    return key, timestamps, values
+
+
+class SnapshotLogWriter:
+    """
+    Append count snapshots to a compact binary log.
+
+    Rows are buffered per ID and written as one block per ``block_size`` rows of that ID. Timestamps (in
+    milliseconds) and counters are stored as zigzag varint deltas of deltas, so a counter that did not move, or
+    moved by the same amount as in the previous poll, takes a single byte per snapshot. Appending to an existing
+    log continues it.
+    """
+
+    def __init__(self, path: str | os.PathLike, columns: Sequence[str], block_size: int = 256):
+        """
+        Args:
+            path (str | os.PathLike): Log file, created if missing
+            columns (Sequence[str]): Counter names, e.g. ``("follower_count", "like_count")``; must match the
+                columns of an existing log
+            block_size (int): Rows of one ID collected before they are written as a block
+        """
+        self.path = path
+        self.columns = tuple(columns)
+        self.block_size = block_size
+        self._pending: dict[str, tuple[list[int], list[list[int]]]] = {}
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            self._file = open(path, "r+b")
+            existing, blocks_start = _read_header(self._file)
+            if tuple(existing) != self.columns:
+                self._file.close()
+                raise ValueError(f"snapshot log columns are {existing}, not {list(self.columns)}")
+            self._blocks, end = _read_index(self._file, blocks_start)
+            self._file.truncate(end)
+            self._file.seek(end)
+        else:
+            self._file = open(path, "w+b")
+            header = bytearray(MAGIC)
+            header.append(VERSION)
+            _write_varint(header, len(self.columns))
+            for name in self.columns:
+                _write_text(header, name)
+            self._file.write(header)
+            self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def append(self, key: str, values: Sequence[int], at: float = None) -> None:
+        """
+        Args:
+            key (str): ID the snapshot belongs to
+            values (Sequence[int]): One counter per column, in column order; None is stored as 0
+            at (float): Unix time of the snapshot, by default now
+        """
+        if len(values) != len(self.columns):
+            raise ValueError(f"expected {len(self.columns)} values, got {len(values)}")
+        timestamps, columns = self._pending.setdefault(key, ([], [[] for _ in self.columns]))
+        timestamps.append(round((time.time() if at is None else at) * 1000))
+        for column, value in zip(columns, values):
+            column.append(int(value or 0))
+        if len(timestamps) >= self.block_size:
+            self.__write_block(key)
+
+    def append_count(self, count: Any, at: float = None) -> None:
+        """
+        Args:
+            count (Any): Count object returned by a ``fetch_*_metrics`` call, read by column name
+            at (float): Unix time of the snapshot, by default now
+        """
+        self.append(agents.entity_id(count), [getattr(count, name, None) for name in self.columns], at)
+
+    def flush(self) -> None:
+        """
+        Write the rows buffered for every ID as blocks, making them readable.
+        """
+        for key in list(self._pending):
+            self.__write_block(key)
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self.flush()
+        index = bytearray()
+        _write_varint(index, len(self._blocks))
+        for block in self._blocks:
+            _write_text(index, block.key)
+            _write_varint(index, block.offset)
+            _write_varint(index, block.rows)
+            _write_signed(index, block.first_at)
+            _write_signed(index, block.last_at)
+        index_offset = self._file.tell()
+        self._file.write(index + _FOOTER.pack(index_offset, INDEX_MAGIC))
+        self._file.close()
+
+    def __write_block(self, key: str) -> None:
+        timestamps, columns = self._pending.pop(key)
+        payload = bytearray()
+        _write_text(payload, key)
+        _write_varint(payload, len(timestamps))
+        _encode_column(payload, timestamps)
+        for column in columns:
+            _encode_column(payload, column)
+        block = bytearray()
+        _write_varint(block, len(payload))
+        offset = self._file.tell()
+        self._file.write(block + payload)
+        self._blocks.append(_BlockInfo(key, offset, len(timestamps), timestamps[0], timestamps[-1]))
+
+
+class SnapshotLogReader:
+    """
+    Decode a snapshot log written by ``SnapshotLogWriter``, either all of it in write order or the blocks of
+    one ID, located through the index.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = path
+        with open(path, "rb") as file:
+            columns, self._blocks_start = _read_header(file)
+            self._blocks, self._end = _read_index(file, self._blocks_start)
+        self.columns = tuple(columns)
+
+    def keys(self) -> list[str]:
+        return list(dict.fromkeys(block.key for block in self._blocks))
+
+    def __len__(self):
+        return sum(block.rows for block in self._blocks)
+
+    def read(self, key: str, since: float = None, until: float = None) -> Iterator[tuple[float, tuple[int, ...]]]:
+        """
+        Args:
+            key (str): ID to read
+            since (float): If given, skip snapshots taken before this Unix time
+            until (float): If given, skip snapshots taken after this Unix time
+
+        Returns:
+            Iterator[tuple[float, tuple[int, ...]]]: Unix time and counters of every snapshot of the ID, oldest first
+        """
+        low = float("-inf") if since is None else since * 1000
+        high = float("inf") if until is None else until * 1000
+        blocks = [b for b in self._blocks if b.key == key and b.last_at >= low and b.first_at <= high]
+        with open(self.path, "rb") as file:
+            for block in blocks:
+                _, timestamps, values = self.__read_block(file, block.offset)
+                for at, row in zip(timestamps, zip(*values)):
+                    if low <= at <= high:
+                        yield at / 1000, row
+
+    def scan(self) -> Iterator[tuple[str, float, tuple[int, ...]]]:
+        """
+        Returns:
+            Iterator[tuple[str, float, tuple[int, ...]]]: ID, Unix time and counters of every snapshot, block by block
+        """
+        with open(self.path, "rb") as file:
+            file.seek(self._blocks_start)
+            data = file.read(self._end - self._blocks_start)
+        position = 0
+        while position < len(data):
+            length, position = _read_varint(data, position)
+            key, timestamps, values = _decode_block(data[position : position + length], len(self.columns))
+            position += length
+            for at, row in zip(timestamps, zip(*values)):
+                yield key, at / 1000, row
+
+    def to_dicts(self, key: str) -> Iterable[dict]:
+        """
+        Returns:
+            Iterable[dict]: The snapshots of the ID as ``{"at": ..., <column>: ...}`` dicts, oldest first
+        """
+        for at, row in self.read(key):
+            yield {"at": at, **dict(zip(self.columns, row))}
+
+    def __read_block(self, file: BinaryIO, offset: int) -> tuple[str, list[int], list[list[int]]]:
+        file.seek(offset)
+        head = file.read(10)
+        length, position = _read_varint(head, 0)
+        file.seek(offset + position)
+        return _decode_block(file.read(length), len(self.columns))
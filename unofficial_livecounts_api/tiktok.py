@@ -1,10 +1,12 @@
 import re
 import warnings
+from typing import Iterable
 
 import validators
 
-from unofficial_livecounts_api import env
-from unofficial_livecounts_api.utils import send_request
+from unofficial_livecounts_api import profiling
+from unofficial_livecounts_api.client import BaseAgent, SearchResult, agent_method
+from unofficial_livecounts_api.entities import identity_cached
 
 
 class TiktokUser:
@@ -128,10 +130,11 @@ class TikTokVideoCount:
         }
 
 
-class TiktokAgent:
+class TiktokAgent(BaseAgent):
 
-    @staticmethod
-    def find_user(query: str) -> list[TiktokUser]:
+    @agent_method
+    @identity_cached
+    def find_user(self, query: str) -> list[TiktokUser]:
         """
         Search for TikTok users based on a username query.
 
@@ -146,7 +149,7 @@ class TiktokAgent:
                 - verified (bool): Account verification status
                 - thumbnail (str): URL to the user's profile picture
         """
-        raw_users = send_request(f"{env.TIKTOK_USER_SEARCH_API}/{query}")
+        raw_users = self.send_request(f"{self.endpoints.TIKTOK_USER_SEARCH_API}/{query}")
         return [
             TiktokUser(
                 user_id=item.get("userId", ""),
@@ -158,8 +161,24 @@ class TiktokAgent:
             for item in raw_users.get("userData", [])
         ]
 
-    @staticmethod
-    def fetch_user_metrics(query: str) -> TiktokUserCount:
+    @agent_method
+    def find_user_many(self, queries: Iterable[str], concurrency: int = 8) -> list[SearchResult]:
+        """
+        Run ``find_user`` for many queries concurrently, searching duplicates only once.
+
+        Args:
+            queries (Iterable[str]): Usernames to search for on TikTok, where case, surrounding whitespace and a
+                leading ``@`` are ignored
+            concurrency (int): Number of searches in flight
+
+        Returns:
+            list[SearchResult]: One result per given query, in order, holding what ``find_user`` returned for it
+            or the error it raised
+        """
+        return self._find_many(self.find_user, queries, concurrency)
+
+    @agent_method
+    def fetch_user_metrics(self, query: str) -> TiktokUserCount:
         """
         Fetch engagement metrics and statistics for a TikTok user.
 
@@ -174,7 +193,7 @@ class TiktokAgent:
                 - following_count (int): Number of accounts this user follows
                 - video_count (int): Total number of videos posted
         """
-        metrics = send_request(f"{env.TIKTOK_USER_STATS_API}/{query}")
+        metrics = self.send_request(f"{self.endpoints.TIKTOK_USER_STATS_API}/{query}")
         return TiktokUserCount(
             user_id=query,
             follower_count=metrics.get("followerCount", 0),
@@ -183,8 +202,9 @@ class TiktokAgent:
             video_count=metrics.get("videoCount", 0),
         )
 
-    @staticmethod
-    def find_video(query: str) -> TiktokVideo:
+    @agent_method
+    @identity_cached
+    def find_video(self, query: str) -> TiktokVideo:
         """
         Find a TikTok video by its URL or video ID.
 
@@ -199,12 +219,10 @@ class TiktokAgent:
                 - user (TiktokUser | None): Author's profile information,
                   or None if user data is unavailable
         """
-        if validators.url(query):
-            query = TiktokAgent.__extract_video_id_from_given_url(query)
-        return TiktokAgent.__find_video_by_id(query)
+        query = video_id_from_query(query)
+        return self.__find_video_by_id(query)
 
-    @staticmethod
-    def __find_video_by_id(video_id: str) -> TiktokVideo:
+    def __find_video_by_id(self, video_id: str) -> TiktokVideo:
         """
         Internal method to fetch video information using a video ID.
 
@@ -214,7 +232,7 @@ class TiktokAgent:
         Returns:
             TiktokVideo: Video information and associated user data
         """
-        video = send_request(url=f"{env.TIKTOK_VIDEO_SEARCH_API}/{video_id}")
+        video = self.send_request(url=f"{self.endpoints.TIKTOK_VIDEO_SEARCH_API}/{video_id}")
         user = video.get("author", {})
         return TiktokVideo(
             video_id=video_id,
@@ -232,28 +250,8 @@ class TiktokAgent:
             ),
         )
 
-    @staticmethod
-    def __extract_video_id_from_given_url(query) -> str | None:
-        """
-        Internal method to extract video ID from a TikTok URL.
-
-        Args:
-            query (str): Full TikTok video URL
-
-        Returns:
-            str | None: The extracted video ID or None if extraction fails
-
-        Note:
-            Issues a warning if video ID extraction fails
-        """
-        try:
-            return re.search(r"video/(\d+)", query)[1]
-        except Exception as e:
-            warnings.warn(f"failed to extract video_id from Tiktok Video URL: {e}")
-            return None
-
-    @staticmethod
-    def fetch_video_metrics(query: str) -> TikTokVideoCount:
+    @agent_method
+    def fetch_video_metrics(self, query: str) -> TikTokVideoCount:
         """
         Fetch engagement metrics for a TikTok video.
 
@@ -268,9 +266,8 @@ class TiktokAgent:
                 - share_count (int): Number of times the video was shared
                 - view_count (int): Number of video views
         """
-        if validators.url(query):
-            query = TiktokAgent.__extract_video_id_from_given_url(query)
-        metrics = send_request(f"{env.TIKTOK_VIDEO_STATS_API}/{query}")
+        query = video_id_from_query(query)
+        metrics = self.send_request(f"{self.endpoints.TIKTOK_VIDEO_STATS_API}/{query}")
         return TikTokVideoCount(
             video_id=query,
             like_count=metrics.get("likeCount", 0),
@@ -278,3 +275,35 @@ class TiktokAgent:
             share_count=metrics.get("shareCount", 0),
             view_count=metrics.get("viewCount", 0),
         )
+
+
+def video_id_from_query(query: str) -> str | None:
+    """
+    Returns:
+        str | None: The video ID of a TikTok video URL, the query itself if it is not a URL, or None if no video
+        ID can be extracted from the URL
+    """
+    with profiling.stage("validators.url"):
+        is_url = validators.url(query)
+    return _extract_video_id_from_given_url(query) if is_url else query
+
+
+def _extract_video_id_from_given_url(query) -> str | None:
+    """
+    Extract the video ID from a TikTok URL.
+
+    Args:
+        query (str): Full TikTok video URL
+
+    Returns:
+        str | None: The extracted video ID or None if extraction fails
+
+    Note:
+        Issues a warning if video ID extraction fails
+    """
+    try:
+        with profiling.stage("video_id_regex"):
+            return re.search(r"video/(\d+)", query)[1]
+    except Exception as e:
+        warnings.warn(f"failed to extract video_id from Tiktok Video URL: {e}")
+        return None
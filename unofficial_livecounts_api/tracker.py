@@ -0,0 +1,181 @@
+import json
+import os
+import sys
+import time
+from array import array
+from typing import Any, Iterable, Iterator, Sequence
+
+from unofficial_livecounts_api import agents
+from unofficial_livecounts_api.columnar import METRIC_COLUMNS
+
+MAGIC = b"LCTR1\n"
+
+
+def _intern(key: str) -> int | str:
+    """
+    Returns:
+        int | str: Numeric IDs, such as TikTok user and video IDs, as ints, which take about half the
+        memory of their strings, and any other ID as an interned string
+    """
+    if key.isascii() and key.isdigit() and (key == "0" or key[0] != "0"):
+        return int(key)
+    return sys.intern(key)
+
+
+class CountTracker:
+    """
+    The latest counters of many IDs in typed columns instead of one count object per ID.
+
+    Every ID is mapped once to a row; each counter is an ``array('q')`` column and the time of the last update
+    an ``array('d')`` column, so a tracked ID costs its key, a dict slot and 8 bytes per column. Lookups, updates
+    and change detection are O(1), and ``save``/``load`` write and read the columns as raw arrays.
+    """
+
+    def __init__(self, columns: Sequence[str]):
+        """
+        Args:
+            columns (Sequence[str]): Counter attributes tracked, e.g. ``("follower_count", "like_count")``
+        """
+        self.columns = tuple(columns)
+        self._rows: dict[int | str, int] = {}
+        self._keys: list[int | str] = []
+        self._values = [array("q") for _ in self.columns]
+        self._updated_at = array("d")
+
+    @classmethod
+    def for_metrics(cls, platform: str, kind: str) -> "CountTracker":
+        """
+        Returns:
+            CountTracker: A tracker of every counter of the metrics kind, e.g. ``("tiktok", "video-metrics")``
+        """
+        spec = METRIC_COLUMNS.get((platform, kind))
+        if spec is None:
+            raise ValueError(f"unsupported metrics: {platform} {kind}")
+        return cls(spec[1])
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key: str):
+        return _intern(key) in self._rows
+
+    def keys(self) -> Iterator[str]:
+        return (str(key) for key in self._keys)
+
+    def update(self, key: str, values: Sequence[int], at: float = None) -> tuple[str, ...]:
+        """
+        Args:
+            key (str): ID the counters belong to
+            values (Sequence[int]): One counter per column, in column order; None is stored as 0
+            at (float): Time of the counters, by default now
+
+        Returns:
+            tuple[str, ...]: The columns whose counter changed, every column for an ID seen for the first time
+
+        Raises:
+            ValueError: If there is not one counter per column
+            OverflowError: If a counter does not fit in 64 bits; the tracker is left unchanged
+        """
+        if len(values) != len(self.columns):
+            raise ValueError(f"expected {len(self.columns)} values, got {len(values)}")
+        # Convert every counter before storing any, so a bad one cannot leave the columns misaligned.
+        values = array("q", [int(value or 0) for value in values])
+        at = time.time() if at is None else at
+        key = _intern(key)
+        row = self._rows.get(key)
+        if row is None:
+            self._rows[key] = len(self._keys)
+            self._keys.append(key)
+            for column, value in zip(self._values, values):
+                column.append(value)
+            self._updated_at.append(at)
+            return self.columns
+        changed = []
+        for name, column, value in zip(self.columns, self._values, values):
+            if column[row] != value:
+                column[row] = value
+                changed.append(name)
+        self._updated_at[row] = at
+        return tuple(changed)
+
+    def update_count(self, count: Any, at: float = None) -> tuple[str, ...]:
+        """
+        Args:
+            count (Any): Count object returned by a ``fetch_*_metrics`` call, read by column name
+
+        Returns:
+            tuple[str, ...]: The columns whose counter changed, see ``update``
+        """
+        return self.update(agents.entity_id(count), [getattr(count, name, None) for name in self.columns], at)
+
+    def update_many(self, counts: Iterable[Any], at: float = None) -> dict[str, tuple[str, ...]]:
+        """
+        Returns:
+            dict[str, tuple[str, ...]]: The changed columns of every ID that changed
+        """
+        at = time.time() if at is None else at
+        changes = {}
+        for count in counts:
+            changed = self.update_count(count, at)
+            if changed:
+                changes[agents.entity_id(count)] = changed
+        return changes
+
+    def get(self, key: str) -> dict | None:
+        """
+        Returns:
+            dict | None: The counters of the ID by column name and ``updated_at``, or None if it is not tracked
+        """
+        row = self._rows.get(_intern(key))
+        if row is None:
+            return None
+        return {
+            **{name: column[row] for name, column in zip(self.columns, self._values)},
+            "updated_at": self._updated_at[row],
+        }
+
+    def value(self, key: str, column: str) -> int:
+        return self._values[self.columns.index(column)][self._rows[_intern(key)]]
+
+    def remove(self, key: str) -> None:
+        """
+        Stop tracking the ID; its row is filled with the last row, so removal is O(1) as well.
+        """
+        row = self._rows.pop(_intern(key))
+        last = self._keys.pop()
+        for column in [*self._values, self._updated_at]:
+            moved = column.pop()
+            if row < len(self._keys):
+                column[row] = moved
+        if row < len(self._keys):
+            self._keys[row] = last
+            self._rows[last] = row
+
+    def save(self, path: str | os.PathLike) -> None:
+        """
+        Write the tracker to a file: a JSON header, the IDs one per line, then every column as raw array bytes.
+        """
+        keys = "\n".join(map(str, self._keys)).encode("utf-8")
+        header = {"columns": list(self.columns), "rows": len(self._keys), "keys_bytes": len(keys)}
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as file:
+            file.write(MAGIC + json.dumps(header).encode("utf-8") + b"\n")
+            file.write(keys)
+            for column in [*self._values, self._updated_at]:
+                column.tofile(file)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> "CountTracker":
+        with open(path, "rb") as file:
+            if file.readline() != MAGIC:
+                raise ValueError(f"not a tracker snapshot: {path}")
+            header = json.loads(file.readline())
+            tracker = cls(header["columns"])
+            rows = header["rows"]
+            keys = file.read(header["keys_bytes"]).decode("utf-8").split("\n") if rows else []
+            tracker._keys = [_intern(key) for key in keys]
+            tracker._rows = {key: row for row, key in enumerate(tracker._keys)}
+            for column in [*tracker._values, tracker._updated_at]:
+                column.fromfile(file, rows)
+        return tracker
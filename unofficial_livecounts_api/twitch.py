@@ -1,5 +1,7 @@
-from unofficial_livecounts_api import env
-from unofficial_livecounts_api.utils import send_request
+from typing import Iterable
+
+from unofficial_livecounts_api.client import BaseAgent, SearchResult, agent_method
+from unofficial_livecounts_api.entities import identity_cached
 
 
 class TwitchUser:
@@ -39,10 +41,11 @@ class TwitchUserCount:
         return {"user_id": self.user_id, "follower_count": self.follower_count}
 
 
-class TwitchAgent:
+class TwitchAgent(BaseAgent):
 
-    @staticmethod
-    def find_user(query: str) -> list[TwitchUser]:
+    @agent_method
+    @identity_cached
+    def find_user(self, query: str) -> list[TwitchUser]:
         """
         Search for Twitch users by username and return a list of matching profiles.
 
@@ -58,7 +61,7 @@ class TwitchAgent:
         Note:
             Returns an empty list if no users are found matching the query
         """
-        raw_user = send_request(f"{env.TWITCH_USER_SEARCH_API}/{query}")
+        raw_user = self.send_request(f"{self.endpoints.TWITCH_USER_SEARCH_API}/{query}")
         return [
             TwitchUser(
                 user_id=item.get("userId", item.get("userid", "")),
@@ -69,8 +72,24 @@ class TwitchAgent:
             for item in raw_user.get("userData", [])
         ]
 
-    @staticmethod
-    def fetch_user_metrics(query: str) -> TwitchUserCount:
+    @agent_method
+    def find_user_many(self, queries: Iterable[str], concurrency: int = 8) -> list[SearchResult]:
+        """
+        Run ``find_user`` for many queries concurrently, searching duplicates only once.
+
+        Args:
+            queries (Iterable[str]): Usernames to search for on Twitch, where case, surrounding whitespace and a
+                leading ``@`` are ignored
+            concurrency (int): Number of searches in flight
+
+        Returns:
+            list[SearchResult]: One result per given query, in order, holding what ``find_user`` returned for it
+            or the error it raised
+        """
+        return self._find_many(self.find_user, queries, concurrency)
+
+    @agent_method
+    def fetch_user_metrics(self, query: str) -> TwitchUserCount:
         """
         Fetch follower metrics for a specific Twitch user.
 
@@ -82,7 +101,7 @@ class TwitchAgent:
                 - user_id (str): Username of the account
                 - follower_count (int): Number of followers for the channel
         """
-        metrics = send_request(f"{env.TWITCH_USER_STATS_API}/{query}")
+        metrics = self.send_request(f"{self.endpoints.TWITCH_USER_STATS_API}/{query}")
         return TwitchUserCount(
             user_id=query,
             follower_count=metrics.get("followerCount", 0),
@@ -1,5 +1,7 @@
-from unofficial_livecounts_api import env
-from unofficial_livecounts_api.utils import send_request
+from typing import Iterable
+
+from unofficial_livecounts_api.client import BaseAgent, SearchResult, agent_method
+from unofficial_livecounts_api.entities import identity_cached
 
 
 class TwitterUser:
@@ -50,10 +52,11 @@ class TwitterUserCount:
         }
 
 
-class TwitterAgent:
+class TwitterAgent(BaseAgent):
 
-    @staticmethod
-    def find_user(query: str) -> TwitterUser:
+    @agent_method
+    @identity_cached
+    def find_user(self, query: str) -> TwitterUser | None:
         """
         Find a Twitter user by their username.
 
@@ -61,9 +64,11 @@ class TwitterAgent:
             query (str): The username of the Twitter user to find.
 
         Returns:
-            TwitterUser
+            TwitterUser | None: The user, or None if no user matches the username
         """
-        users = send_request(f"{env.TWITTER_USER_SEARCH_API}/{query}").get("userData", [])
+        users = self.send_request(f"{self.endpoints.TWITTER_USER_SEARCH_API}/{query}").get("userData", [])
+        if not users:
+            return None
         return TwitterUser(
             user_id=users[0]["id"],
             display_name=users[0]["username"],
@@ -71,8 +76,24 @@ class TwitterAgent:
             verified=users[0]["verified"],
         )
 
-    @staticmethod
-    def fetch_user_metrics(query: str) -> TwitterUserCount:
+    @agent_method
+    def find_user_many(self, queries: Iterable[str], concurrency: int = 8) -> list[SearchResult]:
+        """
+        Run ``find_user`` for many queries concurrently, searching duplicates only once.
+
+        Args:
+            queries (Iterable[str]): Usernames to find on Twitter, where case, surrounding whitespace and a
+                leading ``@`` are ignored
+            concurrency (int): Number of searches in flight
+
+        Returns:
+            list[SearchResult]: One result per given query, in order, holding what ``find_user`` returned for it
+            or the error it raised
+        """
+        return self._find_many(self.find_user, queries, concurrency)
+
+    @agent_method
+    def fetch_user_metrics(self, query: str) -> TwitterUserCount:
         """
         Fetches the metrics of a Twitter user based on their username.
 
@@ -82,7 +103,7 @@ class TwitterAgent:
         Returns:
             TwitterUserCount: An instance of the TwitterUserCount class containing the metrics of the user.
         """
-        metrics = send_request(f"{env.TWITTER_USER_STATS_API}/{query}")
+        metrics = self.send_request(f"{self.endpoints.TWITTER_USER_STATS_API}/{query}")
         return TwitterUserCount(
             user_id=query,
             follower_count=metrics.get("followerCount", 0),
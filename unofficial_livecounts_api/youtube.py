@@ -1,5 +1,7 @@
-from unofficial_livecounts_api import env
-from unofficial_livecounts_api.utils import send_request
+from typing import Iterable
+
+from unofficial_livecounts_api.client import BaseAgent, SearchResult, agent_method
+from unofficial_livecounts_api.entities import identity_cached
 
 
 class YoutubeChannel:
@@ -96,10 +98,11 @@ class YoutubeVideoCount:
         }
 
 
-class YoutubeAgent:
+class YoutubeAgent(BaseAgent):
 
-    @staticmethod
-    def find_channel(query: str) -> list[YoutubeChannel]:
+    @agent_method
+    @identity_cached
+    def find_channel(self, query: str) -> list[YoutubeChannel]:
         """
         Search for YouTube channels based on a channel name query.
 
@@ -112,7 +115,7 @@ class YoutubeAgent:
                 - display_name (str): Channel name as displayed on YouTube
                 - thumbnail (str): URL to the channel's profile picture
         """
-        users = send_request(f"{env.YOUTUBE_CHANNEL_SEARCH_API}/{query}").get("userData", [])
+        users = self.send_request(f"{self.endpoints.YOUTUBE_CHANNEL_SEARCH_API}/{query}").get("userData", [])
         return [
             YoutubeChannel(
                 channel_id=item.get("id", ""),
@@ -122,8 +125,24 @@ class YoutubeAgent:
             for item in users
         ]
 
-    @staticmethod
-    def fetch_channel_metrics(query: str) -> YoutubeChannelCount:
+    @agent_method
+    def find_channel_many(self, queries: Iterable[str], concurrency: int = 8) -> list[SearchResult]:
+        """
+        Run ``find_channel`` for many queries concurrently, searching duplicates only once.
+
+        Args:
+            queries (Iterable[str]): Channel names to search for, where case, surrounding whitespace and a
+                leading ``@`` are ignored
+            concurrency (int): Number of searches in flight
+
+        Returns:
+            list[SearchResult]: One result per given query, in order, holding what ``find_channel`` returned for it
+            or the error it raised
+        """
+        return self._find_many(self.find_channel, queries, concurrency)
+
+    @agent_method
+    def fetch_channel_metrics(self, query: str) -> YoutubeChannelCount:
         """
         Fetch engagement metrics and statistics for a YouTube channel.
 
@@ -137,15 +156,16 @@ class YoutubeAgent:
                 - channel_stats (list[int]): List of three engagement metrics
                   [likes, comments, shares] across all videos
         """
-        metrics = send_request(f"{env.YOUTUBE_CHANNEL_STATS_API}/{query}")
+        metrics = self.send_request(f"{self.endpoints.YOUTUBE_CHANNEL_STATS_API}/{query}")
         return YoutubeChannelCount(
             channel_id=query,
             follower_count=metrics.get("followerCount", 0),
             channel_stats=metrics.get("bottomOdos", [0, 0, 0]),
         )
 
-    @staticmethod
-    def find_video(query: str) -> list[YoutubeVideo]:
+    @agent_method
+    @identity_cached
+    def find_video(self, query: str) -> list[YoutubeVideo]:
         """
         Search for YouTube videos based on a search query.
 
@@ -158,7 +178,7 @@ class YoutubeAgent:
                 - display_name (str): Title of the video
                 - thumbnail (str): URL to the video's thumbnail image
         """
-        videos = send_request(f"{env.YOUTUBE_VIDEO_SEARCH_API}/{query}").get("userData", [])
+        videos = self.send_request(f"{self.endpoints.YOUTUBE_VIDEO_SEARCH_API}/{query}").get("userData", [])
         return [
             YoutubeVideo(
                 video_id=item.get("id", ""),
@@ -168,8 +188,8 @@ class YoutubeAgent:
             for item in videos
         ]
 
-    @staticmethod
-    def fetch_video_metrics(query: str) -> YoutubeVideoCount:
+    @agent_method
+    def fetch_video_metrics(self, query: str) -> YoutubeVideoCount:
         """
         Fetch engagement metrics for a specific YouTube video.
 
@@ -183,7 +203,7 @@ class YoutubeAgent:
                 - video_stats (list[int]): List of three engagement metrics
                   [likes, comments, shares] for the video
         """
-        metrics = send_request(f"{env.YOUTUBE_VIDEO_STATS_API}/{query}")
+        metrics = self.send_request(f"{self.endpoints.YOUTUBE_VIDEO_STATS_API}/{query}")
         return YoutubeVideoCount(
             video_id=query,
             view_count=metrics.get("followerCount", 0),